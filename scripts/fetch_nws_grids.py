@@ -2,106 +2,129 @@
 
 This script queries the weather.gov API to get grid coordinates
 for each city and saves the complete configuration to cities.json.
+Output is compact JSON; pass --pretty for an indented, diff-friendly file.
 """
 
-import json
+import argparse
+import asyncio
+import random
 import time
+from collections import deque
 from pathlib import Path
 from typing import Any, Dict
 
-import requests
-
-# City coordinates (lat, lon)
-CITIES = {
-    "NYC": {
-        "name": "New York City",
-        "lat": 40.7128,
-        "lon": -74.0060,
-        "timezone": "America/New_York",
-        "cluster": "NE",
-        "settlement_station": "KNYC",
-    },
-    "CHI": {
-        "name": "Chicago",
-        "lat": 41.8781,
-        "lon": -87.6298,
-        "timezone": "America/Chicago",
-        "cluster": "Midwest",
-        "settlement_station": "KORD",
-    },
-    "LAX": {
-        "name": "Los Angeles",
-        "lat": 34.0522,
-        "lon": -118.2437,
-        "timezone": "America/Los_Angeles",
-        "cluster": "West",
-        "settlement_station": "KLAX",
-    },
-    "MIA": {
-        "name": "Miami",
-        "lat": 25.7617,
-        "lon": -80.1918,
-        "timezone": "America/New_York",
-        "cluster": "SE",
-        "settlement_station": "KMIA",
-    },
-    "AUS": {
-        "name": "Austin",
-        "lat": 30.2672,
-        "lon": -97.7431,
-        "timezone": "America/Chicago",
-        "cluster": "SE",
-        "settlement_station": "KAUS",
-    },
-    "DEN": {
-        "name": "Denver",
-        "lat": 39.7392,
-        "lon": -104.9903,
-        "timezone": "America/Denver",
-        "cluster": "Mountain",
-        "settlement_station": "KDEN",
-    },
-    "PHL": {
-        "name": "Philadelphia",
-        "lat": 39.9526,
-        "lon": -75.1652,
-        "timezone": "America/New_York",
-        "cluster": "NE",
-        "settlement_station": "KPHL",
-    },
-    "BOS": {
-        "name": "Boston",
-        "lat": 42.3601,
-        "lon": -71.0589,
-        "timezone": "America/New_York",
-        "cluster": "NE",
-        "settlement_station": "KBOS",
-    },
-    "SEA": {
-        "name": "Seattle",
-        "lat": 47.6062,
-        "lon": -122.3321,
-        "timezone": "America/Los_Angeles",
-        "cluster": "West",
-        "settlement_station": "KSEA",
-    },
-    "SFO": {
-        "name": "San Francisco",
-        "lat": 37.7749,
-        "lon": -122.4194,
-        "timezone": "America/Los_Angeles",
-        "cluster": "West",
-        "settlement_station": "KSFO",
-    },
-}
+import httpx
+import orjson
+
+# (code, name, lat, lon, timezone, cluster, settlement_station)
+CITY_ROWS: tuple[tuple[str, str, float, float, str, str, str], ...] = (
+    ("NYC", "New York City", 40.7128, -74.0060, "America/New_York", "NE", "KNYC"),
+    ("CHI", "Chicago", 41.8781, -87.6298, "America/Chicago", "Midwest", "KORD"),
+    ("LAX", "Los Angeles", 34.0522, -118.2437, "America/Los_Angeles", "West", "KLAX"),
+    ("MIA", "Miami", 25.7617, -80.1918, "America/New_York", "SE", "KMIA"),
+    ("AUS", "Austin", 30.2672, -97.7431, "America/Chicago", "SE", "KAUS"),
+    ("DEN", "Denver", 39.7392, -104.9903, "America/Denver", "Mountain", "KDEN"),
+    ("PHL", "Philadelphia", 39.9526, -75.1652, "America/New_York", "NE", "KPHL"),
+    ("BOS", "Boston", 42.3601, -71.0589, "America/New_York", "NE", "KBOS"),
+    ("SEA", "Seattle", 47.6062, -122.3321, "America/Los_Angeles", "West", "KSEA"),
+    ("SFO", "San Francisco", 37.7749, -122.4194, "America/Los_Angeles", "West", "KSFO"),
+)
 
 USER_AGENT = "Milkbot/1.0 (contact@milkbot.ai)"
 
+# NWS fields used when the API call fails
+PLACEHOLDER_NWS = {
+    "nws_office": "PLACEHOLDER",
+    "nws_grid_x": 0,
+    "nws_grid_y": 0,
+    "forecast_url": "",
+    "forecast_hourly_url": "",
+    "observation_stations_url": "",
+}
+
+# /points/ responses are a few KB; refuse anything wildly larger
+MAX_RESPONSE_BYTES = 256_000
+
+# NWS asks clients to stay within a handful of requests per second
+MAX_CONCURRENT_REQUESTS = 4
+MAX_REQUESTS_PER_SECOND = 5
+
+# Exponential backoff with jitter; Retry-After wins on 429/503
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 0.5
+BACKOFF_JITTER = 0.25
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """Sliding one-second window limiter shared by concurrent fetches."""
+    
+    def __init__(self, max_per_second: int) -> None:
+        self.max_per_second = max_per_second
+        self._lock = asyncio.Lock()
+        self._request_times: deque[float] = deque()
+    
+    async def wait(self) -> None:
+        """Wait until a request slot is free in the trailing one-second window."""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                while self._request_times and now - self._request_times[0] >= 1.0:
+                    self._request_times.popleft()
+                if len(self._request_times) < self.max_per_second:
+                    self._request_times.append(now)
+                    return
+                sleep_time = 1.0 - (now - self._request_times[0])
+            # Jitter keeps concurrent tasks from waking in lockstep
+            await asyncio.sleep(sleep_time + random.uniform(0, BACKOFF_JITTER))
+
+
+def _retry_delay(attempt: int, response: httpx.Response | None) -> float:
+    """Compute the wait before the next attempt.
+    
+    Args:
+        attempt: Zero-based attempt number that just failed
+        response: Failed response, if the server answered at all
+        
+    Returns:
+        Delay in seconds
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+    return BACKOFF_FACTOR * (2**attempt) + random.uniform(0, BACKOFF_JITTER)
+
+
+async def _get_limited(client: httpx.AsyncClient, url: str) -> bytes:
+    """GET a URL, streaming the body and enforcing MAX_RESPONSE_BYTES.
+    
+    Raises:
+        httpx.HTTPStatusError: On a non-2xx response
+        ValueError: If the response body exceeds MAX_RESPONSE_BYTES
+    """
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > MAX_RESPONSE_BYTES:
+                raise ValueError(f"NWS response exceeds {MAX_RESPONSE_BYTES} bytes: {url}")
+    return bytes(body)
+
 
-def fetch_nws_grid(lat: float, lon: float) -> Dict[str, Any]:
+async def fetch_nws_grid(
+    client: httpx.AsyncClient,
+    limiter: RateLimiter,
+    lat: float,
+    lon: float,
+) -> Dict[str, Any]:
     """Fetch NWS grid coordinates for a location.
     
     Args:
+        client: Shared HTTP/2 client
+        limiter: Shared request rate limiter
         lat: Latitude
         lon: Longitude
         
@@ -109,15 +132,26 @@ def fetch_nws_grid(lat: float, lon: float) -> Dict[str, Any]:
         Dictionary with office, gridX, gridY
         
     Raises:
-        requests.RequestException: If API call fails
+        httpx.HTTPError: If API call fails after retries
+        ValueError: If the response body exceeds MAX_RESPONSE_BYTES
     """
     url = f"https://api.weather.gov/points/{lat},{lon}"
-    headers = {"User-Agent": USER_AGENT}
     
-    response = requests.get(url, headers=headers, timeout=10)
-    response.raise_for_status()
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.wait()
+        try:
+            body = await _get_limited(client, url)
+            break
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(_retry_delay(attempt, e.response))
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(_retry_delay(attempt, None))
     
-    data = response.json()
+    data = orjson.loads(body)
     properties = data["properties"]
     
     return {
@@ -130,65 +164,85 @@ def fetch_nws_grid(lat: float, lon: float) -> Dict[str, Any]:
     }
 
 
-def main() -> None:
-    """Fetch NWS grid data for all cities and save to JSON."""
+async def fetch_all_grids() -> list[Dict[str, Any] | BaseException]:
+    """Fetch grids for every city over one multiplexed HTTP/2 connection.
+    
+    Returns:
+        Per-city results in CITY_ROWS order; failures are returned as exceptions
+    """
+    limiter = RateLimiter(MAX_REQUESTS_PER_SECOND)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async def fetch(client: httpx.AsyncClient, lat: float, lon: float) -> Dict[str, Any]:
+        async with semaphore:
+            return await fetch_nws_grid(client, limiter, lat, lon)
+    
+    async with httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": USER_AGENT},
+        timeout=10,
+        limits=httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS),
+    ) as client:
+        return await asyncio.gather(
+            *(fetch(client, lat, lon) for _code, _name, lat, lon, *_rest in CITY_ROWS),
+            return_exceptions=True,
+        )
+
+
+def main(pretty: bool = False) -> None:
+    """Fetch NWS grid data for all cities and save to JSON.
+    
+    Args:
+        pretty: Indent the output for review instead of writing compact JSON
+    """
     print("Fetching NWS grid coordinates for 10 cities...")
     
-    cities_data = {}
+    # Static per-city fields copied into cities.json
+    city_bases = {
+        code: {
+            "code": code,
+            "name": name,
+            "lat": lat,
+            "lon": lon,
+            "timezone": tz,
+            "cluster": cluster,
+            "settlement_station": station,
+        }
+        for code, name, lat, lon, tz, cluster, station in CITY_ROWS
+    }
+    cities_data: Dict[str, Dict[str, Any]] = {}
     
-    for code, city_info in CITIES.items():
-        print(f"\nFetching {code} ({city_info['name']})...")
-        
-        try:
-            nws_data = fetch_nws_grid(city_info["lat"], city_info["lon"])
-            
-            cities_data[code] = {
-                "code": code,
-                "name": city_info["name"],
-                "lat": city_info["lat"],
-                "lon": city_info["lon"],
-                "timezone": city_info["timezone"],
-                "cluster": city_info["cluster"],
-                "settlement_station": city_info["settlement_station"],
-                **nws_data,
-            }
-            
-            print(f"  ✓ Office: {nws_data['nws_office']}, "
+    results = asyncio.run(fetch_all_grids())
+    
+    for (code, name, *_rest), result in zip(CITY_ROWS, results):
+        if isinstance(result, BaseException):
+            print(f"  ✗ {code} ({name}) Error: {result}")
+            # Retries are exhausted at this point; fall back to placeholders
+            nws_data = PLACEHOLDER_NWS
+        else:
+            nws_data = result
+            print(f"  ✓ {code} ({name}) Office: {nws_data['nws_office']}, "
                   f"Grid: ({nws_data['nws_grid_x']}, {nws_data['nws_grid_y']})")
-            
-            # Rate limiting
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            # Use placeholder values if API fails
-            cities_data[code] = {
-                "code": code,
-                "name": city_info["name"],
-                "lat": city_info["lat"],
-                "lon": city_info["lon"],
-                "timezone": city_info["timezone"],
-                "cluster": city_info["cluster"],
-                "settlement_station": city_info["settlement_station"],
-                "nws_office": "PLACEHOLDER",
-                "nws_grid_x": 0,
-                "nws_grid_y": 0,
-                "forecast_url": "",
-                "forecast_hourly_url": "",
-                "observation_stations_url": "",
-            }
+        
+        cities_data[code] = city_bases[code] | nws_data
     
     # Save to file
     output_dir = Path("data/cities")
     output_dir.mkdir(parents=True, exist_ok=True)
     
     output_file = output_dir / "cities.json"
-    with open(output_file, "w") as f:
-        json.dump(cities_data, f, indent=2)
+    with open(output_file, "wb") as f:
+        f.write(orjson.dumps(cities_data, option=orjson.OPT_INDENT_2 if pretty else None))
     
     print(f"\n✓ Saved city data to {output_file}")
     print(f"  Total cities: {len(cities_data)}")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="indent cities.json for human review (default: compact)",
+    )
+    main(pretty=parser.parse_args().pretty)
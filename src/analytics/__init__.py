@@ -1,34 +1,121 @@
-"""Analytics module for weather processing, signal generation, and rollups."""
-
-from src.analytics.api import AnalyticsAPI, APIResponse, create_analytics_api
-from src.analytics.health import (
-    ComponentHealth,
-    ComponentStatus,
-    SystemHealth,
-    check_degraded_components,
-    get_current_health,
-    record_health_check,
-)
-from src.analytics.opportunity_detector import OpportunityDetector
-from src.analytics.rollups import (
-    CityMetrics,
-    EquityCurvePoint,
-    StrategyMetrics,
-    create_rollup_tables,
-    get_city_metrics,
-    get_equity_curve,
-    get_strategy_metrics,
-    run_daily_rollups,
-    update_city_metrics,
-    update_equity_curve,
-    update_strategy_metrics,
-)
-from src.analytics.signal_generator import Signal, SignalGenerator
-from src.analytics.weather_processor import WeatherProcessor
+"""Analytics module for weather processing, signal generation, and rollups.
+
+Public names are resolved lazily on first access (PEP 562) so that
+importing a lightweight piece such as ``WeatherProcessor`` does not pull in
+the database-backed rollup, health, and API modules.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.analytics.api import AnalyticsAPI, APIResponse, create_analytics_api
+    from src.analytics.health import (
+        ComponentHealth,
+        ComponentStatus,
+        HealthCheckResult,
+        SystemHealth,
+        check_degraded_components,
+        ensure_partition,
+        get_current_health,
+        iter_health_history,
+        record_health_check,
+        record_health_checks,
+    )
+    from src.analytics.opportunity_detector import OpportunityDetector
+    from src.analytics.rollups import (
+        CityMetrics,
+        EquityCurvePoint,
+        StrategyMetrics,
+        backfill_rollups_from_scratch,
+        create_rollup_tables,
+        ensure_monthly_partition,
+        get_city_metrics,
+        get_city_metrics_with_summary,
+        get_equity_curve,
+        get_strategy_metrics,
+        get_strategy_metrics_with_summary,
+        iter_city_metrics,
+        iter_equity_curve,
+        iter_strategy_metrics,
+        run_daily_rollups,
+        update_city_metrics,
+        update_city_metrics_many,
+        update_city_metrics_range,
+        update_equity_curve,
+        update_equity_curve_range,
+        update_strategy_metrics,
+    )
+    from src.analytics.signal_generator import Signal, SignalGenerator
+    from src.analytics.weather_processor import ForecastColumns, WeatherProcessor
+
+# Public name -> defining module
+_LAZY_IMPORTS: dict[str, str] = {
+    # Weather processing
+    "WeatherProcessor": "src.analytics.weather_processor",
+    "ForecastColumns": "src.analytics.weather_processor",
+    "OpportunityDetector": "src.analytics.opportunity_detector",
+    "SignalGenerator": "src.analytics.signal_generator",
+    "Signal": "src.analytics.signal_generator",
+    # Rollups
+    "CityMetrics": "src.analytics.rollups",
+    "StrategyMetrics": "src.analytics.rollups",
+    "EquityCurvePoint": "src.analytics.rollups",
+    "create_rollup_tables": "src.analytics.rollups",
+    "ensure_monthly_partition": "src.analytics.rollups",
+    "update_city_metrics": "src.analytics.rollups",
+    "update_city_metrics_range": "src.analytics.rollups",
+    "update_city_metrics_many": "src.analytics.rollups",
+    "update_strategy_metrics": "src.analytics.rollups",
+    "update_equity_curve": "src.analytics.rollups",
+    "update_equity_curve_range": "src.analytics.rollups",
+    "get_city_metrics": "src.analytics.rollups",
+    "get_city_metrics_with_summary": "src.analytics.rollups",
+    "iter_city_metrics": "src.analytics.rollups",
+    "get_strategy_metrics": "src.analytics.rollups",
+    "get_strategy_metrics_with_summary": "src.analytics.rollups",
+    "iter_strategy_metrics": "src.analytics.rollups",
+    "get_equity_curve": "src.analytics.rollups",
+    "iter_equity_curve": "src.analytics.rollups",
+    "run_daily_rollups": "src.analytics.rollups",
+    "backfill_rollups_from_scratch": "src.analytics.rollups",
+    # Health
+    "ComponentStatus": "src.analytics.health",
+    "ComponentHealth": "src.analytics.health",
+    "SystemHealth": "src.analytics.health",
+    "HealthCheckResult": "src.analytics.health",
+    "record_health_check": "src.analytics.health",
+    "record_health_checks": "src.analytics.health",
+    "get_current_health": "src.analytics.health",
+    "iter_health_history": "src.analytics.health",
+    "check_degraded_components": "src.analytics.health",
+    "ensure_partition": "src.analytics.health",
+    # API
+    "AnalyticsAPI": "src.analytics.api",
+    "APIResponse": "src.analytics.api",
+    "create_analytics_api": "src.analytics.api",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names from their submodule on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
 
 __all__ = [
     # Weather processing
     "WeatherProcessor",
+    "ForecastColumns",
     "OpportunityDetector",
     "SignalGenerator",
     "Signal",
@@ -37,20 +124,34 @@ __all__ = [
     "StrategyMetrics",
     "EquityCurvePoint",
     "create_rollup_tables",
+    "ensure_monthly_partition",
     "update_city_metrics",
+    "update_city_metrics_range",
+    "update_city_metrics_many",
     "update_strategy_metrics",
     "update_equity_curve",
+    "update_equity_curve_range",
     "get_city_metrics",
+    "get_city_metrics_with_summary",
+    "iter_city_metrics",
     "get_strategy_metrics",
+    "get_strategy_metrics_with_summary",
+    "iter_strategy_metrics",
     "get_equity_curve",
+    "iter_equity_curve",
     "run_daily_rollups",
+    "backfill_rollups_from_scratch",
     # Health
     "ComponentStatus",
     "ComponentHealth",
     "SystemHealth",
+    "HealthCheckResult",
     "record_health_check",
+    "record_health_checks",
     "get_current_health",
+    "iter_health_history",
     "check_degraded_components",
+    "ensure_partition",
     # API
     "AnalyticsAPI",
     "APIResponse",
@@ -4,11 +4,17 @@ Provides HTTP endpoints for querying analytics data including
 city metrics, strategy metrics, equity curve, and health status.
 """
 
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
-from functools import lru_cache
 from typing import Any
 
+import numpy as np
+from cachetools import TLRUCache
+
 from src.shared.config.logging import get_logger
 
 logger = get_logger(__name__)
@@ -16,19 +22,38 @@ logger = get_logger(__name__)
 # Cache TTL in seconds
 CACHE_TTL = 5
 
+# Per-endpoint TTL overrides, keyed by cache key prefix
+CACHE_TTL_OVERRIDES: dict[str, float] = {
+    "health_status": 2,
+    "degraded_components": 2,
+    "public_trades": 30,  # Already 60-minute delayed
+}
+
+# Error messages are truncated so large SQL errors don't bloat logs or responses
+MAX_ERROR_LENGTH = 500
+
+# Upper bound on distinct cached query results
+CACHE_MAX_ENTRIES = 512
+
 
-@dataclass
+@dataclass(slots=True)
 class APIResponse:
-    """Standard API response wrapper."""
+    """Standard API response wrapper.
+
+    The ISO timestamp is formatted once at construction because cached
+    responses are serialized again on every hit.
+    """
 
     success: bool
     data: Any = None
     error: str | None = None
     timestamp: datetime = None  # type: ignore[assignment]
+    _timestamp_iso: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.timestamp is None:
             self.timestamp = datetime.now(timezone.utc)
+        self._timestamp_iso = self.timestamp.isoformat()
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -36,7 +61,7 @@ class APIResponse:
             "success": self.success,
             "data": self.data,
             "error": self.error,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self._timestamp_iso,
         }
 
 
@@ -54,27 +79,85 @@ class AnalyticsAPI:
             engine: SQLAlchemy engine instance
         """
         self.engine = engine
-        self._cache: dict[str, tuple[datetime, Any]] = {}
+        # Expiry runs on the monotonic clock; wall-clock time is only used
+        # for the user-visible APIResponse.timestamp
+        self._cache: TLRUCache[str, Any] = TLRUCache(
+            maxsize=CACHE_MAX_ENTRIES, ttu=self._cache_expiry, timer=time.monotonic
+        )
+        self._cache_lock = threading.Lock()
+        self._inflight: dict[str, threading.Event] = {}
         logger.info("analytics_api_initialized")
 
-    def _get_cached(self, key: str) -> Any | None:
-        """Get cached value if still valid."""
-        if key in self._cache:
-            cached_time, cached_value = self._cache[key]
-            age = (datetime.now(timezone.utc) - cached_time).total_seconds()
-            if age < CACHE_TTL:
-                logger.debug("cache_hit", key=key, age_seconds=age)
-                return cached_value
-            else:
-                logger.debug("cache_expired", key=key, age_seconds=age)
-                del self._cache[key]
-        return None
+    @staticmethod
+    def _cache_expiry(key: str, value: Any, now: float) -> float:
+        """Compute the expiry time of a cache entry from its key prefix."""
+        prefix = key.split(":", 1)[0]
+        return now + CACHE_TTL_OVERRIDES.get(prefix, CACHE_TTL)
 
     def _set_cache(self, key: str, value: Any) -> None:
-        """Set cached value with current timestamp."""
-        self._cache[key] = (datetime.now(timezone.utc), value)
+        """Set cached value, evicting the least recently used entry when full."""
+        with self._cache_lock:
+            self._cache[key] = value
         logger.debug("cache_set", key=key)
 
+    def _fail(self, operation: str, error: Exception) -> APIResponse:
+        """Log a failed query and build the error response.
+
+        The message is formatted and truncated once; the full traceback goes
+        to the log sink only.
+
+        Args:
+            operation: Operation name used as the log event prefix
+            error: Exception raised by the query
+
+        Returns:
+            Unsuccessful APIResponse carrying the truncated message
+        """
+        message = str(error)[:MAX_ERROR_LENGTH]
+        logger.error(f"{operation}_failed", error=message, exc_info=True)
+        return APIResponse(success=False, error=message)
+
+    def _get_or_load(self, key: str, loader: Callable[[], APIResponse]) -> APIResponse:
+        """Return a cached response or load it, coalescing concurrent misses.
+
+        Only one caller per key runs the loader; others wait for it to finish
+        and then re-read the cache. Failed responses are not cached, so waiters
+        retry the load themselves.
+
+        Args:
+            key: Cache key
+            loader: Callable producing the response on a cache miss
+
+        Returns:
+            Cached or freshly loaded APIResponse
+        """
+        while True:
+            with self._cache_lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    logger.debug("cache_hit", key=key)
+                    return cached  # type: ignore[no-any-return]
+
+                event = self._inflight.get(key)
+                is_leader = event is None
+                if event is None:
+                    event = threading.Event()
+                    self._inflight[key] = event
+
+            if not is_leader:
+                event.wait()
+                continue
+
+            try:
+                response = loader()
+                if response.success:
+                    self._set_cache(key, response)
+                return response
+            finally:
+                with self._cache_lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
     def get_city_metrics(
         self,
         city_code: str | None = None,
@@ -93,55 +176,53 @@ class AnalyticsAPI:
         Returns:
             APIResponse with city metrics data
         """
-        # Check cache
         cache_key = f"city_metrics:{city_code}:{start_date}:{end_date}:{limit}"
-        cached = self._get_cached(cache_key)
-        if cached is not None:
-            return cached
+        return self._get_or_load(
+            cache_key,
+            lambda: self._load_city_metrics(city_code, start_date, end_date, limit),
+        )
 
+    def _load_city_metrics(
+        self,
+        city_code: str | None,
+        start_date: date | None,
+        end_date: date | None,
+        limit: int,
+    ) -> APIResponse:
+        """Query city metrics and build the response (uncached)."""
         try:
-            from src.analytics.rollups import get_city_metrics
+            from src.analytics.rollups import get_city_metrics_with_summary
 
-            metrics = get_city_metrics(
+            # Totals are aggregated in SQL over every matching row
+            metrics, totals = get_city_metrics_with_summary(
                 self.engine,
                 city_code=city_code,
                 start_date=start_date,
                 end_date=end_date,
+                limit=limit,
             )
 
-            # Calculate summary stats
-            if metrics:
-                total_pnl = sum(m.get("net_pnl", 0) for m in metrics)
-                total_trades = sum(m.get("trade_count", 0) for m in metrics)
-                total_wins = sum(m.get("win_count", 0) for m in metrics)
-                total_losses = sum(m.get("loss_count", 0) for m in metrics)
-
-                summary = {
-                    "total_pnl": float(total_pnl),
-                    "total_trades": total_trades,
-                    "win_rate": (total_wins / (total_wins + total_losses) * 100)
-                    if (total_wins + total_losses) > 0
-                    else 0,
-                }
-            else:
-                summary = {"total_pnl": 0, "total_trades": 0, "win_rate": 0}
+            total_wins = totals["win_count"]
+            total_losses = totals["loss_count"]
+            summary = {
+                "total_pnl": float(totals["net_pnl"]),
+                "total_trades": totals["trade_count"],
+                "win_rate": (total_wins / (total_wins + total_losses) * 100)
+                if (total_wins + total_losses) > 0
+                else 0,
+            }
 
-            response = APIResponse(
+            return APIResponse(
                 success=True,
                 data={
-                    "metrics": metrics[:limit],
+                    "metrics": metrics,
                     "summary": summary,
-                    "count": len(metrics),
+                    "count": totals["row_count"],
                 },
             )
-            
-            # Cache successful response
-            self._set_cache(cache_key, response)
-            return response
 
         except Exception as e:
-            logger.error("city_metrics_query_failed", error=str(e))
-            return APIResponse(success=False, error=str(e))
+            return self._fail("city_metrics_query", e)
 
     def get_strategy_metrics(
         self,
@@ -161,50 +242,54 @@ class AnalyticsAPI:
         Returns:
             APIResponse with strategy metrics data
         """
+        cache_key = f"strategy_metrics:{strategy_name}:{start_date}:{end_date}:{limit}"
+        return self._get_or_load(
+            cache_key,
+            lambda: self._load_strategy_metrics(strategy_name, start_date, end_date, limit),
+        )
+
+    def _load_strategy_metrics(
+        self,
+        strategy_name: str | None,
+        start_date: date | None,
+        end_date: date | None,
+        limit: int,
+    ) -> APIResponse:
+        """Query strategy metrics and build the response (uncached)."""
         try:
-            from src.analytics.rollups import get_strategy_metrics
+            from src.analytics.rollups import get_strategy_metrics_with_summary
 
-            metrics = get_strategy_metrics(
+            # Totals are aggregated in SQL over every matching row
+            metrics, totals = get_strategy_metrics_with_summary(
                 self.engine,
                 strategy_name=strategy_name,
                 start_date=start_date,
                 end_date=end_date,
+                limit=limit,
             )
 
-            # Calculate summary stats
-            if metrics:
-                total_pnl = sum(m.get("net_pnl", 0) for m in metrics)
-                total_trades = sum(m.get("trade_count", 0) for m in metrics)
-                total_signals = sum(m.get("signal_count", 0) for m in metrics)
-
-                summary = {
-                    "total_pnl": float(total_pnl),
-                    "total_trades": total_trades,
-                    "total_signals": total_signals,
-                    "conversion_rate": (total_trades / total_signals * 100)
-                    if total_signals > 0
-                    else 0,
-                }
-            else:
-                summary = {
-                    "total_pnl": 0,
-                    "total_trades": 0,
-                    "total_signals": 0,
-                    "conversion_rate": 0,
-                }
+            total_trades = totals["trade_count"]
+            total_signals = totals["signal_count"]
+            summary = {
+                "total_pnl": float(totals["net_pnl"]),
+                "total_trades": total_trades,
+                "total_signals": total_signals,
+                "conversion_rate": (total_trades / total_signals * 100)
+                if total_signals > 0
+                else 0,
+            }
 
             return APIResponse(
                 success=True,
                 data={
-                    "metrics": metrics[:limit],
+                    "metrics": metrics,
                     "summary": summary,
-                    "count": len(metrics),
+                    "count": totals["row_count"],
                 },
             )
 
         except Exception as e:
-            logger.error("strategy_metrics_query_failed", error=str(e))
-            return APIResponse(success=False, error=str(e))
+            return self._fail("strategy_metrics_query", e)
 
     def get_equity_curve(
         self,
@@ -220,12 +305,18 @@ class AnalyticsAPI:
         Returns:
             APIResponse with equity curve data
         """
-        # Check cache
         cache_key = f"equity_curve:{start_date}:{end_date}"
-        cached = self._get_cached(cache_key)
-        if cached is not None:
-            return cached
+        return self._get_or_load(
+            cache_key,
+            lambda: self._load_equity_curve(start_date, end_date),
+        )
 
+    def _load_equity_curve(
+        self,
+        start_date: date | None,
+        end_date: date | None,
+    ) -> APIResponse:
+        """Query the equity curve and build the response (uncached)."""
         try:
             from src.analytics.rollups import get_equity_curve
 
@@ -239,14 +330,24 @@ class AnalyticsAPI:
             if curve:
                 first = curve[0]
                 last = curve[-1]
+                # Vectorized reductions; curves can span years of daily points
+                drawdowns = np.fromiter(
+                    (float(p.get("drawdown", 0)) for p in curve),
+                    dtype=np.float64,
+                    count=len(curve),
+                )
+                drawdown_pcts = np.fromiter(
+                    (float(p.get("drawdown_pct", 0)) for p in curve),
+                    dtype=np.float64,
+                    count=len(curve),
+                )
+
                 summary = {
                     "starting_equity": float(first.get("starting_equity", 0)),
                     "ending_equity": float(last.get("ending_equity", 0)),
                     "total_return": float(last.get("cumulative_pnl", 0)),
-                    "max_drawdown": max(float(p.get("drawdown", 0)) for p in curve),
-                    "max_drawdown_pct": max(
-                        float(p.get("drawdown_pct", 0)) for p in curve
-                    ),
+                    "max_drawdown": float(drawdowns.max()),
+                    "max_drawdown_pct": float(drawdown_pcts.max()),
                     "trading_days": len(curve),
                 }
             else:
@@ -259,21 +360,16 @@ class AnalyticsAPI:
                     "trading_days": 0,
                 }
 
-            response = APIResponse(
+            return APIResponse(
                 success=True,
                 data={
                     "curve": curve,
                     "summary": summary,
                 },
             )
-            
-            # Cache successful response
-            self._set_cache(cache_key, response)
-            return response
 
         except Exception as e:
-            logger.error("equity_curve_query_failed", error=str(e))
-            return APIResponse(success=False, error=str(e))
+            return self._fail("equity_curve_query", e)
 
     def get_public_trades(
         self,
@@ -289,6 +385,14 @@ class AnalyticsAPI:
         Returns:
             APIResponse with public trade data
         """
+        cache_key = f"public_trades:{city_code}:{limit}"
+        return self._get_or_load(
+            cache_key,
+            lambda: self._load_public_trades(city_code, limit),
+        )
+
+    def _load_public_trades(self, city_code: str | None, limit: int) -> APIResponse:
+        """Query public trades and build the response (uncached)."""
         try:
             from src.shared.db.analytics import get_public_trades
 
@@ -308,8 +412,7 @@ class AnalyticsAPI:
             )
 
         except Exception as e:
-            logger.error("public_trades_query_failed", error=str(e))
-            return APIResponse(success=False, error=str(e))
+            return self._fail("public_trades_query", e)
 
     def get_health_status(self) -> APIResponse:
         """Get current system health status.
@@ -317,6 +420,10 @@ class AnalyticsAPI:
         Returns:
             APIResponse with health status data
         """
+        return self._get_or_load("health_status", self._load_health_status)
+
+    def _load_health_status(self) -> APIResponse:
+        """Query current health and build the response (uncached)."""
         try:
             from src.analytics.health import get_current_health
 
@@ -346,8 +453,7 @@ class AnalyticsAPI:
             )
 
         except Exception as e:
-            logger.error("health_status_query_failed", error=str(e))
-            return APIResponse(success=False, error=str(e))
+            return self._fail("health_status_query", e)
 
     def get_degraded_components(self) -> APIResponse:
         """Get list of degraded or unhealthy components.
@@ -355,6 +461,10 @@ class AnalyticsAPI:
         Returns:
             APIResponse with degraded component list
         """
+        return self._get_or_load("degraded_components", self._load_degraded_components)
+
+    def _load_degraded_components(self) -> APIResponse:
+        """Query degraded components and build the response (uncached)."""
         try:
             from src.analytics.health import check_degraded_components
 
@@ -377,23 +487,31 @@ class AnalyticsAPI:
             )
 
         except Exception as e:
-            logger.error("degraded_components_query_failed", error=str(e))
-            return APIResponse(success=False, error=str(e))
+            return self._fail("degraded_components_query", e)
 
     def get_dashboard_summary(self) -> APIResponse:
         """Get combined dashboard summary.
 
-        Aggregates key metrics for the main dashboard view.
+        Aggregates key metrics for the main dashboard view. The four
+        underlying queries are dispatched in parallel, so latency tracks the
+        slowest one rather than their sum. The engine pool must allow at
+        least four concurrent connections.
 
         Returns:
             APIResponse with dashboard summary data
         """
         try:
-            # Get latest metrics
-            city_response = self.get_city_metrics(limit=10)
-            strategy_response = self.get_strategy_metrics(limit=10)
-            equity_response = self.get_equity_curve()
-            health_response = self.get_health_status()
+            # Sub-queries are independent, so run them concurrently
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                city_future = executor.submit(self.get_city_metrics, limit=10)
+                strategy_future = executor.submit(self.get_strategy_metrics, limit=10)
+                equity_future = executor.submit(self.get_equity_curve)
+                health_future = executor.submit(self.get_health_status)
+
+                city_response = city_future.result()
+                strategy_response = strategy_future.result()
+                equity_response = equity_future.result()
+                health_response = health_future.result()
 
             return APIResponse(
                 success=True,
@@ -417,17 +535,30 @@ class AnalyticsAPI:
             )
 
         except Exception as e:
-            logger.error("dashboard_summary_query_failed", error=str(e))
-            return APIResponse(success=False, error=str(e))
+            return self._fail("dashboard_summary_query", e)
+
+
+# Shared AnalyticsAPI per engine. Engines live for the whole process, so
+# instances are held strongly to keep their caches warm between requests.
+_api_registry: dict[Any, AnalyticsAPI] = {}
+_api_registry_lock = threading.Lock()
 
 
 def create_analytics_api(engine: Any) -> AnalyticsAPI:
     """Factory function to create AnalyticsAPI instance.
 
+    Instances are shared per engine so that every request handler in a
+    process reads from the same warm cache, even when each handler drops
+    its reference after the request.
+
     Args:
         engine: SQLAlchemy engine instance
 
     Returns:
         Configured AnalyticsAPI instance
     """
-    return AnalyticsAPI(engine)
+    with _api_registry_lock:
+        api = _api_registry.get(engine)
+        if api is None:
+            api = _api_registry[engine] = AnalyticsAPI(engine)
+    return api
@@ -1,17 +1,24 @@
 """System health metrics aggregation.
 
-Provides a view for system health dashboard with component status,
-latency metrics, and error rates.
+Provides a current-status table for system health dashboard with component
+status, latency metrics, and error rates.
 """
 
+from collections.abc import Iterator
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from enum import Enum
 from typing import Any
 
+import orjson
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from src.analytics.partitioning import (
+    copy_legacy_rows,
+    created_partitions,
+    retire_plain_table,
+)
 from src.shared.config.logging import get_logger
 
 logger = get_logger(__name__)
@@ -26,7 +33,11 @@ class ComponentStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Plain dict lookup for row parsing; avoids Enum.__call__ per row
+_STATUS_FROM_STR: dict[str, ComponentStatus] = {s.value: s for s in ComponentStatus}
+
+
+@dataclass(slots=True)
 class ComponentHealth:
     """Health status for a single component."""
 
@@ -49,7 +60,7 @@ class ComponentHealth:
         return self.status == ComponentStatus.DEGRADED
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemHealth:
     """Aggregated system health status."""
 
@@ -66,10 +77,32 @@ class SystemHealth:
         return self.overall_status == ComponentStatus.HEALTHY
 
 
-# SQL for creating health metrics table/view
+@dataclass
+class HealthCheckResult:
+    """A single health check result awaiting persistence."""
+
+    component_name: str
+    status: ComponentStatus
+    latency_ms: float | None = None
+    error_count: int = 0
+    request_count: int = 0
+    message: str | None = None
+    details: dict[str, Any] | None = None
+
+    @property
+    def error_rate(self) -> float | None:
+        """Error rate over the check period, if any requests were made."""
+        if self.request_count > 0:
+            return self.error_count / self.request_count
+        return None
+
+
+# SQL for creating health metrics table/view.
+# History is range-partitioned by day on checked_at so retention can drop
+# whole partitions instead of deleting rows; see ensure_partition().
 HEALTH_METRICS_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS analytics.health_metrics (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     component_name VARCHAR(100) NOT NULL,
     status VARCHAR(20) NOT NULL,
     checked_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -79,14 +112,23 @@ CREATE TABLE IF NOT EXISTS analytics.health_metrics (
     error_rate DECIMAL(5, 4),
     message TEXT,
     details JSONB DEFAULT '{}'::jsonb,
-    CONSTRAINT valid_status CHECK (status IN ('healthy', 'degraded', 'unhealthy', 'unknown'))
-);
+    CONSTRAINT valid_status CHECK (status IN ('healthy', 'degraded', 'unhealthy', 'unknown')),
+    PRIMARY KEY (id, checked_at)
+) PARTITION BY RANGE (checked_at);
+
+-- Serves per-component history (newest first) and the DISTINCT ON backfill
+-- without a sort; supersedes the single-column component_name index
+DROP INDEX IF EXISTS analytics.idx_health_metrics_component;
 
-CREATE INDEX IF NOT EXISTS idx_health_metrics_component
-ON analytics.health_metrics(component_name);
+CREATE INDEX IF NOT EXISTS idx_health_metrics_comp_checked
+ON analytics.health_metrics(component_name, checked_at DESC);
 
-CREATE INDEX IF NOT EXISTS idx_health_metrics_checked_at
-ON analytics.health_metrics(checked_at DESC);
+-- Rows are appended in checked_at order, so a BRIN index covers range scans
+-- for history and cleanup at a fraction of a btree's size
+DROP INDEX IF EXISTS analytics.idx_health_metrics_checked_at;
+
+CREATE INDEX IF NOT EXISTS idx_health_metrics_checked_at_brin
+ON analytics.health_metrics USING BRIN (checked_at) WITH (pages_per_range = 32);
 
 CREATE INDEX IF NOT EXISTS idx_health_metrics_status
 ON analytics.health_metrics(status);
@@ -95,53 +137,159 @@ COMMENT ON TABLE analytics.health_metrics IS
 'System health metrics for dashboard monitoring';
 """
 
-# View for latest health status per component (optimized for dashboard)
-HEALTH_VIEW_SQL = """
-CREATE OR REPLACE VIEW analytics.v_current_health AS
+HEALTH_PARTITION_PREFIX = "health_metrics_"
+
+# Child partitions of health_metrics with their estimated row counts
+HEALTH_PARTITIONS_SQL = """
+SELECT child.relname, GREATEST(child.reltuples, 0)::bigint
+FROM pg_inherits
+JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+WHERE ns.nspname = 'analytics' AND parent.relname = 'health_metrics'
+"""
+
+# Pre-partitioning releases read the latest status through this view; it
+# is superseded by health_current and would pin the legacy table
+HEALTH_LEGACY_VIEW_SQL = "DROP VIEW IF EXISTS analytics.v_current_health"
+
+# UTC days holding rows in a pre-partitioning health_metrics table
+HEALTH_LEGACY_DAYS_SQL = text("""
+SELECT DISTINCT CAST(checked_at AT TIME ZONE 'UTC' AS date)
+FROM analytics.health_metrics_legacy
+""")
+
+# Days whose partition this process has already created, per database
+# (see created_partitions)
+_partition_days: dict[str, set[date]] = {}
+
+# One row per component holding its latest check, upserted on every write so
+# dashboard reads touch O(components) rows with no DISTINCT ON sort.
+HEALTH_CURRENT_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS analytics.health_current (
+    component_name VARCHAR(100) PRIMARY KEY,
+    status VARCHAR(20) NOT NULL,
+    checked_at TIMESTAMPTZ NOT NULL,
+    latency_ms DECIMAL(10, 2),
+    error_rate DECIMAL(5, 4),
+    message TEXT,
+    details JSONB DEFAULT '{}'::jsonb
+);
+
+INSERT INTO analytics.health_current (
+    component_name, status, checked_at, latency_ms, error_rate, message, details
+)
 SELECT DISTINCT ON (component_name)
-    component_name,
-    status,
-    checked_at,
-    latency_ms,
-    error_rate,
-    message,
-    details
+    component_name, status, checked_at, latency_ms, error_rate, message, details
 FROM analytics.health_metrics
-ORDER BY component_name, checked_at DESC;
+ORDER BY component_name, checked_at DESC
+ON CONFLICT (component_name) DO NOTHING;
 
-COMMENT ON VIEW analytics.v_current_health IS
-'Latest health status for each component, optimized for dashboard queries';
+COMMENT ON TABLE analytics.health_current IS
+'Latest health status for each component (optimized for dashboard)';
 """
 
 
 def create_health_tables(engine: Engine) -> None:
-    """Create health metrics table and view.
+    """Create health metrics history and current-health tables.
+
+    All DDL runs in a single transaction, with each script sent to the
+    driver as one multi-statement round-trip. A plain health_metrics table
+    left by an earlier release is converted to the partitioned layout in
+    the same transaction, keeping its rows; the v_current_health view it
+    replaces with health_current is dropped first.
 
     Args:
         engine: SQLAlchemy engine instance
     """
-    # Ensure analytics schema exists
-    with engine.connect() as conn:
-        conn.execute(text("CREATE SCHEMA IF NOT EXISTS analytics"))
-        conn.commit()
+    today = datetime.now(timezone.utc).date()
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE SCHEMA IF NOT EXISTS analytics")
+        conn.exec_driver_sql(HEALTH_LEGACY_VIEW_SQL)
+        legacy = retire_plain_table(conn, "health_metrics")
+        conn.exec_driver_sql(HEALTH_METRICS_TABLE_SQL)
+        if legacy:
+            days = conn.execute(HEALTH_LEGACY_DAYS_SQL).scalars().all()
+            for day in days:
+                conn.exec_driver_sql(_partition_sql(day))
+            copy_legacy_rows(conn, "health_metrics")
+        conn.exec_driver_sql(HEALTH_CURRENT_TABLE_SQL)
+        conn.exec_driver_sql(_partition_sql(today))
+
+    # The table may have been dropped and re-created, taking its partitions
+    # with it, so only today's is known to exist
+    created = created_partitions(_partition_days, engine)
+    created.clear()
+    created.add(today)
+
+    logger.info("health_tables_created")
+
+
+def _partition_name(day: date) -> str:
+    """Name of the health_metrics partition holding ``day`` (UTC)."""
+    return f"{HEALTH_PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def _partition_sql(day: date) -> str:
+    """DDL creating the health_metrics partition for ``day`` if missing."""
+    next_day = day + timedelta(days=1)
+    return f"""
+    CREATE TABLE IF NOT EXISTS analytics.{_partition_name(day)}
+    PARTITION OF analytics.health_metrics
+    FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') TO ('{next_day.isoformat()} 00:00:00+00')
+    """
 
-    # Create health metrics table
-    with engine.connect() as conn:
-        for statement in HEALTH_METRICS_TABLE_SQL.split(";"):
-            statement = statement.strip()
-            if statement:
-                conn.execute(text(statement))
-        conn.commit()
 
-    # Create health view
+def ensure_partition(engine: Engine, day: date) -> None:
+    """Create the daily health_metrics partition for a UTC day if missing.
+
+    Days this process already created in the engine's database are skipped
+    without a round-trip.
+    Indexes defined on the parent table are applied to the new partition.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        day: UTC calendar day the partition covers
+    """
+    created = created_partitions(_partition_days, engine)
+    if day in created:
+        return
+
     with engine.connect() as conn:
-        for statement in HEALTH_VIEW_SQL.split(";"):
-            statement = statement.strip()
-            if statement:
-                conn.execute(text(statement))
+        conn.execute(text(_partition_sql(day)))
         conn.commit()
 
-    logger.info("health_tables_created")
+    created.add(day)
+    logger.debug("health_partition_ensured", partition=_partition_name(day))
+
+
+HEALTH_INSERT_SQL = """
+INSERT INTO analytics.health_metrics (
+    component_name, status, checked_at, latency_ms,
+    error_count, request_count, error_rate, message, details
+) VALUES (
+    :component_name, :status, :checked_at, :latency_ms,
+    :error_count, :request_count, :error_rate, :message, CAST(:details AS jsonb)
+)
+"""
+
+HEALTH_UPSERT_CURRENT_SQL = """
+INSERT INTO analytics.health_current (
+    component_name, status, checked_at, latency_ms, error_rate, message, details
+) VALUES (
+    :component_name, :status, :checked_at, :latency_ms,
+    :error_rate, :message, CAST(:details AS jsonb)
+)
+ON CONFLICT (component_name) DO UPDATE SET
+    status = EXCLUDED.status,
+    checked_at = EXCLUDED.checked_at,
+    latency_ms = EXCLUDED.latency_ms,
+    error_rate = EXCLUDED.error_rate,
+    message = EXCLUDED.message,
+    details = EXCLUDED.details
+WHERE EXCLUDED.checked_at >= analytics.health_current.checked_at
+"""
 
 
 def record_health_check(
@@ -153,6 +301,7 @@ def record_health_check(
     request_count: int = 0,
     message: str | None = None,
     details: dict[str, Any] | None = None,
+    checked_at: datetime | None = None,
 ) -> None:
     """Record a health check result.
 
@@ -165,50 +314,101 @@ def record_health_check(
         request_count: Total requests in check period
         message: Optional status message
         details: Optional additional details
+        checked_at: Optional timezone-aware check time (defaults to now)
     """
-    error_rate = None
-    if request_count > 0:
-        error_rate = error_count / request_count
-
-    insert_sql = """
-    INSERT INTO analytics.health_metrics (
-        component_name, status, checked_at, latency_ms,
-        error_count, request_count, error_rate, message, details
-    ) VALUES (
-        :component_name, :status, :checked_at, :latency_ms,
-        :error_count, :request_count, :error_rate, :message, :details
+    record_health_checks(
+        engine,
+        [
+            HealthCheckResult(
+                component_name=component_name,
+                status=status,
+                latency_ms=latency_ms,
+                error_count=error_count,
+                request_count=request_count,
+                message=message,
+                details=details,
+            )
+        ],
+        checked_at=checked_at,
     )
+
+
+def record_health_checks(
+    engine: Engine,
+    checks: list[HealthCheckResult],
+    checked_at: datetime | None = None,
+) -> None:
+    """Record a batch of health check results in one transaction.
+
+    All rows are sent with a single executemany call and committed once,
+    rather than one connection and commit per component. The same
+    transaction upserts each component's latest row into health_current.
+    The clock is read once and the timestamp shared by every row.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        checks: Health check results to record
+        checked_at: Optional timezone-aware check time (defaults to now)
     """
+    if not checks:
+        return
+
+    if checked_at is None:
+        checked_at = datetime.now(timezone.utc)
+    ensure_partition(engine, checked_at.astimezone(timezone.utc).date())
+
+    params = [
+        {
+            "component_name": check.component_name,
+            "status": check.status.value,
+            "checked_at": checked_at,
+            "latency_ms": check.latency_ms,
+            "error_count": check.error_count,
+            "request_count": check.request_count,
+            "error_rate": check.error_rate,
+            "message": check.message,
+            # Serialized here with orjson; psycopg2 has no default dict adapter
+            "details": orjson.dumps(check.details or {}).decode(),
+        }
+        for check in checks
+    ]
 
     with engine.connect() as conn:
-        conn.execute(
-            text(insert_sql),
-            {
-                "component_name": component_name,
-                "status": status.value,
-                "checked_at": datetime.now(timezone.utc),
-                "latency_ms": latency_ms,
-                "error_count": error_count,
-                "request_count": request_count,
-                "error_rate": error_rate,
-                "message": message,
-                "details": details or {},
-            },
-        )
+        conn.execute(text(HEALTH_INSERT_SQL), params)
+        conn.execute(text(HEALTH_UPSERT_CURRENT_SQL), params)
         conn.commit()
 
-    logger.debug(
-        "health_check_recorded",
-        component=component_name,
-        status=status.value,
-        latency_ms=latency_ms,
+    for check in checks:
+        logger.debug(
+            "health_check_recorded",
+            component=check.component_name,
+            status=check.status.value,
+            latency_ms=check.latency_ms,
+        )
+
+
+def _component_from_row(row: Any) -> ComponentHealth:
+    """Build a ComponentHealth from a health_current row.
+
+    Expects the leading columns component_name, status, checked_at,
+    latency_ms, error_rate, message, details.
+    """
+    return ComponentHealth(
+        name=row[0],
+        status=_STATUS_FROM_STR.get(row[1], ComponentStatus.UNKNOWN),
+        last_check=row[2],
+        latency_ms=float(row[3]) if row[3] else None,
+        error_rate=float(row[4]) if row[4] else None,
+        message=row[5],
+        details=row[6] or {},
     )
 
 
 def get_current_health(engine: Engine) -> SystemHealth:
     """Get current health status for all components.
 
-    Queries the v_current_health view for latest status.
+    Reads the health_current table, which holds one row per component.
+    Status counts are computed by the database in the same round-trip.
     Query is optimized to complete in <50ms.
 
     Args:
@@ -225,34 +425,24 @@ def get_current_health(engine: Engine) -> SystemHealth:
         latency_ms,
         error_rate,
         message,
-        details
-    FROM analytics.v_current_health
+        details,
+        count(*) FILTER (WHERE status = 'healthy') OVER () AS n_healthy,
+        count(*) FILTER (WHERE status = 'degraded') OVER () AS n_degraded,
+        count(*) FILTER (WHERE status = 'unhealthy') OVER () AS n_unhealthy
+    FROM analytics.health_current
     ORDER BY component_name
     """
 
     components: list[ComponentHealth] = []
+    healthy = degraded = unhealthy = 0
 
     with engine.connect() as conn:
         result = conn.execute(text(query))
 
         for row in result:
-            status = ComponentStatus(row[1]) if row[1] else ComponentStatus.UNKNOWN
-            components.append(
-                ComponentHealth(
-                    name=row[0],
-                    status=status,
-                    last_check=row[2],
-                    latency_ms=float(row[3]) if row[3] else None,
-                    error_rate=float(row[4]) if row[4] else None,
-                    message=row[5],
-                    details=row[6] or {},
-                )
-            )
-
-    # Calculate aggregates
-    healthy = sum(1 for c in components if c.status == ComponentStatus.HEALTHY)
-    degraded = sum(1 for c in components if c.status == ComponentStatus.DEGRADED)
-    unhealthy = sum(1 for c in components if c.status == ComponentStatus.UNHEALTHY)
+            # Window aggregates repeat the same status counts on every row
+            healthy, degraded, unhealthy = row[7], row[8], row[9]
+            components.append(_component_from_row(row))
 
     # Determine overall status
     if unhealthy > 0:
@@ -274,20 +464,30 @@ def get_current_health(engine: Engine) -> SystemHealth:
     )
 
 
-def get_health_history(
+# Rows fetched per round-trip when streaming health history
+HEALTH_HISTORY_CHUNK_SIZE = 200
+
+
+def iter_health_history(
     engine: Engine,
     component_name: str | None = None,
     hours: int = 24,
-) -> list[dict[str, Any]]:
-    """Get health check history.
+    chunk_size: int = HEALTH_HISTORY_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """Stream health check history, newest first.
+
+    Rows are read through a server-side cursor ``chunk_size`` at a time, so
+    only one chunk is held in memory. The connection stays open until the
+    iterator is exhausted or closed.
 
     Args:
         engine: SQLAlchemy engine instance
         component_name: Optional filter by component
         hours: Number of hours of history to return
+        chunk_size: Rows fetched per round-trip
 
-    Returns:
-        List of health check records
+    Yields:
+        Health check records
     """
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
 
@@ -311,9 +511,13 @@ def get_health_history(
     query += " ORDER BY checked_at DESC LIMIT 1000"
 
     with engine.connect() as conn:
-        result = conn.execute(text(query), params)
-        return [
-            {
+        result = conn.execute(
+            text(query),
+            params,
+            execution_options={"stream_results": True, "yield_per": chunk_size},
+        )
+        for row in result:
+            yield {
                 "component_name": row[0],
                 "status": row[1],
                 "checked_at": row[2],
@@ -321,8 +525,24 @@ def get_health_history(
                 "error_rate": float(row[4]) if row[4] else None,
                 "message": row[5],
             }
-            for row in result
-        ]
+
+
+def get_health_history(
+    engine: Engine,
+    component_name: str | None = None,
+    hours: int = 24,
+) -> list[dict[str, Any]]:
+    """Get health check history.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        component_name: Optional filter by component
+        hours: Number of hours of history to return
+
+    Returns:
+        List of health check records
+    """
+    return list(iter_health_history(engine, component_name=component_name, hours=hours))
 
 
 def check_degraded_components(engine: Engine) -> list[ComponentHealth]:
@@ -334,22 +554,43 @@ def check_degraded_components(engine: Engine) -> list[ComponentHealth]:
     Returns:
         List of degraded/unhealthy components
     """
-    health = get_current_health(engine)
-    return [
-        c for c in health.components
-        if c.status in (ComponentStatus.DEGRADED, ComponentStatus.UNHEALTHY)
-    ]
+    return _fetch_degraded(engine)
+
+
+def _fetch_degraded(engine: Engine) -> list[ComponentHealth]:
+    """Query only degraded/unhealthy rows so healthy components stay in the DB."""
+    query = """
+    SELECT
+        component_name,
+        status,
+        checked_at,
+        latency_ms,
+        error_rate,
+        message,
+        details
+    FROM analytics.health_current
+    WHERE status IN ('degraded', 'unhealthy')
+    ORDER BY component_name
+    """
+
+    with engine.connect() as conn:
+        result = conn.execute(text(query))
+        return [_component_from_row(row) for row in result]
 
 
 def cleanup_old_health_records(engine: Engine, days: int = 7) -> int:
     """Clean up old health records.
 
+    Daily partitions that lie entirely before the cutoff are dropped; only
+    the partition straddling the cutoff has rows deleted individually.
+
     Args:
         engine: SQLAlchemy engine instance
         days: Number of days to retain
 
     Returns:
-        Number of records deleted
+        Number of records deleted (estimated from statistics for dropped
+        partitions)
     """
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
@@ -358,14 +599,33 @@ def cleanup_old_health_records(engine: Engine, days: int = 7) -> int:
     WHERE checked_at < :cutoff
     """
 
+    dropped: list[str] = []
+    deleted = 0
+
     with engine.connect() as conn:
+        for name, estimated_rows in conn.execute(text(HEALTH_PARTITIONS_SQL)):
+            try:
+                day = datetime.strptime(
+                    name.removeprefix(HEALTH_PARTITION_PREFIX), "%Y%m%d"
+                ).date()
+            except ValueError:
+                continue
+
+            # Partition covers [day, day + 1); drop it only if wholly expired
+            if day + timedelta(days=1) <= cutoff.date():
+                conn.execute(text(f"DROP TABLE IF EXISTS analytics.{name}"))
+                created_partitions(_partition_days, engine).discard(day)
+                dropped.append(name)
+                deleted += estimated_rows
+
         result = conn.execute(text(delete_sql), {"cutoff": cutoff})
-        deleted = result.rowcount
+        deleted += result.rowcount
         conn.commit()
 
     logger.info(
         "health_records_cleaned",
         deleted=deleted,
+        dropped_partitions=len(dropped),
         retention_days=days,
     )
 
@@ -4,13 +4,40 @@ Matches weather data to relevant Kalshi markets and calculates
 relevance scores for trading opportunities.
 """
 
+import heapq
+import logging
+from collections.abc import Callable
 from datetime import date
-from typing import Any
+from operator import attrgetter, is_
+from typing import Any, cast
+
+import numpy as np
+import numpy.typing as npt
 
 from src.shared.api.response_models import Market
 from src.shared.config.logging import get_logger
+from src.shared.constants import CITY_CODES
 
 logger = get_logger(__name__)
+_stdlib_logger = logging.getLogger(__name__)
+
+# Relevance score cache size; the cache is cleared once it would grow past this
+_SCORE_CACHE_MAX_ENTRIES = 4096
+
+# Memoized queries per lookup index; an index is cleared once it is full
+_INDEX_MAX_QUERIES = 1024
+
+# Everything a relevance score depends on: (status, volume + open interest, spread)
+_ScoreKey = tuple[str, int, int | None]
+
+
+def _score_key(market: Market) -> _ScoreKey:
+    """Cache key for a market's relevance score.
+
+    Scores are a pure function of these inputs, so a cached score can never
+    be stale, and markets with identical inputs share one entry.
+    """
+    return (market.status, market.volume + market.open_interest, market.spread_cents)
 
 
 class OpportunityDetector:
@@ -22,8 +49,102 @@ class OpportunityDetector:
 
     def __init__(self) -> None:
         """Initialize opportunity detector."""
+        # Expiration dates of the last market list seen, as datetime64[D]
+        self._expiration_cache: tuple[list[Market], int, npt.NDArray[np.datetime64]] | None = None
+        # Snapshot of the indexed market list and positions into it, keyed by
+        # lowercase city/query
+        self._indexed_markets: tuple[Market, ...] | None = None
+        self._city_index: dict[str, list[int]] = {}
+        self._keyword_index: dict[str, list[int]] = {}
+        # Relevance scores keyed by their inputs (see _score_key)
+        self._score_cache: dict[_ScoreKey, float] = {}
         logger.info("opportunity_detector_initialized")
 
+    def refresh_markets(self, markets: list[Market]) -> None:
+        """Reset per-market caches for a newly fetched market list.
+
+        Drops cached expiration dates and relevance scores and re-indexes
+        the new list.
+
+        Args:
+            markets: Freshly fetched markets
+        """
+        self._score_cache = {}
+        self._expiration_cache = None
+        self.index(markets)
+
+    def index(self, markets: list[Market]) -> None:
+        """Index a market list for repeated city and keyword lookups.
+
+        Positions of every known city code are computed up front; other
+        queries are scanned once and memoized (an index is cleared once it
+        holds _INDEX_MAX_QUERIES queries). Lookups passing a list with the
+        same markets in the same order are then answered from the index; any
+        other list (including this one after an append or replacement) is
+        scanned.
+
+        Args:
+            markets: Markets to index
+        """
+        self._indexed_markets = tuple(markets)
+        self._city_index = {
+            city_lower: [
+                i for i, market in enumerate(markets) if city_lower in market.ticker_search_text
+            ]
+            for city_lower in (code.lower() for code in CITY_CODES)
+        }
+        self._keyword_index = {}
+
+        logger.debug("markets_indexed", total_markets=len(markets))
+
+    def _indexed_lookup(
+        self,
+        index: dict[str, list[int]],
+        needle: str,
+        markets: list[Market],
+        search_text: Callable[[Market], str],
+    ) -> list[Market]:
+        """Find markets whose search text contains ``needle``.
+
+        Uses (and fills) ``index`` when ``markets`` still holds exactly the
+        indexed markets, otherwise falls back to a plain substring scan.
+        """
+        snapshot = self._indexed_markets
+        if (
+            snapshot is None
+            or len(markets) != len(snapshot)
+            or not all(map(is_, markets, snapshot))
+        ):
+            return [market for market in markets if needle in search_text(market)]
+
+        positions = index.get(needle)
+        if positions is None:
+            positions = [i for i, market in enumerate(markets) if needle in search_text(market)]
+            if len(index) >= _INDEX_MAX_QUERIES:
+                index.clear()
+            index[needle] = positions
+        return [markets[i] for i in positions]
+
+    def _expiration_dates(self, markets: list[Market]) -> npt.NDArray[np.datetime64]:
+        """Get expiration dates aligned with ``markets``, missing as NaT.
+
+        The array is rebuilt only when a different (or resized) market list
+        is passed, so repeated filters over one refresh reuse it.
+        """
+        cached = self._expiration_cache
+        if cached is not None and cached[0] is markets and cached[1] == len(markets):
+            return cached[2]
+
+        dates = np.array(
+            [
+                None if (expiration := market.expiration_time) is None else expiration.date()
+                for market in markets
+            ],
+            dtype="datetime64[D]",
+        )
+        self._expiration_cache = (markets, len(markets), dates)
+        return dates
+
     def find_weather_markets(self, query: str, markets: list[Market]) -> list[Market]:
         """Find markets matching a search query.
 
@@ -38,15 +159,9 @@ class OpportunityDetector:
             >>> detector = OpportunityDetector()
             >>> nyc_markets = detector.find_weather_markets("NYC", all_markets)
         """
-        query_lower = query.lower()
-
-        filtered = [
-            market
-            for market in markets
-            if query_lower in market.ticker.lower()
-            or query_lower in market.title.lower()
-            or query_lower in market.event_ticker.lower()
-        ]
+        filtered = self._indexed_lookup(
+            self._keyword_index, query.lower(), markets, attrgetter("search_text")
+        )
 
         logger.debug(
             "weather_markets_found",
@@ -71,13 +186,9 @@ class OpportunityDetector:
             >>> detector = OpportunityDetector()
             >>> nyc_markets = detector.match_city_to_markets("NYC", all_markets)
         """
-        city_upper = city.upper()
-
-        matched = [
-            market
-            for market in markets
-            if city_upper in market.ticker.upper() or city_upper in market.event_ticker.upper()
-        ]
+        matched = self._indexed_lookup(
+            self._city_index, city.lower(), markets, attrgetter("ticker_search_text")
+        )
 
         logger.info(
             "city_markets_matched",
@@ -103,15 +214,11 @@ class OpportunityDetector:
         Returns:
             Markets expiring within the date range
         """
-        filtered = []
-
-        for market in markets:
-            if market.expiration_time is None:
-                continue
+        exp_dates = self._expiration_dates(markets)
 
-            exp_date = market.expiration_time.date()
-            if start <= exp_date <= end:
-                filtered.append(market)
+        # NaT compares False, so markets without an expiration drop out
+        mask = (exp_dates >= np.datetime64(start, "D")) & (exp_dates <= np.datetime64(end, "D"))
+        filtered = [markets[i] for i in np.flatnonzero(mask)]
 
         logger.debug(
             "markets_filtered_by_date",
@@ -138,44 +245,101 @@ class OpportunityDetector:
             - Spread tightness
             - Time to expiration
         """
-        score = 0.0
+        key = _score_key(market)
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            return cached
 
-        # Liquidity component (0-0.4)
         total_liquidity = market.volume + market.open_interest
-        if total_liquidity > 0:
-            # Normalize: 1000+ contracts = max score
-            liquidity_score = min(total_liquidity / 1000.0, 1.0) * 0.4
-            score += liquidity_score
-
-        # Spread component (0-0.3)
-        if market.spread_cents is not None:
-            # Tighter spread = higher score
-            # 1 cent spread = max, 5+ cents = min
-            spread_score = max(0.0, (5.0 - market.spread_cents) / 5.0) * 0.3
-            score += spread_score
-
-        # Market status component (0-0.3)
-        if market.status == "open":
-            score += 0.3
-
-        logger.debug(
-            "market_relevance_calculated",
-            ticker=market.ticker,
-            score=score,
-            liquidity=total_liquidity,
-            spread=market.spread_cents,
+        spread = market.spread_cents
+
+        # Same operation order as _score_markets so batch scores match exactly:
+        # liquidity (0-0.4, 1000+ contracts = max), spread (0-0.3, 1 cent = max,
+        # 5+ cents or unknown = 0), open status (0.3)
+        score = (
+            min(max(total_liquidity, 0) / 1000.0, 1.0) * 0.4
+            + (0.0 if spread is None else max(0.0, (5.0 - spread) / 5.0) * 0.3)
+            + (0.3 if market.status == "open" else 0.0)
         )
 
-        return min(score, 1.0)
+        # Skip building the event dict on the hot path unless debug is on
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "market_relevance_calculated",
+                ticker=market.ticker,
+                score=score,
+                liquidity=total_liquidity,
+                spread=spread,
+            )
+
+        score = min(score, 1.0)
+        if len(self._score_cache) >= _SCORE_CACHE_MAX_ENTRIES:
+            self._score_cache.clear()
+        self._score_cache[key] = score
+        return score
+
+    def _cached_scores(self, markets: list[Market]) -> npt.NDArray[np.float64]:
+        """Relevance scores aligned with ``markets``, scoring only cache misses.
+
+        Args:
+            markets: Non-empty list of markets to score
+
+        Returns:
+            Array of relevance scores aligned with ``markets``
+        """
+        cache = self._score_cache
+        keys = [_score_key(market) for market in markets]
+        # One market per missing key; markets sharing inputs share a score
+        missing = {key: market for key, market in zip(keys, markets, strict=True) if key not in cache}
+        if missing:
+            if len(cache) + len(missing) > _SCORE_CACHE_MAX_ENTRIES:
+                cache.clear()
+            scores = cast(list[float], self._score_markets(list(missing.values())).tolist())
+            cache.update(zip(missing, scores, strict=True))
+        return np.fromiter((cache[key] for key in keys), dtype=np.float64, count=len(markets))
+
+    @staticmethod
+    def _score_markets(markets: list[Market]) -> npt.NDArray[np.float64]:
+        """Vectorized equivalent of calculate_market_relevance_score.
+
+        Args:
+            markets: Non-empty list of markets to score
+
+        Returns:
+            Array of relevance scores aligned with ``markets``
+        """
+        rows = [
+            (
+                market.volume + market.open_interest,
+                np.nan if (cents := market.spread_cents) is None else cents,
+                market.status == "open",
+            )
+            for market in markets
+        ]
+        liquidity, spread, is_open = (np.array(col, dtype=np.float64) for col in zip(*rows, strict=True))
+
+        liquidity_score = np.minimum(np.maximum(liquidity, 0.0) / 1000.0, 1.0) * 0.4
+        # Missing spread contributes nothing (treated as a 5+ cent spread)
+        spread_score = np.maximum(0.0, (5.0 - np.nan_to_num(spread, nan=5.0)) / 5.0) * 0.3
+        status_score = is_open * 0.3
+
+        scores: npt.NDArray[np.float64] = np.minimum(
+            liquidity_score + spread_score + status_score, 1.0
+        )
+        return scores
 
     def detect_opportunities(
-        self, weather_data: dict[str, Any], markets: list[Market]
+        self,
+        weather_data: dict[str, Any],
+        markets: list[Market],
+        top_k: int | None = None,
     ) -> list[tuple[Market, float]]:
         """Detect trading opportunities from weather and market data.
 
         Args:
             weather_data: Normalized weather data dictionary
             markets: List of markets to evaluate
+            top_k: Only return the best ``top_k`` opportunities (all if None)
 
         Returns:
             List of (market, relevance_score) tuples, sorted by score descending
@@ -185,17 +349,26 @@ class OpportunityDetector:
             >>> opportunities = detector.detect_opportunities(weather, markets)
             >>> best_market, score = opportunities[0]
         """
-        opportunities = []
-
-        for market in markets:
-            score = self.calculate_market_relevance_score(market, weather_data)
-
-            # Only include markets with meaningful relevance
-            if score >= 0.3:
-                opportunities.append((market, score))
-
-        # Sort by score descending
-        opportunities.sort(key=lambda x: x[1], reverse=True)
+        if not markets:
+            opportunities: list[tuple[Market, float]] = []
+        else:
+            scores = self._cached_scores(markets)
+
+            # Only include markets with meaningful relevance, best first
+            # (both paths keep input order among equal scores)
+            if top_k is None:
+                order = np.argsort(-scores, kind="stable")
+                opportunities = [
+                    (markets[i], float(scores[i])) for i in order if scores[i] >= 0.3
+                ]
+            else:
+                score_list = cast(list[float], scores.tolist())
+                best = heapq.nlargest(
+                    top_k,
+                    cast(list[int], np.flatnonzero(scores >= 0.3).tolist()),
+                    key=score_list.__getitem__,
+                )
+                opportunities = [(markets[i], score_list[i]) for i in best]
 
         logger.info(
             "opportunities_detected",
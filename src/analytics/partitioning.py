@@ -0,0 +1,167 @@
+"""One-off conversion of plain analytics tables to partitioned tables.
+
+Releases before partitioning created the health and rollup tables as plain
+tables. ``CREATE TABLE IF NOT EXISTS ... PARTITION BY`` is a no-op against
+such a table, and the ``PARTITION OF`` DDL that follows then fails. The table
+creators call these helpers first, inside their own transaction:
+
+1. ``retire_plain_table`` drops views built on a plain table, renames it
+   to ``<table>_legacy``, and frees its sequence, constraint, and index
+   names.
+2. The caller creates the partitioned table and the partitions the legacy
+   rows need.
+3. ``copy_legacy_rows`` copies the rows across and drops the legacy table.
+
+A table that is already partitioned (or missing) is left alone, so calling
+the table creators stays idempotent.
+
+``created_partitions`` scopes the table modules' "partition already created"
+caches to one database.
+"""
+
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from src.shared.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+LEGACY_SUFFIX = "_legacy"
+
+# 'r' for a plain table, 'p' for a partitioned one, NULL if missing
+TABLE_RELKIND_SQL = text("""
+SELECT c.relkind
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = 'analytics' AND c.relname = :table
+""")
+
+# Views and materialized views reading the table. A rename carries them
+# over to the legacy table, whose DROP they would then block.
+DEPENDENT_VIEWS_SQL = text("""
+SELECT DISTINCT CAST(v.oid AS regclass)::text, v.relkind
+FROM pg_depend d
+JOIN pg_rewrite r ON r.oid = d.objid
+JOIN pg_class v ON v.oid = r.ev_class
+WHERE d.classid = CAST('pg_rewrite' AS regclass)
+  AND d.refobjid = CAST(:relation AS regclass)
+  AND v.oid <> d.refobjid
+  AND v.relkind IN ('v', 'm')
+""")
+
+# Primary key and unique constraints; dropping them drops their indexes too
+TABLE_KEY_CONSTRAINTS_SQL = text("""
+SELECT conname
+FROM pg_constraint
+WHERE conrelid = CAST(:relation AS regclass) AND contype IN ('p', 'u')
+""")
+
+# Indexes not backing a constraint
+TABLE_PLAIN_INDEXES_SQL = text("""
+SELECT CAST(i.indexrelid AS regclass)::text
+FROM pg_index i
+LEFT JOIN pg_constraint c ON c.conindid = i.indexrelid
+WHERE i.indrelid = CAST(:relation AS regclass) AND c.oid IS NULL
+""")
+
+SERIAL_SEQUENCE_SQL = text("SELECT pg_get_serial_sequence(:relation, 'id')")
+
+# Columns present in both the legacy table and its partitioned replacement
+SHARED_COLUMNS_SQL = text("""
+SELECT column_name
+FROM information_schema.columns
+WHERE table_schema = 'analytics' AND table_name = :legacy
+INTERSECT
+SELECT column_name
+FROM information_schema.columns
+WHERE table_schema = 'analytics' AND table_name = :table
+""")
+
+
+def created_partitions(cache: dict[str, set[date]], engine: Engine) -> set[date]:
+    """Partitions ``cache`` records as created in ``engine``'s database.
+
+    Entries are keyed by the engine URL, so a process using several databases
+    never skips a partition that only another database has.
+
+    Args:
+        cache: Module-level cache of partition start dates per database
+        engine: SQLAlchemy engine instance
+
+    Returns:
+        Mutable set of partition start dates for this database
+    """
+    return cache.setdefault(str(engine.url), set())
+
+
+def retire_plain_table(conn: Connection, table: str) -> bool:
+    """Rename a plain ``analytics.<table>`` aside so a partitioned one can replace it.
+
+    The legacy table keeps its rows but loses its keys and indexes, so their
+    names (and the id sequence name) are free for the new table. Views on
+    the table are dropped first; callers recreate any they still need.
+
+    Args:
+        conn: Connection inside the caller's DDL transaction
+        table: Table name within the analytics schema
+
+    Returns:
+        True if a plain table was found and renamed to ``<table>_legacy``
+    """
+    if conn.execute(TABLE_RELKIND_SQL, {"table": table}).scalar() != "r":
+        return False
+
+    views = conn.execute(DEPENDENT_VIEWS_SQL, {"relation": f"analytics.{table}"}).all()
+    for name, relkind in views:
+        kind = "MATERIALIZED VIEW" if relkind == "m" else "VIEW"
+        conn.exec_driver_sql(f"DROP {kind} IF EXISTS {name} CASCADE")
+        logger.warning("dependent_view_dropped", table=table, view=name)
+
+    legacy = f"{table}{LEGACY_SUFFIX}"
+    relation = f"analytics.{legacy}"
+    conn.exec_driver_sql(f"ALTER TABLE analytics.{table} RENAME TO {legacy}")
+
+    sequence = conn.execute(SERIAL_SEQUENCE_SQL, {"relation": relation}).scalar()
+    if sequence:
+        conn.exec_driver_sql(f"ALTER SEQUENCE {sequence} RENAME TO {legacy}_id_seq")
+
+    for name in conn.execute(TABLE_KEY_CONSTRAINTS_SQL, {"relation": relation}).scalars().all():
+        conn.exec_driver_sql(f'ALTER TABLE {relation} DROP CONSTRAINT "{name}"')
+
+    for name in conn.execute(TABLE_PLAIN_INDEXES_SQL, {"relation": relation}).scalars().all():
+        conn.exec_driver_sql(f"DROP INDEX {name}")
+
+    logger.info("plain_table_retired", table=table, legacy=legacy)
+    return True
+
+
+def copy_legacy_rows(conn: Connection, table: str) -> int:
+    """Copy ``<table>_legacy`` into the partitioned ``analytics.<table>`` and drop it.
+
+    Only columns both tables have are copied; newer columns take their
+    defaults. The id sequence is advanced past the copied ids.
+
+    Args:
+        conn: Connection inside the caller's DDL transaction
+        table: Table name within the analytics schema
+
+    Returns:
+        Number of rows copied
+    """
+    legacy = f"{table}{LEGACY_SUFFIX}"
+    shared = conn.execute(SHARED_COLUMNS_SQL, {"legacy": legacy, "table": table}).scalars().all()
+    columns = ", ".join(f'"{column}"' for column in sorted(shared))
+
+    copied = conn.exec_driver_sql(
+        f"INSERT INTO analytics.{table} ({columns}) SELECT {columns} FROM analytics.{legacy}"
+    ).rowcount
+    conn.exec_driver_sql(
+        f"SELECT setval(pg_get_serial_sequence('analytics.{table}', 'id'), "
+        f"COALESCE(MAX(id), 0) + 1, false) FROM analytics.{table}"
+    )
+    conn.exec_driver_sql(f"DROP TABLE analytics.{legacy}")
+
+    logger.info("legacy_rows_copied", table=table, rows=copied)
+    return copied
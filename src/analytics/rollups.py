@@ -4,20 +4,28 @@ Provides rollup tables for city metrics, strategy metrics, and equity curves
 with incremental update capabilities.
 """
 
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any
 
 from sqlalchemy import text
-from sqlalchemy.engine import Engine
-
+from sqlalchemy.engine import Connection, Engine
+
+from src.analytics.partitioning import (
+    LEGACY_SUFFIX,
+    copy_legacy_rows,
+    created_partitions,
+    retire_plain_table,
+)
 from src.shared.config.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class CityMetrics:
     """Daily metrics for a single city."""
 
@@ -52,7 +60,7 @@ class CityMetrics:
         return float(self.win_count) / float(self.loss_count)
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategyMetrics:
     """Daily metrics for a single strategy."""
 
@@ -84,7 +92,7 @@ class StrategyMetrics:
         return (self.trade_count / self.signal_count) * 100
 
 
-@dataclass
+@dataclass(slots=True)
 class EquityCurvePoint:
     """Single point on the equity curve."""
 
@@ -101,7 +109,7 @@ class EquityCurvePoint:
 # SQL for creating rollup tables
 CITY_METRICS_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS analytics.city_metrics_daily (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     city_code VARCHAR(3) NOT NULL,
     date DATE NOT NULL,
     trade_count INTEGER NOT NULL DEFAULT 0,
@@ -115,8 +123,9 @@ CREATE TABLE IF NOT EXISTS analytics.city_metrics_daily (
     max_position_size DECIMAL(18, 2) DEFAULT 0,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id, date),
     UNIQUE(city_code, date)
-);
+) PARTITION BY RANGE (date);
 
 CREATE INDEX IF NOT EXISTS idx_city_metrics_city_code
 ON analytics.city_metrics_daily(city_code);
@@ -130,7 +139,7 @@ COMMENT ON TABLE analytics.city_metrics_daily IS
 
 STRATEGY_METRICS_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS analytics.strategy_metrics_daily (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     strategy_name VARCHAR(100) NOT NULL,
     date DATE NOT NULL,
     signal_count INTEGER NOT NULL DEFAULT 0,
@@ -144,8 +153,9 @@ CREATE TABLE IF NOT EXISTS analytics.strategy_metrics_daily (
     avg_confidence DECIMAL(8, 4) DEFAULT 0,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id, date),
     UNIQUE(strategy_name, date)
-);
+) PARTITION BY RANGE (date);
 
 CREATE INDEX IF NOT EXISTS idx_strategy_metrics_strategy
 ON analytics.strategy_metrics_daily(strategy_name);
@@ -159,7 +169,7 @@ COMMENT ON TABLE analytics.strategy_metrics_daily IS
 
 EQUITY_CURVE_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS analytics.equity_curve_daily (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     date DATE NOT NULL UNIQUE,
     starting_equity DECIMAL(18, 2) NOT NULL,
     ending_equity DECIMAL(18, 2) NOT NULL,
@@ -169,8 +179,9 @@ CREATE TABLE IF NOT EXISTS analytics.equity_curve_daily (
     drawdown_pct DECIMAL(8, 4) NOT NULL DEFAULT 0,
     high_water_mark DECIMAL(18, 2) NOT NULL,
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
-);
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id, date)
+) PARTITION BY RANGE (date);
 
 CREATE INDEX IF NOT EXISTS idx_equity_curve_date
 ON analytics.equity_curve_daily(date);
@@ -180,56 +191,496 @@ COMMENT ON TABLE analytics.equity_curve_daily IS
 """
 
 
+# Rollup tables are range-partitioned by month on date, e.g.
+# analytics.city_metrics_daily_y2026m01
+ROLLUP_PARTITIONED_TABLES = (
+    "city_metrics_daily",
+    "strategy_metrics_daily",
+    "equity_curve_daily",
+)
+
+# Months (first day) whose partitions this process has already created, per
+# database (see created_partitions)
+_partition_months: dict[str, set[date]] = {}
+
+# Starting equity for the first equity curve entry
+DEFAULT_INITIAL_EQUITY = Decimal("992.10")
+
+# Columns returned by the rollup readers by default. Bookkeeping columns (id,
+# created_at/updated_at) stay in the database.
+CITY_METRICS_COLUMNS = (
+    "city_code", "date", "trade_count", "volume", "gross_pnl", "net_pnl", "fees",
+    "win_count", "loss_count", "avg_position_size", "max_position_size",
+)
+STRATEGY_METRICS_COLUMNS = (
+    "strategy_name", "date", "signal_count", "trade_count", "gross_pnl", "net_pnl",
+    "fees", "win_count", "loss_count", "avg_edge", "avg_confidence",
+)
+EQUITY_CURVE_COLUMNS = (
+    "date", "starting_equity", "ending_equity", "daily_pnl", "cumulative_pnl",
+    "drawdown", "drawdown_pct", "high_water_mark",
+)
+
+# Rows fetched per round-trip by the streaming iter_* readers
+ROLLUP_CHUNK_SIZE = 1000
+
+# Trades executed on :target_date. The half-open range on executed_at (rather
+# than DATE(executed_at) = ...) keeps the predicate usable by an index.
+# city_code is copied onto trades from markets by migration 003, so no markets
+# join is needed.
+DAY_TRADES_CTE = """
+day_trades AS (
+    SELECT
+        city_code, strategy_name, total_cost, realized_pnl, fees, quantity,
+        CAST(:target_date AS date) AS trade_date
+    FROM trades
+    WHERE executed_at >= CAST(:target_date AS date)
+      AND executed_at < CAST(:target_date AS date) + INTERVAL '1 day'
+)
+"""
+
+# Trades executed from :start_date through :end_date, in the same shape as
+# DAY_TRADES_CTE so the metric upserts can aggregate a whole range at once
+RANGE_TRADES_CTE = """
+day_trades AS (
+    SELECT
+        city_code, strategy_name, total_cost, realized_pnl, fees, quantity,
+        CAST(executed_at AS date) AS trade_date
+    FROM trades
+    WHERE executed_at >= CAST(:start_date AS date)
+      AND executed_at < CAST(:end_date AS date) + INTERVAL '1 day'
+)
+"""
+
+# Upserts below read from the day_trades CTE (DAY_TRADES_CTE, or
+# RANGE_TRADES_CTE for a date range) and recompute each day in full, so trades
+# committed late or edited afterwards (realized_pnl is filled in when a
+# position closes) are always reflected. The executed_at covering index from
+# migration 004 keeps the day scan index-only.
+CITY_METRICS_UPSERT_SQL = """
+INSERT INTO analytics.city_metrics_daily (
+    city_code, date, trade_count, volume, gross_pnl, net_pnl, fees,
+    win_count, loss_count, avg_position_size, max_position_size
+)
+SELECT
+    t.city_code,
+    t.trade_date,
+    COUNT(*) as trade_count,
+    SUM(t.total_cost) as volume,
+    SUM(COALESCE(t.realized_pnl, 0)) as gross_pnl,
+    SUM(COALESCE(t.realized_pnl, 0) - t.fees) as net_pnl,
+    SUM(t.fees) as fees,
+    SUM(CASE WHEN COALESCE(t.realized_pnl, 0) > 0 THEN 1 ELSE 0 END) as win_count,
+    SUM(CASE WHEN COALESCE(t.realized_pnl, 0) < 0 THEN 1 ELSE 0 END) as loss_count,
+    AVG(t.quantity) as avg_position_size,
+    MAX(t.quantity) as max_position_size
+FROM day_trades t
+WHERE t.city_code IS NOT NULL
+GROUP BY t.city_code, t.trade_date
+ON CONFLICT (city_code, date)
+DO UPDATE SET
+    trade_count = EXCLUDED.trade_count,
+    volume = EXCLUDED.volume,
+    gross_pnl = EXCLUDED.gross_pnl,
+    net_pnl = EXCLUDED.net_pnl,
+    fees = EXCLUDED.fees,
+    win_count = EXCLUDED.win_count,
+    loss_count = EXCLUDED.loss_count,
+    avg_position_size = EXCLUDED.avg_position_size,
+    max_position_size = EXCLUDED.max_position_size,
+    updated_at = NOW()
+"""
+
+STRATEGY_METRICS_UPSERT_SQL = """
+INSERT INTO analytics.strategy_metrics_daily (
+    strategy_name, date, signal_count, trade_count, gross_pnl, net_pnl, fees,
+    win_count, loss_count, avg_edge, avg_confidence
+)
+SELECT
+    COALESCE(t.strategy_name, 'unknown') as strategy_name,
+    t.trade_date,
+    COUNT(*) as signal_count,  -- Assuming 1:1 signal:trade for now
+    COUNT(*) as trade_count,
+    SUM(COALESCE(t.realized_pnl, 0)) as gross_pnl,
+    SUM(COALESCE(t.realized_pnl, 0) - t.fees) as net_pnl,
+    SUM(t.fees) as fees,
+    SUM(CASE WHEN COALESCE(t.realized_pnl, 0) > 0 THEN 1 ELSE 0 END) as win_count,
+    SUM(CASE WHEN COALESCE(t.realized_pnl, 0) < 0 THEN 1 ELSE 0 END) as loss_count,
+    0 as avg_edge,  -- Would need signal data
+    0 as avg_confidence  -- Would need signal data
+FROM day_trades t
+GROUP BY COALESCE(t.strategy_name, 'unknown'), t.trade_date
+ON CONFLICT (strategy_name, date)
+DO UPDATE SET
+    signal_count = EXCLUDED.signal_count,
+    trade_count = EXCLUDED.trade_count,
+    gross_pnl = EXCLUDED.gross_pnl,
+    net_pnl = EXCLUDED.net_pnl,
+    fees = EXCLUDED.fees,
+    win_count = EXCLUDED.win_count,
+    loss_count = EXCLUDED.loss_count,
+    avg_edge = EXCLUDED.avg_edge,
+    avg_confidence = EXCLUDED.avg_confidence,
+    updated_at = NOW()
+"""
+
+# Clear a day's rows before re-aggregating, dropping cities/strategies that no
+# longer have any trades on it
+CITY_METRICS_CLEAR_SQL = (
+    "DELETE FROM analytics.city_metrics_daily WHERE date BETWEEN :start_date AND :end_date"
+)
+STRATEGY_METRICS_CLEAR_SQL = (
+    "DELETE FROM analytics.strategy_metrics_daily WHERE date = :target_date"
+)
+
+# Single-day form of EQUITY_CURVE_RANGE_UPSERT_SQL over the shared day_trades CTE
+EQUITY_CURVE_UPSERT_SQL = """
+INSERT INTO analytics.equity_curve_daily (
+    date, starting_equity, ending_equity, daily_pnl, cumulative_pnl,
+    drawdown, drawdown_pct, high_water_mark
+)
+SELECT
+    CAST(:target_date AS date),
+    e.starting_equity,
+    e.ending_equity,
+    e.daily_pnl,
+    e.cumulative_pnl,
+    e.high_water_mark - e.ending_equity,
+    CASE
+        WHEN e.high_water_mark > 0
+        THEN (e.high_water_mark - e.ending_equity) / e.high_water_mark * 100
+        ELSE 0
+    END,
+    e.high_water_mark
+FROM (
+    SELECT s.*, GREATEST(s.prev_high_water_mark, s.ending_equity) AS high_water_mark
+    FROM (
+        SELECT
+            COALESCE(prev.ending_equity, :initial_equity) AS starting_equity,
+            COALESCE(prev.ending_equity, :initial_equity) + pnl.daily_pnl AS ending_equity,
+            pnl.daily_pnl,
+            COALESCE(prev.cumulative_pnl, 0) + pnl.daily_pnl AS cumulative_pnl,
+            COALESCE(prev.high_water_mark, :initial_equity) AS prev_high_water_mark
+        FROM (
+            SELECT COALESCE(SUM(realized_pnl - fees), 0) AS daily_pnl FROM day_trades
+        ) pnl
+        LEFT JOIN LATERAL (
+            SELECT ending_equity, cumulative_pnl, high_water_mark
+            FROM analytics.equity_curve_daily
+            WHERE date < CAST(:target_date AS date)
+            ORDER BY date DESC
+            LIMIT 1
+        ) prev ON TRUE
+    ) s
+) e
+ON CONFLICT (date)
+DO UPDATE SET
+    starting_equity = EXCLUDED.starting_equity,
+    ending_equity = EXCLUDED.ending_equity,
+    daily_pnl = EXCLUDED.daily_pnl,
+    cumulative_pnl = EXCLUDED.cumulative_pnl,
+    drawdown = EXCLUDED.drawdown,
+    drawdown_pct = EXCLUDED.drawdown_pct,
+    high_water_mark = EXCLUDED.high_water_mark,
+    updated_at = NOW()
+"""
+
+# Whole curve for a date range in one pass, chained off the latest earlier entry.
+# Running SUM/MAX windows replace the per-day prev-row lookups.
+EQUITY_CURVE_RANGE_UPSERT_SQL = """
+WITH prev AS (
+    SELECT ending_equity, cumulative_pnl, high_water_mark
+    FROM analytics.equity_curve_daily
+    WHERE date < CAST(:start_date AS date)
+    ORDER BY date DESC
+    LIMIT 1
+),
+days AS (
+    SELECT CAST(g.day AS date) AS date, COALESCE(SUM(t.realized_pnl - t.fees), 0) AS daily_pnl
+    FROM generate_series(
+        CAST(:start_date AS date), CAST(:end_date AS date), INTERVAL '1 day'
+    ) AS g(day)
+    LEFT JOIN trades t
+        ON t.executed_at >= g.day AND t.executed_at < g.day + INTERVAL '1 day'
+    GROUP BY g.day
+),
+running AS (
+    SELECT
+        days.date,
+        days.daily_pnl,
+        COALESCE(prev.ending_equity, :initial_equity) AS base_equity,
+        COALESCE(prev.ending_equity, :initial_equity)
+            + SUM(days.daily_pnl) OVER w AS ending_equity,
+        COALESCE(prev.cumulative_pnl, 0) + SUM(days.daily_pnl) OVER w AS cumulative_pnl,
+        COALESCE(prev.high_water_mark, :initial_equity) AS prev_high_water_mark
+    FROM days
+    LEFT JOIN prev ON TRUE
+    WINDOW w AS (ORDER BY days.date ROWS UNBOUNDED PRECEDING)
+),
+curve AS (
+    SELECT
+        running.*,
+        LAG(ending_equity, 1, base_equity) OVER (ORDER BY date) AS starting_equity,
+        GREATEST(
+            prev_high_water_mark,
+            MAX(ending_equity) OVER (ORDER BY date ROWS UNBOUNDED PRECEDING)
+        ) AS high_water_mark
+    FROM running
+)
+INSERT INTO analytics.equity_curve_daily (
+    date, starting_equity, ending_equity, daily_pnl, cumulative_pnl,
+    drawdown, drawdown_pct, high_water_mark
+)
+SELECT
+    date,
+    starting_equity,
+    ending_equity,
+    daily_pnl,
+    cumulative_pnl,
+    high_water_mark - ending_equity,
+    CASE
+        WHEN high_water_mark > 0
+        THEN (high_water_mark - ending_equity) / high_water_mark * 100
+        ELSE 0
+    END,
+    high_water_mark
+FROM curve
+ORDER BY date
+ON CONFLICT (date)
+DO UPDATE SET
+    starting_equity = EXCLUDED.starting_equity,
+    ending_equity = EXCLUDED.ending_equity,
+    daily_pnl = EXCLUDED.daily_pnl,
+    cumulative_pnl = EXCLUDED.cumulative_pnl,
+    drawdown = EXCLUDED.drawdown,
+    drawdown_pct = EXCLUDED.drawdown_pct,
+    high_water_mark = EXCLUDED.high_water_mark,
+    updated_at = NOW()
+RETURNING date, daily_pnl, ending_equity, drawdown_pct, high_water_mark
+"""
+
+# All three rollups in one statement sharing a single scan of the day's trades
+DAILY_ROLLUPS_SQL = f"""
+WITH {DAY_TRADES_CTE},
+city AS ({CITY_METRICS_UPSERT_SQL} RETURNING 1),
+strategy AS ({STRATEGY_METRICS_UPSERT_SQL} RETURNING 1),
+equity AS ({EQUITY_CURVE_UPSERT_SQL} RETURNING 1)
+SELECT
+    (SELECT COUNT(*) FROM city) AS city_metrics,
+    (SELECT COUNT(*) FROM strategy) AS strategy_metrics,
+    (SELECT COUNT(*) FROM equity) AS equity_curve
+"""
+
+
+# Date span covered by trades, for seeding rollups from scratch
+TRADES_DATE_BOUNDS_SQL = """
+SELECT CAST(MIN(executed_at) AS date), CAST(MAX(executed_at) AS date)
+FROM trades
+"""
+
+ROLLUP_TABLES_TRUNCATE_SQL = """
+TRUNCATE analytics.city_metrics_daily,
+         analytics.strategy_metrics_daily,
+         analytics.equity_curve_daily
+"""
+
+# Hot statements, built once so every call reuses the same text() construct
+# and hits SQLAlchemy's compiled cache instead of re-parsing the SQL string.
+# (psycopg2 has no protocol-level prepared statements.)
+_CITY_METRICS_UPSERT = text(f"WITH {RANGE_TRADES_CTE}{CITY_METRICS_UPSERT_SQL}")
+_STRATEGY_METRICS_UPSERT = text(f"WITH {DAY_TRADES_CTE}{STRATEGY_METRICS_UPSERT_SQL}")
+_STRATEGY_METRICS_RANGE_UPSERT = text(
+    f"WITH {RANGE_TRADES_CTE}{STRATEGY_METRICS_UPSERT_SQL}"
+)
+_EQUITY_CURVE_RANGE_UPSERT = text(EQUITY_CURVE_RANGE_UPSERT_SQL)
+_DAILY_ROLLUPS = text(DAILY_ROLLUPS_SQL)
+
+# Each equity entry chains off the previous one, which a single statement
+# reads from its starting snapshot. Concurrent writers (say a cron and an
+# ad-hoc rerun) take this transaction-scoped lock first so a later day never
+# chains off a snapshot missing an earlier day that is being written.
+_EQUITY_CURVE_LOCK = text("SELECT pg_advisory_xact_lock(hashtext('analytics.equity_curve_daily'))")
+_CITY_METRICS_CLEAR = text(CITY_METRICS_CLEAR_SQL)
+_STRATEGY_METRICS_CLEAR = text(STRATEGY_METRICS_CLEAR_SQL)
+
+
+@contextmanager
+def _connection(
+    engine: Engine,
+    conn: Connection | None,
+    write: bool = False,
+) -> Iterator[Connection]:
+    """Yield the caller's connection, or open one (in a transaction if ``write``).
+
+    Passing one connection through several rollup calls avoids a pool
+    checkout per statement; the caller then owns the transaction.
+    """
+    if conn is not None:
+        yield conn
+    elif write:
+        with engine.begin() as new_conn:
+            yield new_conn
+    else:
+        with engine.connect() as new_conn:
+            yield new_conn
+
+
+def _month_start(day: date) -> date:
+    """First day of the month containing ``day``."""
+    return day.replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    """First day of the month after ``month``."""
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _months_between(start_date: date, end_date: date) -> list[date]:
+    """First days of every month overlapping ``start_date``..``end_date``."""
+    months = []
+    month = _month_start(start_date)
+    while month <= end_date:
+        months.append(month)
+        month = _next_month(month)
+    return months
+
+
+def _monthly_partition_sql(month: date) -> str:
+    """DDL creating every rollup table's partition for ``month`` if missing."""
+    bounds = f"FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+    return "".join(
+        f"CREATE TABLE IF NOT EXISTS analytics.{table}_y{month:%Y}m{month:%m} "
+        f"PARTITION OF analytics.{table} FOR VALUES {bounds};\n"
+        for table in ROLLUP_PARTITIONED_TABLES
+    )
+
+
+def _create_partitions(
+    engine: Engine, conn: Connection, start_date: date, end_date: date
+) -> list[date]:
+    """Create the monthly partitions a date range needs on ``conn``.
+
+    Returns:
+        Months not yet known to this process for ``engine``'s database
+    """
+    created = created_partitions(_partition_months, engine)
+    months = [m for m in _months_between(start_date, end_date) if m not in created]
+    if months:
+        conn.exec_driver_sql("".join(_monthly_partition_sql(m) for m in months))
+    return months
+
+
+@contextmanager
+def _partitioned_write(
+    engine: Engine,
+    conn: Connection | None,
+    start_date: date,
+    end_date: date,
+) -> Iterator[Connection]:
+    """Open a write connection with the partitions for a date range in place.
+
+    Partitions are created in the same transaction as the writes. They are
+    only remembered once a transaction opened here commits; on a caller's
+    connection the (idempotent) DDL is simply repeated next time.
+    """
+    with _connection(engine, conn, write=True) as write_conn:
+        months = _create_partitions(engine, write_conn, start_date, end_date)
+        yield write_conn
+
+    if conn is None:
+        created_partitions(_partition_months, engine).update(months)
+
+
+def ensure_monthly_partition(engine: Engine, day: date) -> None:
+    """Create the monthly rollup partitions covering ``day`` if missing.
+
+    Months this process already created in the engine's database are
+    skipped without a round-trip. Indexes defined on the parent tables apply to new partitions.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        day: Any date in the month to create
+    """
+    with _partitioned_write(engine, None, day, day):
+        pass
+
+    logger.debug("rollup_partitions_ensured", month=f"{day:%Y-%m}")
+
+
+def _copy_legacy_rollups(conn: Connection, tables: list[str]) -> None:
+    """Move rows from retired plain rollup tables into their partitioned ones.
+
+    Partitions are created for every month the legacy rows cover first.
+    """
+    months_sql = " UNION ".join(
+        f"SELECT DISTINCT CAST(date_trunc('month', date) AS date) "
+        f"FROM analytics.{table}{LEGACY_SUFFIX}"
+        for table in tables
+    )
+    months = conn.execute(text(months_sql)).scalars().all()
+    if months:
+        conn.exec_driver_sql("".join(_monthly_partition_sql(m) for m in months))
+
+    for table in tables:
+        copy_legacy_rows(conn, table)
+
+
 def create_rollup_tables(engine: Engine) -> None:
     """Create all rollup tables in the analytics schema.
 
+    All DDL runs in a single transaction and is sent to the driver as one
+    multi-statement script. The current month's partitions are created too;
+    later months are added on demand by the update functions. The city
+    rollups read trades.city_code, added by migration 003, and scan trades
+    through the covering index from migration 004; trades itself is not
+    altered here.
+
+    Plain rollup tables left by an earlier release are converted to the
+    partitioned layout in the same transaction, keeping their rows.
+
     Args:
         engine: SQLAlchemy engine instance
     """
-    # Ensure analytics schema exists
-    with engine.connect() as conn:
-        conn.execute(text("CREATE SCHEMA IF NOT EXISTS analytics"))
-        conn.commit()
-
-    # Create city metrics table
-    with engine.connect() as conn:
-        for statement in CITY_METRICS_TABLE_SQL.split(";"):
-            statement = statement.strip()
-            if statement:
-                conn.execute(text(statement))
-        conn.commit()
-    logger.info("city_metrics_table_created")
-
-    # Create strategy metrics table
-    with engine.connect() as conn:
-        for statement in STRATEGY_METRICS_TABLE_SQL.split(";"):
-            statement = statement.strip()
-            if statement:
-                conn.execute(text(statement))
-        conn.commit()
-    logger.info("strategy_metrics_table_created")
-
-    # Create equity curve table
-    with engine.connect() as conn:
-        for statement in EQUITY_CURVE_TABLE_SQL.split(";"):
-            statement = statement.strip()
-            if statement:
-                conn.execute(text(statement))
-        conn.commit()
-    logger.info("equity_curve_table_created")
+    month = _month_start(datetime.now(timezone.utc).date())
+
+    with engine.begin() as conn:
+        legacy = [table for table in ROLLUP_PARTITIONED_TABLES if retire_plain_table(conn, table)]
+        conn.exec_driver_sql(
+            "CREATE SCHEMA IF NOT EXISTS analytics;"
+            + CITY_METRICS_TABLE_SQL
+            + STRATEGY_METRICS_TABLE_SQL
+            + EQUITY_CURVE_TABLE_SQL
+            + _monthly_partition_sql(month)
+        )
+        if legacy:
+            _copy_legacy_rollups(conn, legacy)
+
+    # The tables may have been dropped and re-created, taking their partitions
+    # with them, so only this month's are known to exist
+    created = created_partitions(_partition_months, engine)
+    created.clear()
+    created.add(month)
+
+    logger.info("rollup_tables_created")
 
 
 def update_city_metrics(
     engine: Engine,
     target_date: date | None = None,
+    rebuild: bool = False,
+    conn: Connection | None = None,
 ) -> int:
     """Update city metrics rollup for a specific date.
 
-    Performs incremental update - only processes trades for the given date.
+    Every trade on the given date is re-aggregated, so late inserts and
+    later P&L or fee edits are picked up on the next run. Pass ``rebuild``
+    to also drop rows for cities with no trades left on the day.
 
     Args:
         engine: SQLAlchemy engine instance
         target_date: Date to process (defaults to today)
+        rebuild: Discard the day's rows before re-aggregating
+        conn: Existing connection to run on; its transaction is left to the caller
 
     Returns:
         Number of city records updated
@@ -237,50 +688,88 @@ def update_city_metrics(
     if target_date is None:
         target_date = datetime.now(timezone.utc).date()
 
-    # Aggregate trades by city for the target date
-    aggregate_sql = """
-    INSERT INTO analytics.city_metrics_daily (
-        city_code, date, trade_count, volume, gross_pnl, net_pnl, fees,
-        win_count, loss_count, avg_position_size, max_position_size
+    return update_city_metrics_range(engine, target_date, target_date, rebuild, conn)
+
+
+def update_city_metrics_range(
+    engine: Engine,
+    start_date: date,
+    end_date: date,
+    rebuild: bool = False,
+    conn: Connection | None = None,
+) -> int:
+    """Update city metrics rollups for every date in a range with one statement.
+
+    Trades are grouped by city and trade date, so an N-day backfill is a
+    single INSERT ... SELECT instead of one per day. Each day is recomputed
+    in full as in update_city_metrics.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        start_date: First date to process (inclusive)
+        end_date: Last date to process (inclusive)
+        rebuild: Discard the range's rows before re-aggregating
+        conn: Existing connection to run on; its transaction is left to the caller
+
+    Returns:
+        Number of city records updated
+    """
+    params = {"start_date": start_date, "end_date": end_date}
+
+    with _partitioned_write(engine, conn, start_date, end_date) as conn:
+        if rebuild:
+            conn.execute(_CITY_METRICS_CLEAR, params)
+        result = conn.execute(_CITY_METRICS_UPSERT, params)
+        affected = result.rowcount
+
+    logger.info(
+        "city_metrics_updated",
+        start_date=start_date.isoformat(),
+        end_date=end_date.isoformat(),
+        records_affected=affected,
     )
-    SELECT
-        m.city_code,
-        DATE(t.executed_at) as trade_date,
-        COUNT(*) as trade_count,
-        SUM(t.total_cost) as volume,
-        SUM(COALESCE(t.realized_pnl, 0)) as gross_pnl,
-        SUM(COALESCE(t.realized_pnl, 0) - t.fees) as net_pnl,
-        SUM(t.fees) as fees,
-        SUM(CASE WHEN COALESCE(t.realized_pnl, 0) > 0 THEN 1 ELSE 0 END) as win_count,
-        SUM(CASE WHEN COALESCE(t.realized_pnl, 0) < 0 THEN 1 ELSE 0 END) as loss_count,
-        AVG(t.quantity) as avg_position_size,
-        MAX(t.quantity) as max_position_size
-    FROM trades t
-    JOIN markets m ON t.market_id = m.id
-    WHERE DATE(t.executed_at) = :target_date
-    GROUP BY m.city_code, DATE(t.executed_at)
-    ON CONFLICT (city_code, date)
-    DO UPDATE SET
-        trade_count = EXCLUDED.trade_count,
-        volume = EXCLUDED.volume,
-        gross_pnl = EXCLUDED.gross_pnl,
-        net_pnl = EXCLUDED.net_pnl,
-        fees = EXCLUDED.fees,
-        win_count = EXCLUDED.win_count,
-        loss_count = EXCLUDED.loss_count,
-        avg_position_size = EXCLUDED.avg_position_size,
-        max_position_size = EXCLUDED.max_position_size,
-        updated_at = NOW()
+
+    return affected
+
+
+def update_city_metrics_many(
+    engine: Engine,
+    dates: Iterable[date],
+    rebuild: bool = False,
+    conn: Connection | None = None,
+) -> int:
+    """Update city metrics rollups for specific, possibly scattered, dates.
+
+    The per-day upsert is sent once with a parameter set per date
+    (executemany), so dates far apart do not pull in the days between them
+    as update_city_metrics_range would.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        dates: Dates to process; duplicates are ignored
+        rebuild: Discard each date's rows before re-aggregating
+        conn: Existing connection to run on; its transaction is left to the caller
+
+    Returns:
+        Number of city records updated
     """
+    days = sorted(set(dates))
+    if not days:
+        return 0
+
+    params = [{"start_date": day, "end_date": day} for day in days]
 
-    with engine.connect() as conn:
-        result = conn.execute(text(aggregate_sql), {"target_date": target_date})
+    with _partitioned_write(engine, conn, days[0], days[-1]) as conn:
+        if rebuild:
+            conn.execute(_CITY_METRICS_CLEAR, params)
+        result = conn.execute(_CITY_METRICS_UPSERT, params)
         affected = result.rowcount
-        conn.commit()
 
     logger.info(
         "city_metrics_updated",
-        date=target_date.isoformat(),
+        dates=len(days),
+        start_date=days[0].isoformat(),
+        end_date=days[-1].isoformat(),
         records_affected=affected,
     )
 
@@ -290,14 +779,19 @@ def update_city_metrics(
 def update_strategy_metrics(
     engine: Engine,
     target_date: date | None = None,
+    rebuild: bool = False,
+    conn: Connection | None = None,
 ) -> int:
     """Update strategy metrics rollup for a specific date.
 
-    Performs incremental update - only processes trades for the given date.
+    Every trade on the given date is re-aggregated, as in
+    update_city_metrics.
 
     Args:
         engine: SQLAlchemy engine instance
         target_date: Date to process (defaults to today)
+        rebuild: Discard the day's rows before re-aggregating
+        conn: Existing connection to run on; its transaction is left to the caller
 
     Returns:
         Number of strategy records updated
@@ -305,45 +799,11 @@ def update_strategy_metrics(
     if target_date is None:
         target_date = datetime.now(timezone.utc).date()
 
-    # Aggregate trades by strategy for the target date
-    aggregate_sql = """
-    INSERT INTO analytics.strategy_metrics_daily (
-        strategy_name, date, signal_count, trade_count, gross_pnl, net_pnl, fees,
-        win_count, loss_count, avg_edge, avg_confidence
-    )
-    SELECT
-        COALESCE(t.strategy_name, 'unknown') as strategy_name,
-        DATE(t.executed_at) as trade_date,
-        COUNT(*) as signal_count,  -- Assuming 1:1 signal:trade for now
-        COUNT(*) as trade_count,
-        SUM(COALESCE(t.realized_pnl, 0)) as gross_pnl,
-        SUM(COALESCE(t.realized_pnl, 0) - t.fees) as net_pnl,
-        SUM(t.fees) as fees,
-        SUM(CASE WHEN COALESCE(t.realized_pnl, 0) > 0 THEN 1 ELSE 0 END) as win_count,
-        SUM(CASE WHEN COALESCE(t.realized_pnl, 0) < 0 THEN 1 ELSE 0 END) as loss_count,
-        0 as avg_edge,  -- Would need signal data
-        0 as avg_confidence  -- Would need signal data
-    FROM trades t
-    WHERE DATE(t.executed_at) = :target_date
-    GROUP BY COALESCE(t.strategy_name, 'unknown'), DATE(t.executed_at)
-    ON CONFLICT (strategy_name, date)
-    DO UPDATE SET
-        signal_count = EXCLUDED.signal_count,
-        trade_count = EXCLUDED.trade_count,
-        gross_pnl = EXCLUDED.gross_pnl,
-        net_pnl = EXCLUDED.net_pnl,
-        fees = EXCLUDED.fees,
-        win_count = EXCLUDED.win_count,
-        loss_count = EXCLUDED.loss_count,
-        avg_edge = EXCLUDED.avg_edge,
-        avg_confidence = EXCLUDED.avg_confidence,
-        updated_at = NOW()
-    """
-
-    with engine.connect() as conn:
-        result = conn.execute(text(aggregate_sql), {"target_date": target_date})
+    with _partitioned_write(engine, conn, target_date, target_date) as conn:
+        if rebuild:
+            conn.execute(_STRATEGY_METRICS_CLEAR, {"target_date": target_date})
+        result = conn.execute(_STRATEGY_METRICS_UPSERT, {"target_date": target_date})
         affected = result.rowcount
-        conn.commit()
 
     logger.info(
         "strategy_metrics_updated",
@@ -357,7 +817,8 @@ def update_strategy_metrics(
 def update_equity_curve(
     engine: Engine,
     target_date: date | None = None,
-    initial_equity: Decimal = Decimal("992.10"),
+    initial_equity: Decimal = DEFAULT_INITIAL_EQUITY,
+    conn: Connection | None = None,
 ) -> bool:
     """Update equity curve for a specific date.
 
@@ -368,6 +829,7 @@ def update_equity_curve(
         engine: SQLAlchemy engine instance
         target_date: Date to process (defaults to today)
         initial_equity: Starting equity for first entry
+        conn: Existing connection to run on; its transaction is left to the caller
 
     Returns:
         True if record was created/updated
@@ -375,93 +837,194 @@ def update_equity_curve(
     if target_date is None:
         target_date = datetime.now(timezone.utc).date()
 
-    # Get previous day's equity curve entry
-    prev_sql = """
-    SELECT ending_equity, cumulative_pnl, high_water_mark
-    FROM analytics.equity_curve_daily
-    WHERE date < :target_date
-    ORDER BY date DESC
-    LIMIT 1
-    """
+    affected = update_equity_curve_range(engine, target_date, target_date, initial_equity, conn)
+    return affected > 0
 
-    with engine.connect() as conn:
-        result = conn.execute(text(prev_sql), {"target_date": target_date})
-        prev_row = result.fetchone()
 
-    if prev_row:
-        starting_equity = Decimal(str(prev_row[0]))
-        prev_cumulative = Decimal(str(prev_row[1]))
-        prev_hwm = Decimal(str(prev_row[2]))
-    else:
-        starting_equity = initial_equity
-        prev_cumulative = Decimal("0")
-        prev_hwm = initial_equity
+def update_equity_curve_range(
+    engine: Engine,
+    start_date: date,
+    end_date: date,
+    initial_equity: Decimal = DEFAULT_INITIAL_EQUITY,
+    conn: Connection | None = None,
+) -> int:
+    """Update the equity curve for every date in a range with one statement.
 
-    # Calculate daily P&L from trades
-    pnl_sql = """
-    SELECT COALESCE(SUM(realized_pnl - fees), 0) as daily_pnl
-    FROM trades
-    WHERE DATE(executed_at) = :target_date
-    """
+    Starting equity, cumulative P&L, high water mark and drawdown are
+    computed in Postgres with window functions, chained off the latest
+    entry before ``start_date``. Days without trades get a zero-P&L entry.
 
-    with engine.connect() as conn:
-        result = conn.execute(text(pnl_sql), {"target_date": target_date})
-        row = result.fetchone()
-        daily_pnl = Decimal(str(row[0])) if row else Decimal("0")
-
-    # Calculate metrics
-    ending_equity = starting_equity + daily_pnl
-    cumulative_pnl = prev_cumulative + daily_pnl
-    high_water_mark = max(prev_hwm, ending_equity)
-    drawdown = high_water_mark - ending_equity
-    drawdown_pct = (drawdown / high_water_mark * 100) if high_water_mark > 0 else Decimal("0")
-
-    # Insert or update
-    upsert_sql = """
-    INSERT INTO analytics.equity_curve_daily (
-        date, starting_equity, ending_equity, daily_pnl, cumulative_pnl,
-        drawdown, drawdown_pct, high_water_mark
-    ) VALUES (
-        :date, :starting_equity, :ending_equity, :daily_pnl, :cumulative_pnl,
-        :drawdown, :drawdown_pct, :high_water_mark
-    )
-    ON CONFLICT (date)
-    DO UPDATE SET
-        starting_equity = EXCLUDED.starting_equity,
-        ending_equity = EXCLUDED.ending_equity,
-        daily_pnl = EXCLUDED.daily_pnl,
-        cumulative_pnl = EXCLUDED.cumulative_pnl,
-        drawdown = EXCLUDED.drawdown,
-        drawdown_pct = EXCLUDED.drawdown_pct,
-        high_water_mark = EXCLUDED.high_water_mark,
-        updated_at = NOW()
-    """
+    Args:
+        engine: SQLAlchemy engine instance
+        start_date: First date to process (inclusive)
+        end_date: Last date to process (inclusive)
+        initial_equity: Starting equity if no earlier entry exists
+        conn: Existing connection to run on; its transaction is left to the caller
 
-    with engine.connect() as conn:
-        conn.execute(
-            text(upsert_sql),
+    Returns:
+        Number of equity curve entries created/updated
+    """
+    with _partitioned_write(engine, conn, start_date, end_date) as conn:
+        conn.execute(_EQUITY_CURVE_LOCK)
+        result = conn.execute(
+            _EQUITY_CURVE_RANGE_UPSERT,
             {
-                "date": target_date,
-                "starting_equity": float(starting_equity),
-                "ending_equity": float(ending_equity),
-                "daily_pnl": float(daily_pnl),
-                "cumulative_pnl": float(cumulative_pnl),
-                "drawdown": float(drawdown),
-                "drawdown_pct": float(drawdown_pct),
-                "high_water_mark": float(high_water_mark),
+                "start_date": start_date,
+                "end_date": end_date,
+                "initial_equity": initial_equity,
             },
         )
-        conn.commit()
+        rows = result.fetchall()
+
+    if rows:
+        last = max(rows, key=lambda row: row[0])
+        logger.info(
+            "equity_curve_updated",
+            start_date=start_date.isoformat(),
+            end_date=end_date.isoformat(),
+            days=len(rows),
+            daily_pnl=float(last[1]),
+            ending_equity=float(last[2]),
+            drawdown_pct=float(last[3]),
+            high_water_mark=float(last[4]),
+        )
+
+    return len(rows)
+
+
+def backfill_rollups_from_scratch(
+    engine: Engine,
+    initial_equity: Decimal = DEFAULT_INITIAL_EQUITY,
+    conn: Connection | None = None,
+) -> dict[str, int]:
+    """Rebuild every rollup table from the full trade history.
+
+    The tables are truncated and refilled by one grouped INSERT ... SELECT
+    per rollup over the whole trade date span, so the data never leaves
+    Postgres. With the tables empty, the ON CONFLICT clauses never match
+    and cost next to nothing.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        initial_equity: Starting equity for the first equity curve entry
+        conn: Existing connection to run on; its transaction is left to the caller
+
+    Returns:
+        Dictionary with counts of records written per rollup type
+    """
+    owned = conn is None
+    months: list[date] = []
+
+    with _connection(engine, conn, write=True) as conn:
+        start_date, end_date = conn.execute(text(TRADES_DATE_BOUNDS_SQL)).one()
+        conn.execute(text(ROLLUP_TABLES_TRUNCATE_SQL))
+
+        results = {"city_metrics": 0, "strategy_metrics": 0, "equity_curve": 0}
+        if start_date is not None:
+            months = _create_partitions(engine, conn, start_date, end_date)
+            params = {"start_date": start_date, "end_date": end_date}
+            results["city_metrics"] = conn.execute(_CITY_METRICS_UPSERT, params).rowcount
+            results["strategy_metrics"] = conn.execute(
+                _STRATEGY_METRICS_RANGE_UPSERT, params
+            ).rowcount
+            results["equity_curve"] = len(
+                conn.execute(
+                    _EQUITY_CURVE_RANGE_UPSERT, {**params, "initial_equity": initial_equity}
+                ).fetchall()
+            )
+
+    if owned:
+        created_partitions(_partition_months, engine).update(months)
 
     logger.info(
-        "equity_curve_updated",
-        date=target_date.isoformat(),
-        daily_pnl=float(daily_pnl),
-        ending_equity=float(ending_equity),
-        drawdown_pct=float(drawdown_pct),
+        "rollups_backfilled",
+        start_date=start_date.isoformat() if start_date else None,
+        end_date=end_date.isoformat() if end_date else None,
+        results=results,
     )
 
-    return True
+    return results
+
+
+def _select_list(columns: Sequence[str] | None, allowed: tuple[str, ...]) -> str:
+    """Build a SELECT list, defaulting to ``allowed`` and rejecting other names.
+
+    Raises:
+        ValueError: If ``columns`` is empty or names a column outside ``allowed``
+    """
+    if columns is None:
+        return ", ".join(allowed)
+
+    unknown = [column for column in columns if column not in allowed]
+    if unknown or not columns:
+        raise ValueError(f"Invalid columns {unknown or list(columns)}; expected some of {allowed}")
+    return ", ".join(columns)
+
+
+def _city_metrics_filters(
+    city_code: str | None,
+    start_date: date | None,
+    end_date: date | None,
+) -> tuple[str, dict[str, Any]]:
+    """Build the WHERE clause shared by city metrics queries."""
+    where = " WHERE 1=1"
+    params: dict[str, Any] = {}
+
+    if city_code:
+        where += " AND city_code = :city_code"
+        params["city_code"] = city_code
+
+    if start_date:
+        where += " AND date >= :start_date"
+        params["start_date"] = start_date
+
+    if end_date:
+        where += " AND date <= :end_date"
+        params["end_date"] = end_date
+
+    return where, params
+
+
+def iter_city_metrics(
+    engine: Engine,
+    city_code: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    conn: Connection | None = None,
+    chunk_size: int = ROLLUP_CHUNK_SIZE,
+    columns: Sequence[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream city metrics from the rollup table.
+
+    Rows are read through a server-side cursor ``chunk_size`` at a time, so
+    only one chunk is held in memory. The connection stays open until the
+    iterator is exhausted or closed.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        city_code: Optional filter by city
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        conn: Existing connection to run on; its transaction is left to the caller
+        chunk_size: Rows fetched per round-trip
+        columns: Columns to return (defaults to CITY_METRICS_COLUMNS)
+
+    Yields:
+        City metrics dictionaries
+    """
+    where, params = _city_metrics_filters(city_code, start_date, end_date)
+    select_list = _select_list(columns, CITY_METRICS_COLUMNS)
+    query = f"SELECT {select_list} FROM analytics.city_metrics_daily" + where
+    query += " ORDER BY date DESC, city_code"
+
+    with _connection(engine, conn) as conn:
+        result = conn.execute(
+            text(query),
+            params,
+            execution_options={"stream_results": True, "yield_per": chunk_size},
+        )
+        for row in result:
+            yield dict(row._mapping)
 
 
 def get_city_metrics(
@@ -469,6 +1032,8 @@ def get_city_metrics(
     city_code: str | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
+    conn: Connection | None = None,
+    columns: Sequence[str] | None = None,
 ) -> list[dict[str, Any]]:
     """Query city metrics from rollup table.
 
@@ -477,30 +1042,132 @@ def get_city_metrics(
         city_code: Optional filter by city
         start_date: Optional start date filter
         end_date: Optional end date filter
+        conn: Existing connection to run on; its transaction is left to the caller
+        columns: Columns to return (defaults to CITY_METRICS_COLUMNS)
 
     Returns:
         List of city metrics dictionaries
     """
-    query = "SELECT * FROM analytics.city_metrics_daily WHERE 1=1"
+    return list(
+        iter_city_metrics(engine, city_code, start_date, end_date, conn, columns=columns)
+    )
+
+
+def get_city_metrics_with_summary(
+    engine: Engine,
+    city_code: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    limit: int | None = None,
+    conn: Connection | None = None,
+    columns: Sequence[str] | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Query city metrics rows plus database-side totals over all matches.
+
+    Totals are computed with SUM() over the full filtered set, so only the
+    first ``limit`` rows need to be transferred.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        city_code: Optional filter by city
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        limit: Optional maximum rows to return
+        conn: Existing connection to run on; its transaction is left to the caller
+        columns: Columns to return (defaults to CITY_METRICS_COLUMNS)
+
+    Returns:
+        Tuple of (metrics rows, totals with row_count, net_pnl, trade_count,
+        win_count and loss_count)
+    """
+    where, params = _city_metrics_filters(city_code, start_date, end_date)
+    select_list = _select_list(columns, CITY_METRICS_COLUMNS)
+    query = f"SELECT {select_list} FROM analytics.city_metrics_daily" + where
+    query += " ORDER BY date DESC, city_code"
+    if limit is not None:
+        query += " LIMIT :limit"
+
+    summary_query = f"""
+    SELECT
+        COUNT(*) AS row_count,
+        COALESCE(SUM(net_pnl), 0) AS net_pnl,
+        COALESCE(SUM(trade_count), 0) AS trade_count,
+        COALESCE(SUM(win_count), 0) AS win_count,
+        COALESCE(SUM(loss_count), 0) AS loss_count
+    FROM analytics.city_metrics_daily{where}
+    """
+
+    with _connection(engine, conn) as conn:
+        result = conn.execute(text(query), {**params, "limit": limit})
+        rows = [dict(row._mapping) for row in result]
+        summary = dict(conn.execute(text(summary_query), params).one()._mapping)
+
+    return rows, summary
+
+
+def _strategy_metrics_filters(
+    strategy_name: str | None,
+    start_date: date | None,
+    end_date: date | None,
+) -> tuple[str, dict[str, Any]]:
+    """Build the WHERE clause shared by strategy metrics queries."""
+    where = " WHERE 1=1"
     params: dict[str, Any] = {}
 
-    if city_code:
-        query += " AND city_code = :city_code"
-        params["city_code"] = city_code
+    if strategy_name:
+        where += " AND strategy_name = :strategy_name"
+        params["strategy_name"] = strategy_name
 
     if start_date:
-        query += " AND date >= :start_date"
+        where += " AND date >= :start_date"
         params["start_date"] = start_date
 
     if end_date:
-        query += " AND date <= :end_date"
+        where += " AND date <= :end_date"
         params["end_date"] = end_date
 
-    query += " ORDER BY date DESC, city_code"
+    return where, params
 
-    with engine.connect() as conn:
-        result = conn.execute(text(query), params)
-        return [dict(row._mapping) for row in result]
+
+def iter_strategy_metrics(
+    engine: Engine,
+    strategy_name: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    conn: Connection | None = None,
+    chunk_size: int = ROLLUP_CHUNK_SIZE,
+    columns: Sequence[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream strategy metrics from the rollup table.
+
+    Rows are read through a server-side cursor ``chunk_size`` at a time, as
+    in iter_city_metrics.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        strategy_name: Optional filter by strategy
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        conn: Existing connection to run on; its transaction is left to the caller
+        chunk_size: Rows fetched per round-trip
+        columns: Columns to return (defaults to STRATEGY_METRICS_COLUMNS)
+
+    Yields:
+        Strategy metrics dictionaries
+    """
+    where, params = _strategy_metrics_filters(strategy_name, start_date, end_date)
+    select_list = _select_list(columns, STRATEGY_METRICS_COLUMNS)
+    query = f"SELECT {select_list} FROM analytics.strategy_metrics_daily" + where
+    query += " ORDER BY date DESC, strategy_name"
+
+    with _connection(engine, conn) as conn:
+        result = conn.execute(
+            text(query),
+            params,
+            execution_options={"stream_results": True, "yield_per": chunk_size},
+        )
+        for row in result:
+            yield dict(row._mapping)
 
 
 def get_strategy_metrics(
@@ -508,6 +1175,8 @@ def get_strategy_metrics(
     strategy_name: str | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
+    conn: Connection | None = None,
+    columns: Sequence[str] | None = None,
 ) -> list[dict[str, Any]]:
     """Query strategy metrics from rollup table.
 
@@ -516,48 +1185,93 @@ def get_strategy_metrics(
         strategy_name: Optional filter by strategy
         start_date: Optional start date filter
         end_date: Optional end date filter
+        conn: Existing connection to run on; its transaction is left to the caller
+        columns: Columns to return (defaults to STRATEGY_METRICS_COLUMNS)
 
     Returns:
         List of strategy metrics dictionaries
     """
-    query = "SELECT * FROM analytics.strategy_metrics_daily WHERE 1=1"
-    params: dict[str, Any] = {}
+    return list(
+        iter_strategy_metrics(
+            engine, strategy_name, start_date, end_date, conn, columns=columns
+        )
+    )
 
-    if strategy_name:
-        query += " AND strategy_name = :strategy_name"
-        params["strategy_name"] = strategy_name
 
-    if start_date:
-        query += " AND date >= :start_date"
-        params["start_date"] = start_date
+def get_strategy_metrics_with_summary(
+    engine: Engine,
+    strategy_name: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    limit: int | None = None,
+    conn: Connection | None = None,
+    columns: Sequence[str] | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Query strategy metrics rows plus database-side totals over all matches.
 
-    if end_date:
-        query += " AND date <= :end_date"
-        params["end_date"] = end_date
+    Args:
+        engine: SQLAlchemy engine instance
+        strategy_name: Optional filter by strategy
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        limit: Optional maximum rows to return
+        conn: Existing connection to run on; its transaction is left to the caller
+        columns: Columns to return (defaults to STRATEGY_METRICS_COLUMNS)
 
+    Returns:
+        Tuple of (metrics rows, totals with row_count, net_pnl, trade_count
+        and signal_count)
+    """
+    where, params = _strategy_metrics_filters(strategy_name, start_date, end_date)
+    select_list = _select_list(columns, STRATEGY_METRICS_COLUMNS)
+    query = f"SELECT {select_list} FROM analytics.strategy_metrics_daily" + where
     query += " ORDER BY date DESC, strategy_name"
+    if limit is not None:
+        query += " LIMIT :limit"
 
-    with engine.connect() as conn:
-        result = conn.execute(text(query), params)
-        return [dict(row._mapping) for row in result]
+    summary_query = f"""
+    SELECT
+        COUNT(*) AS row_count,
+        COALESCE(SUM(net_pnl), 0) AS net_pnl,
+        COALESCE(SUM(trade_count), 0) AS trade_count,
+        COALESCE(SUM(signal_count), 0) AS signal_count
+    FROM analytics.strategy_metrics_daily{where}
+    """
 
+    with _connection(engine, conn) as conn:
+        result = conn.execute(text(query), {**params, "limit": limit})
+        rows = [dict(row._mapping) for row in result]
+        summary = dict(conn.execute(text(summary_query), params).one()._mapping)
 
-def get_equity_curve(
+    return rows, summary
+
+
+def iter_equity_curve(
     engine: Engine,
     start_date: date | None = None,
     end_date: date | None = None,
-) -> list[dict[str, Any]]:
-    """Query equity curve for charting.
+    conn: Connection | None = None,
+    chunk_size: int = ROLLUP_CHUNK_SIZE,
+    columns: Sequence[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream the equity curve, oldest first.
+
+    Rows are read through a server-side cursor ``chunk_size`` at a time, so
+    multi-year curves never need to be held in memory at once.
 
     Args:
         engine: SQLAlchemy engine instance
         start_date: Optional start date filter
         end_date: Optional end date filter
+        conn: Existing connection to run on; its transaction is left to the caller
+        chunk_size: Rows fetched per round-trip
+        columns: Columns to return (defaults to EQUITY_CURVE_COLUMNS)
 
-    Returns:
-        List of equity curve points as dictionaries
+    Yields:
+        Equity curve points as dictionaries
     """
-    query = "SELECT * FROM analytics.equity_curve_daily WHERE 1=1"
+    select_list = _select_list(columns, EQUITY_CURVE_COLUMNS)
+    query = f"SELECT {select_list} FROM analytics.equity_curve_daily WHERE 1=1"
     params: dict[str, Any] = {}
 
     if start_date:
@@ -570,19 +1284,57 @@ def get_equity_curve(
 
     query += " ORDER BY date ASC"
 
-    with engine.connect() as conn:
-        result = conn.execute(text(query), params)
-        return [dict(row._mapping) for row in result]
+    with _connection(engine, conn) as conn:
+        result = conn.execute(
+            text(query),
+            params,
+            execution_options={"stream_results": True, "yield_per": chunk_size},
+        )
+        for row in result:
+            yield dict(row._mapping)
+
+
+def get_equity_curve(
+    engine: Engine,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    conn: Connection | None = None,
+    columns: Sequence[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Query equity curve for charting.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        conn: Existing connection to run on; its transaction is left to the caller
+        columns: Columns to return (defaults to EQUITY_CURVE_COLUMNS)
+
+    Returns:
+        List of equity curve points as dictionaries
+    """
+    return list(iter_equity_curve(engine, start_date, end_date, conn, columns=columns))
 
 
-def run_daily_rollups(engine: Engine, target_date: date | None = None) -> dict[str, int]:
+def run_daily_rollups(
+    engine: Engine,
+    target_date: date | None = None,
+    initial_equity: Decimal = DEFAULT_INITIAL_EQUITY,
+    rebuild: bool = False,
+    conn: Connection | None = None,
+) -> dict[str, int]:
     """Run all daily rollup updates.
 
-    Convenience function to update all rollup tables for a given date.
+    City metrics, strategy metrics and the equity curve are written by a
+    single statement whose upserts share one scan of the day's trades.
+    Every rollup is recomputed from the day's trades.
 
     Args:
         engine: SQLAlchemy engine instance
         target_date: Date to process (defaults to today)
+        initial_equity: Starting equity if the curve has no earlier entry
+        rebuild: Discard the day's city/strategy rows and re-aggregate
+        conn: Existing connection to run on; its transaction is left to the caller
 
     Returns:
         Dictionary with counts of records updated per rollup type
@@ -590,11 +1342,20 @@ def run_daily_rollups(engine: Engine, target_date: date | None = None) -> dict[s
     if target_date is None:
         target_date = datetime.now(timezone.utc).date()
 
-    results = {
-        "city_metrics": update_city_metrics(engine, target_date),
-        "strategy_metrics": update_strategy_metrics(engine, target_date),
-        "equity_curve": 1 if update_equity_curve(engine, target_date) else 0,
-    }
+    with _partitioned_write(engine, conn, target_date, target_date) as conn:
+        if rebuild:
+            conn.execute(
+                _CITY_METRICS_CLEAR,
+                {"start_date": target_date, "end_date": target_date},
+            )
+            conn.execute(_STRATEGY_METRICS_CLEAR, {"target_date": target_date})
+        conn.execute(_EQUITY_CURVE_LOCK)
+        row = conn.execute(
+            _DAILY_ROLLUPS,
+            {"target_date": target_date, "initial_equity": initial_equity},
+        ).one()
+
+    results = {key: int(value) for key, value in row._mapping.items()}
 
     logger.info(
         "daily_rollups_completed",
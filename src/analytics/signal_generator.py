@@ -4,16 +4,27 @@ Generates trading signals based on weather data and market conditions.
 Combines multiple signal types with confidence scoring.
 """
 
+import logging
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, cast
+
+import numpy as np
+import numpy.typing as npt
 
 from src.shared.api.response_models import Market
 from src.shared.config.logging import get_logger
 
 logger = get_logger(__name__)
+_stdlib_logger = logging.getLogger(__name__)
+
+# Per-signal info events are logged for one signal in every _LOG_SAMPLE_RATE;
+# batch methods log one aggregate event instead
+_LOG_SAMPLE_RATE = 100
+
+_VALID_SIDES = frozenset(("yes", "no"))
 
 
-@dataclass
+@dataclass(slots=True)
 class Signal:
     """Trading signal with confidence and reasoning.
 
@@ -32,9 +43,31 @@ class Signal:
         if not 0.0 <= self.confidence <= 1.0:
             raise ValueError(f"Confidence must be between 0 and 1, got {self.confidence}")
 
-        if self.side not in ["yes", "no"]:
+        if self.side not in _VALID_SIDES:
             raise ValueError(f"Side must be 'yes' or 'no', got {self.side}")
 
+    @classmethod
+    def unchecked(
+        cls,
+        ticker: str,
+        side: str,
+        confidence: float,
+        reason: str,
+        features: dict[str, Any] | None = None,
+    ) -> "Signal":
+        """Build a signal from inputs the caller has already validated.
+
+        Skips ``__post_init__``; for SignalGenerator's own hot paths, whose
+        sides are literals and whose confidences are clamped to [0, 1].
+        """
+        signal = object.__new__(cls)
+        signal.ticker = ticker
+        signal.side = side
+        signal.confidence = confidence
+        signal.reason = reason
+        signal.features = features
+        return signal
+
 
 class SignalGenerator:
     """Generates trading signals from weather and market data.
@@ -50,8 +83,17 @@ class SignalGenerator:
             min_confidence: Minimum confidence threshold for signals
         """
         self.min_confidence = min_confidence
+        self._log_counter = 0
         logger.info("signal_generator_initialized", min_confidence=min_confidence)
 
+    def _should_log_signal(self) -> bool:
+        """Whether to log this per-signal event: the first of every _LOG_SAMPLE_RATE."""
+        if not _stdlib_logger.isEnabledFor(logging.INFO):
+            return False
+        sampled = self._log_counter % _LOG_SAMPLE_RATE == 0
+        self._log_counter += 1
+        return sampled
+
     def generate_temperature_signal(self, weather: dict[str, Any], market: Market) -> Signal | None:
         """Generate signal based on temperature forecast.
 
@@ -82,6 +124,70 @@ class SignalGenerator:
         if confidence < self.min_confidence:
             return None
 
+        signal = self._temperature_signal(market.ticker, forecast_temp, strike, confidence)
+
+        if self._should_log_signal():
+            logger.info(
+                "temperature_signal_generated",
+                ticker=market.ticker,
+                side=signal.side,
+                confidence=confidence,
+                sample_rate=_LOG_SAMPLE_RATE,
+            )
+
+        return signal
+
+    def generate_temperature_signals_batch(
+        self, weather: dict[str, Any], markets: list[Market]
+    ) -> list[Signal | None]:
+        """Generate temperature signals for many markets sharing one forecast.
+
+        Confidence for every strike is computed in one NumPy pass; Signal
+        objects are only built for markets that clear ``min_confidence``.
+
+        Args:
+            weather: Normalized weather data dictionary
+            markets: Markets to evaluate
+
+        Returns:
+            Per-market signal or None, in ``markets`` order
+        """
+        signals: list[Signal | None] = [None] * len(markets)
+        if "temperature" not in weather or not markets:
+            return signals
+
+        forecast_temp = weather["temperature"]
+
+        # Missing strikes become NaN, which never passes the threshold
+        strikes = np.fromiter(
+            (np.nan if m.strike_price is None else m.strike_price for m in markets),
+            dtype=np.float64,
+            count=len(markets),
+        )
+        confidences = np.minimum(np.abs(forecast_temp - strikes) / 10.0, 1.0)
+
+        passing = cast(list[int], np.flatnonzero(confidences >= self.min_confidence).tolist())
+        for i in passing:
+            market = markets[i]
+            signals[i] = self._temperature_signal(
+                market.ticker, forecast_temp, market.strike_price, float(confidences[i])
+            )
+
+        logger.info(
+            "temperature_signals_generated",
+            markets=len(markets),
+            signals=len(signals) - signals.count(None),
+        )
+
+        return signals
+
+    @staticmethod
+    def _temperature_signal(
+        ticker: str, forecast_temp: Any, strike: Any, confidence: float
+    ) -> Signal:
+        """Build a temperature signal for a forecast that cleared the threshold."""
+        temp_diff = forecast_temp - strike
+
         # Determine side
         if temp_diff > 0:
             side = "yes"  # Forecast above strike
@@ -90,8 +196,8 @@ class SignalGenerator:
             side = "no"  # Forecast below strike
             reason = f"Forecast {forecast_temp}°F below strike {strike}°F"
 
-        signal = Signal(
-            ticker=market.ticker,
+        return Signal.unchecked(
+            ticker=ticker,
             side=side,
             confidence=confidence,
             reason=reason,
@@ -102,15 +208,6 @@ class SignalGenerator:
             },
         )
 
-        logger.info(
-            "temperature_signal_generated",
-            ticker=market.ticker,
-            side=side,
-            confidence=confidence,
-        )
-
-        return signal
-
     def generate_precipitation_signal(
         self, weather: dict[str, Any], market: Market
     ) -> Signal | None:
@@ -139,7 +236,7 @@ class SignalGenerator:
         if confidence < self.min_confidence:
             return None
 
-        signal = Signal(
+        signal = Signal.unchecked(
             ticker=market.ticker,
             side="no",  # Precipitation tends to lower high temps
             confidence=confidence,
@@ -147,13 +244,58 @@ class SignalGenerator:
             features={"precipitation_probability": precip_prob},
         )
 
+        if self._should_log_signal():
+            logger.info(
+                "precipitation_signal_generated",
+                ticker=market.ticker,
+                confidence=confidence,
+                sample_rate=_LOG_SAMPLE_RATE,
+            )
+
+        return signal
+
+    def generate_precipitation_signals_batch(
+        self, weather: dict[str, Any], markets: list[Market]
+    ) -> list[Signal | None]:
+        """Generate precipitation signals for many markets sharing one forecast.
+
+        The precipitation signal depends only on the forecast, so it is
+        evaluated once and a Signal is built per market if it qualifies.
+
+        Args:
+            weather: Normalized weather data dictionary
+            markets: Markets to evaluate
+
+        Returns:
+            Per-market signal or None, in ``markets`` order
+        """
+        if "precipitation_probability" not in weather:
+            return [None] * len(markets)
+
+        precip_prob = weather["precipitation_probability"]
+        confidence = min(precip_prob, 0.8)
+        if precip_prob < 0.3 or confidence < self.min_confidence:
+            return [None] * len(markets)
+
+        reason = f"High precipitation probability ({precip_prob:.0%})"
+        signals: list[Signal | None] = [
+            Signal.unchecked(
+                ticker=market.ticker,
+                side="no",  # Precipitation tends to lower high temps
+                confidence=confidence,
+                reason=reason,
+                features={"precipitation_probability": precip_prob},
+            )
+            for market in markets
+        ]
+
         logger.info(
-            "precipitation_signal_generated",
-            ticker=market.ticker,
+            "precipitation_signals_generated",
+            markets=len(markets),
             confidence=confidence,
         )
 
-        return signal
+        return signals
 
     def calculate_confidence_score(self, weather: dict[str, Any], market: Market) -> float:
         """Calculate overall confidence score for a market.
@@ -186,14 +328,59 @@ class SignalGenerator:
         if market.status == "open":
             score += 0.3
 
-        logger.debug(
-            "confidence_score_calculated",
-            ticker=market.ticker,
-            score=score,
-        )
+        # Skip building the event dict on the hot path unless debug is on
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "confidence_score_calculated",
+                ticker=market.ticker,
+                score=score,
+            )
 
         return min(score, 1.0)
 
+    def calculate_confidence_scores(
+        self, weather: dict[str, Any], markets: list[Market]
+    ) -> npt.NDArray[np.float64]:
+        """Calculate confidence scores for many markets in one vectorized pass.
+
+        Components and their order match calculate_confidence_score, so each
+        entry equals the per-market score exactly.
+
+        Args:
+            weather: Normalized weather data dictionary
+            markets: Markets to evaluate
+
+        Returns:
+            Float array of scores from 0.0 to 1.0, in ``markets`` order
+        """
+        n = len(markets)
+        spreads = np.fromiter(
+            (np.nan if m.spread_cents is None else m.spread_cents for m in markets),
+            dtype=np.float64,
+            count=n,
+        )
+        liquidity = np.fromiter(
+            (m.volume + m.open_interest for m in markets), dtype=np.int64, count=n
+        )
+        is_open = np.fromiter((m.status == "open" for m in markets), dtype=bool, count=n)
+
+        # Market quality component (0-0.4); NaN spreads never compare true
+        score = np.zeros(n, dtype=np.float64)
+        score += 0.2 * (spreads <= 3)
+        score += 0.2 * (liquidity >= 1000)
+
+        # Weather data quality component (0-0.3), shared by every market
+        if "temperature" in weather and weather["temperature"] is not None:
+            score += 0.15
+        if "precipitation_probability" in weather:
+            score += 0.15
+
+        # Market status component (0-0.3)
+        score += 0.3 * is_open
+
+        np.minimum(score, 1.0, out=score)
+        return score
+
     def combine_signals(self, signals: list[Signal]) -> Signal | None:
         """Combine multiple signals into a single consensus signal.
 
@@ -210,9 +397,20 @@ class SignalGenerator:
         if not signals:
             return None
 
-        # Count votes for each side
-        yes_votes = sum(1 for s in signals if s.side == "yes")
-        no_votes = sum(1 for s in signals if s.side == "no")
+        # Tally both sides in one pass; index 0 is "yes", 1 is "no"
+        counts = [0, 0]
+        confidence_sums = [0.0, 0.0]
+        reasons: tuple[list[str], list[str]] = ([], [])
+        features: tuple[dict[str, Any], dict[str, Any]] = ({}, {})
+        for signal in signals:
+            i = 0 if signal.side == "yes" else 1
+            counts[i] += 1
+            confidence_sums[i] += signal.confidence
+            reasons[i].append(signal.reason)
+            if signal.features:
+                features[i].update(signal.features)
+
+        yes_votes, no_votes = counts
 
         # Require majority
         if yes_votes == no_votes:
@@ -220,23 +418,15 @@ class SignalGenerator:
             return None
 
         # Determine consensus side
-        consensus_side = "yes" if yes_votes > no_votes else "no"
+        winner = 0 if yes_votes > no_votes else 1
+        consensus_side = "yes" if winner == 0 else "no"
 
         # Calculate weighted average confidence
-        consensus_signals = [s for s in signals if s.side == consensus_side]
-        avg_confidence = sum(s.confidence for s in consensus_signals) / len(consensus_signals)
-
-        # Combine reasons
-        reasons = [s.reason for s in consensus_signals]
-        combined_reason = "; ".join(reasons)
-
-        # Combine features
-        combined_features = {}
-        for signal in consensus_signals:
-            if signal.features:
-                combined_features.update(signal.features)
+        avg_confidence = confidence_sums[winner] / counts[winner]
+        combined_reason = "; ".join(reasons[winner])
+        combined_features = features[winner]
 
-        combined = Signal(
+        combined = Signal.unchecked(
             ticker=signals[0].ticker,
             side=consensus_side,
             confidence=avg_confidence,
@@ -244,12 +434,14 @@ class SignalGenerator:
             features=combined_features,
         )
 
-        logger.info(
-            "signals_combined",
-            ticker=combined.ticker,
-            side=consensus_side,
-            confidence=avg_confidence,
-            num_signals=len(signals),
-        )
+        if self._should_log_signal():
+            logger.info(
+                "signals_combined",
+                ticker=combined.ticker,
+                side=consensus_side,
+                confidence=avg_confidence,
+                num_signals=len(signals),
+                sample_rate=_LOG_SAMPLE_RATE,
+            )
 
         return combined
@@ -4,13 +4,138 @@ Processes NWS forecast and observation data into normalized formats
 suitable for strategy evaluation and signal generation.
 """
 
+import logging
 import re
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any
 
+import numpy as np
+import numpy.typing as npt
+
 from src.shared.api.response_models import Forecast, ForecastPeriod, Observation
 from src.shared.config.logging import get_logger
 
 logger = get_logger(__name__)
+_stdlib_logger = logging.getLogger(__name__)
+
+# Fahrenheit = Celsius * 1.8 + 32
+_C_TO_F_SCALE = 1.8
+_C_TO_F_OFFSET = 32.0
+
+# Explicit percentages ("40%", then "40 percent") are tried over the whole text
+# before any "chance ... N" reading. NWS detailed forecasts put a clock time
+# ("A chance of rain before 1pm") ahead of "Chance of precipitation is 50%", so
+# a leftmost match across all three would read the hour as the probability.
+# The chance gap stays within the sentence and is capped so long forecasts
+# don't rescan to the end for every "chance". Matched against lowercased text,
+# so no IGNORECASE.
+_PERCENT_SIGN_RE = re.compile(r"(\d+)\s*%")
+_PERCENT_WORD_RE = re.compile(r"(\d+)\s*percent")
+_CHANCE_RE = re.compile(r"chance[^.\n]{0,40}?(\d+)")
+
+# Probability for each whole percent; anything above 100% is clamped to 1.0
+_PROBABILITY_BY_PERCENT = tuple(percent / 100.0 for percent in range(101))
+
+# Qualitative fallbacks, highest precedence first ("slight chance" is 0.20, and
+# "likely" anywhere outranks both)
+_QUALITATIVE_RE = re.compile(r"likely|probable|slight|chance|possible")
+_QUALITATIVE_PROBABILITY = {
+    "likely": 0.70,
+    "probable": 0.70,
+    "slight": 0.20,
+    "chance": 0.40,
+    "possible": 0.40,
+}
+
+# Shortest qualitative keyword ("likely", "slight", "chance"); anything shorter
+# can only carry a probability as "N%"
+_MIN_KEYWORD_LEN = min(map(len, _QUALITATIVE_PROBABILITY))
+
+# ForecastPeriod fields copied verbatim into each parsed period
+_PERIOD_FIELDS = (
+    "number",
+    "name",
+    "start_time",
+    "end_time",
+    "is_daytime",
+    "temperature",
+    "temperature_unit",
+    "wind_speed",
+    "wind_direction",
+    "short_forecast",
+    "detailed_forecast",
+)
+_get_period_fields = attrgetter(*_PERIOD_FIELDS)
+
+
+@dataclass(slots=True, frozen=True)
+class ForecastColumns:
+    """Forecast periods laid out as parallel columns.
+
+    Numeric fields are NumPy arrays so strategy code can vectorize across
+    periods instead of iterating per-period dictionaries.
+    """
+
+    numbers: npt.NDArray[np.int64]
+    names: tuple[str, ...]
+    start_times: tuple[datetime, ...]
+    end_times: tuple[datetime, ...]
+    is_daytime: npt.NDArray[np.bool_]
+    temperatures: npt.NDArray[np.float64]
+    precipitation_probabilities: npt.NDArray[np.float64]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+@lru_cache(maxsize=4096)
+def _extract_precip(forecast_text: str) -> float:
+    """Parse a precipitation probability out of forecast text.
+
+    NWS repeats the same detailed forecast across periods and polls, so
+    results are cached by text.
+    """
+    text_lower = forecast_text.lower()
+
+    # Most periods ("Sunny", "Mostly clear") mention no precipitation at all;
+    # plain substring scans rule them out without touching the regex engine.
+    if (
+        "%" not in text_lower
+        and "percent" not in text_lower
+        and "chance" not in text_lower
+        and "likely" not in text_lower
+        and "probable" not in text_lower
+        and "slight" not in text_lower
+        and "possible" not in text_lower
+    ):
+        return 0.0
+
+    match = (
+        ("%" in text_lower and _PERCENT_SIGN_RE.search(text_lower))
+        or ("percent" in text_lower and _PERCENT_WORD_RE.search(text_lower))
+        or ("chance" in text_lower and _CHANCE_RE.search(text_lower))
+    )
+    if match:
+        percent = int(match.group(1))
+        probability = _PROBABILITY_BY_PERCENT[percent] if percent <= 100 else 1.0
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "precipitation_probability_extracted",
+                text=forecast_text[:50],
+                probability=probability,
+            )
+        return probability
+
+    # One scan collects every qualitative term; precedence then picks the winner
+    found = set(_QUALITATIVE_RE.findall(text_lower))
+    for term, probability in _QUALITATIVE_PROBABILITY.items():
+        if term in found:
+            return probability
+
+    return 0.0
 
 
 class WeatherProcessor:
@@ -38,27 +163,17 @@ class WeatherProcessor:
             >>> data = processor.parse_forecast(forecast)
             >>> high_temp = data["periods"][0]["temperature"]
         """
-        logger.debug("parsing_forecast", num_periods=len(forecast.periods))
-
-        periods_data = []
-        for period in forecast.periods:
-            period_dict = {
-                "number": period.number,
-                "name": period.name,
-                "start_time": period.start_time,
-                "end_time": period.end_time,
-                "is_daytime": period.is_daytime,
-                "temperature": period.temperature,
-                "temperature_unit": period.temperature_unit,
-                "wind_speed": period.wind_speed,
-                "wind_direction": period.wind_direction,
-                "short_forecast": period.short_forecast,
-                "detailed_forecast": period.detailed_forecast,
-                "precipitation_probability": self.extract_precipitation_probability(
-                    period.detailed_forecast
-                ),
-            }
-            periods_data.append(period_dict)
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("parsing_forecast", num_periods=len(forecast.periods))
+
+        extract = self.extract_precipitation_probability
+        periods_data = [
+            dict(
+                zip(_PERIOD_FIELDS, _get_period_fields(period), strict=True),
+                precipitation_probability=extract(period.detailed_forecast),
+            )
+            for period in forecast.periods
+        ]
 
         return {
             "updated": forecast.updated,
@@ -66,6 +181,35 @@ class WeatherProcessor:
             "periods": periods_data,
         }
 
+    def parse_forecast_columns(self, forecast: Forecast) -> ForecastColumns:
+        """Parse NWS forecast periods into column-oriented arrays.
+
+        Args:
+            forecast: Forecast response model from NWS
+
+        Returns:
+            ForecastColumns with one entry per period, in period order
+
+        Example:
+            >>> columns = processor.parse_forecast_columns(forecast)
+            >>> warm_and_wet = (columns.temperatures > 70) & (
+            ...     columns.precipitation_probabilities > 0.5
+            ... )
+        """
+        periods = forecast.periods
+        extract = self.extract_precipitation_probability
+        return ForecastColumns(
+            numbers=np.fromiter((p.number for p in periods), np.int64, len(periods)),
+            names=tuple(p.name for p in periods),
+            start_times=tuple(p.start_time for p in periods),
+            end_times=tuple(p.end_time for p in periods),
+            is_daytime=np.fromiter((p.is_daytime for p in periods), np.bool_, len(periods)),
+            temperatures=np.fromiter((p.temperature for p in periods), np.float64, len(periods)),
+            precipitation_probabilities=np.fromiter(
+                (extract(p.detailed_forecast) for p in periods), np.float64, len(periods)
+            ),
+        )
+
     def parse_observation(self, observation: Observation) -> dict[str, Any]:
         """Parse NWS observation into normalized dictionary.
 
@@ -75,16 +219,14 @@ class WeatherProcessor:
         Returns:
             Dictionary with normalized observation data
         """
-        logger.debug("parsing_observation", timestamp=observation.timestamp)
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("parsing_observation", timestamp=observation.timestamp)
 
         # Convert Celsius to Fahrenheit for consistency
-        temp_f = None
-        if observation.temperature is not None:
-            temp_f = self._celsius_to_fahrenheit(observation.temperature)
-
-        dewpoint_f = None
-        if observation.dewpoint is not None:
-            dewpoint_f = self._celsius_to_fahrenheit(observation.dewpoint)
+        temp_c = observation.temperature
+        dewpoint_c = observation.dewpoint
+        temp_f = None if temp_c is None else temp_c * _C_TO_F_SCALE + _C_TO_F_OFFSET
+        dewpoint_f = None if dewpoint_c is None else dewpoint_c * _C_TO_F_SCALE + _C_TO_F_OFFSET
 
         return {
             "timestamp": observation.timestamp,
@@ -110,11 +252,34 @@ class WeatherProcessor:
             Currently returns raw temperature. Will be enhanced with
             historical baselines in future stories.
         """
-        logger.debug("normalizing_temperature", temp=temp, city=city)
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("normalizing_temperature", temp=temp, city=city)
 
         # Returns raw temperature; z-score normalization requires historical baselines
         return temp
 
+    def normalize_temperature_batch(
+        self, temps: npt.ArrayLike, city: str
+    ) -> npt.NDArray[np.float64]:
+        """Normalize an array of temperatures relative to city baseline.
+
+        Batch form of normalize_temperature with one log event per call.
+
+        Args:
+            temps: Temperatures in Fahrenheit
+            city: City code
+
+        Returns:
+            Float64 array of normalized temperatures (raw values until
+            historical baselines are available)
+        """
+        values = np.asarray(temps, dtype=np.float64)
+
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug("normalizing_temperatures", count=values.size, city=city)
+
+        return values
+
     def calculate_temp_anomaly(self, current: float, historical_avg: float) -> float:
         """Calculate temperature anomaly from historical average.
 
@@ -127,12 +292,39 @@ class WeatherProcessor:
         """
         anomaly = current - historical_avg
 
-        logger.debug(
-            "temperature_anomaly_calculated",
-            current=current,
-            historical_avg=historical_avg,
-            anomaly=anomaly,
-        )
+        if _stdlib_logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "temperature_anomaly_calculated",
+                current=current,
+                historical_avg=historical_avg,
+                anomaly=anomaly,
+            )
+
+        return anomaly
+
+    def calculate_temp_anomaly_batch(
+        self, current: npt.ArrayLike, historical_avg: npt.ArrayLike
+    ) -> npt.NDArray[np.float64]:
+        """Calculate temperature anomalies for arrays of readings.
+
+        Batch form of calculate_temp_anomaly; arrays broadcast, so a scalar
+        historical average applies to every reading.
+
+        Args:
+            current: Current temperatures in Fahrenheit
+            historical_avg: Historical average temperatures
+
+        Returns:
+            Float64 array of anomalies (current - historical)
+        """
+        anomaly: npt.NDArray[np.float64] = np.subtract(current, historical_avg, dtype=np.float64)
+
+        if _stdlib_logger.isEnabledFor(logging.DEBUG) and anomaly.size:
+            logger.debug(
+                "temperature_anomalies_calculated",
+                count=anomaly.size,
+                mean_anomaly=float(np.nanmean(anomaly)),
+            )
 
         return anomaly
 
@@ -152,37 +344,11 @@ class WeatherProcessor:
             ... )
             >>> assert prob == 0.40
         """
-        if not forecast_text:
+        # "Sunny", "Clear", "Fog": too short for any keyword and no percent sign,
+        # so skip the cache lookup and the lowercase copy entirely
+        if len(forecast_text) < _MIN_KEYWORD_LEN and "%" not in forecast_text:
             return 0.0
-
-        # Look for percentage patterns like "40%", "40 percent", etc.
-        patterns = [
-            r"(\d+)%",  # "40%"
-            r"(\d+)\s*percent",  # "40 percent"
-            r"chance.*?(\d+)",  # "chance of rain 40"
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, forecast_text, re.IGNORECASE)
-            if match:
-                probability = float(match.group(1)) / 100.0
-                logger.debug(
-                    "precipitation_probability_extracted",
-                    text=forecast_text[:50],
-                    probability=probability,
-                )
-                return probability
-
-        # Check for qualitative terms (order matters - check "slight" before "chance")
-        text_lower = forecast_text.lower()
-        if "likely" in text_lower or "probable" in text_lower:
-            return 0.70
-        elif "slight" in text_lower:
-            return 0.20
-        elif "chance" in text_lower or "possible" in text_lower:
-            return 0.40
-
-        return 0.0
+        return _extract_precip(forecast_text)
 
     @staticmethod
     def _celsius_to_fahrenheit(celsius: float) -> float:
@@ -194,4 +360,20 @@ class WeatherProcessor:
         Returns:
             Temperature in Fahrenheit
         """
-        return (celsius * 9.0 / 5.0) + 32.0
+        return celsius * _C_TO_F_SCALE + _C_TO_F_OFFSET
+
+    @staticmethod
+    def celsius_to_fahrenheit_batch(celsius: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        """Convert an array of Celsius temperatures to Fahrenheit.
+
+        Args:
+            celsius: Temperatures in Celsius; NaN entries stay NaN
+
+        Returns:
+            Float64 array of temperatures in Fahrenheit
+        """
+        # np.array copies, so the in-place ops never touch the caller's array
+        fahrenheit = np.array(celsius, dtype=np.float64)
+        fahrenheit *= _C_TO_F_SCALE
+        fahrenheit += _C_TO_F_OFFSET
+        return fahrenheit
@@ -3,11 +3,10 @@
 MilkBot Climate Exchange Dashboard
 """
 
-import base64
-import os
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
+from zoneinfo import ZoneInfo
 
 import streamlit as st
 
@@ -19,252 +18,63 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# Display timezone for the status row and health timestamps
+NYC_TZ = ZoneInfo("America/New_York")
+
+# Card templates, filled with str.format; styles are fixed so they are built once
+# Stats strip card - darker than main cards
+STAT_CARD_HTML = (
+    '<div style="background:#0d1117;padding:10px 6px;border-radius:6px;text-align:center;border:1px solid #1a1f2e;">'
+    '<div style="color:#6b7280;font-size:9px;text-transform:uppercase;letter-spacing:0.5px;margin-bottom:2px;">{label}</div>'
+    '<div style="font-size:18px;font-weight:700;line-height:1.1;color:{value_color};">{value}</div>'
+    '<div style="font-size:10px;margin-top:2px;color:{sub_color};">{sub}</div>'
+    "</div>"
+)
+# Performance summary card with LARGE numbers (32px - doubled from ~16px)
+METRIC_CARD_HTML = (
+    '<div style="background:#1a1f2e;padding:16px;border-radius:8px;text-align:center;border:1px solid #2d333b;">'
+    '<div style="color:#6b7280;font-size:12px;text-transform:uppercase;margin-bottom:6px;">{label}</div>'
+    '<div style="color:{color};font-size:32px;font-weight:700;">{value}</div>'
+    "</div>"
+)
+# Health summary count card
+HEALTH_SUMMARY_CARD_HTML = (
+    '<div style="background:#1a1f2e;padding:14px;border-radius:6px;text-align:center;border:1px solid #2d333b;">'
+    '<div style="font-size:24px;font-weight:700;color:{color};">{value}</div>'
+    '<div style="color:#6b7280;font-size:12px;margin-top:4px;">{label}</div>'
+    "</div>"
+)
+
+# Ticks the status row clock in the browser so it stays live between reruns.
+# Runs in a zero-height component iframe and looks the span up in the parent
+# page on every tick, since a rerun may replace the status row element.
+LIVE_CLOCK_SCRIPT = """<script>
+const fmt = new Intl.DateTimeFormat("en-US", {
+  timeZone: "America/New_York", hour: "numeric", minute: "2-digit", timeZoneName: "short",
+});
+setInterval(() => {
+  const el = window.parent.document.getElementById("live-clock");
+  if (el) el.textContent = fmt.format(new Date()).replace(/\u202f/g, " ");
+}, 1000);
+</script>"""
+
 # =============================================================================
 # GLOBAL STYLES - Including LOCAL Freckle Face font
 # =============================================================================
 
-# Load Freckle Face font as base64 for bulletproof local hosting
-def get_font_base64():
-    font_path = Path("src/dashboard/assets/fonts/freckle-face.woff2")
-    if font_path.exists():
-        with open(font_path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
-    return None
+@st.cache_resource(show_spinner=False)
+def get_global_css() -> str:
+    """Read the global stylesheet once per process, wrapped for injection."""
+    css = Path("src/dashboard/assets/dashboard.css").read_text(encoding="utf-8")
+    return f"<style>\n{css}</style>"
 
-FRECKLE_FACE_B64 = get_font_base64()
 
 # Inject all global styles in ONE block
-st.markdown(f"""
-<style>
-/* ============================================
-   LOCAL FONT: Freckle Face (bulletproof)
-   ============================================ */
-@font-face {{
-    font-family: 'Freckle Face';
-    src: url(data:font/woff2;base64,{FRECKLE_FACE_B64}) format('woff2');
-    font-weight: normal;
-    font-style: normal;
-    font-display: swap;
-}}
-
-/* Other fonts via Google */
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap');
-@import url('https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600&display=swap');
-
-/* ============================================
-   BASE STYLES
-   ============================================ */
-* {{
-    font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-}}
-
-/* Hide Streamlit chrome */
-#MainMenu {{visibility: hidden;}}
-header {{visibility: hidden;}}
-footer {{visibility: hidden;}}
-
-/* Dark background everywhere */
-[data-testid="stAppViewContainer"], .stApp {{
-    background-color: #0a0a0a !important;
-}}
-
-/* Container */
-.block-container {{
-    padding-top: 10px !important;
-    padding-bottom: 0 !important;
-    max-width: 1400px !important;
-}}
-
-/* ============================================
-   HEADER STYLES - Very compact
-   ============================================ */
-.header-text-block {{
-    text-align: center;
-    padding: 10px 0;
-}}
-
-.milkbot-title {{
-    font-family: 'Freckle Face', cursive !important;
-    font-size: 56px;
-    color: #94a3b8;
-    line-height: 1;
-    margin: 0 0 4px 0;
-}}
-
-.climate-title {{
-    font-family: 'Inter', sans-serif !important;
-    font-size: 42px;
-    font-weight: 800;
-    text-transform: uppercase;
-    letter-spacing: 2px;
-    background: linear-gradient(90deg, #00ffc8, #00d9ff, #a78bfa);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    line-height: 1;
-    margin: 0 0 6px 0;
-}}
-
-.tagline {{
-    font-family: 'JetBrains Mono', monospace !important;
-    font-size: 22px;
-    font-style: italic;
-    font-weight: 600;
-    color: #1e90ff;
-    line-height: 1.2;
-    margin: 8px 0 0 0;
-}}
-
-/* ============================================
-   TABS
-   ============================================ */
-.stTabs [data-baseweb="tab-list"] {{
-    justify-content: center;
-    gap: 6px;
-    background-color: transparent;
-    flex-wrap: wrap;
-}}
-.stTabs [data-baseweb="tab"] {{
-    height: 40px;
-    padding: 8px 16px;
-    background-color: #1a1f2e;
-    border-radius: 6px 6px 0 0;
-    font-size: 13px !important;
-    font-weight: 500;
-}}
-
-/* ============================================
-   CITY CARDS
-   ============================================ */
-.city-card {{
-    background-color: #1a1f2e;
-    border: 1px solid #2d333b;
-    border-radius: 8px;
-    padding: 12px 8px;
-    text-align: center;
-    margin-bottom: 6px;
-}}
-.city-name-large {{
-    color: #fafafa;
-    font-size: 15px;
-    margin: 0 0 4px 0;
-    font-weight: 700;
-}}
-.city-temp {{
-    font-size: 28px;
-    font-weight: 700;
-    color: #00ffc8;
-    margin-bottom: 4px;
-}}
-.city-card .stat-grid {{
-    display: grid;
-    grid-template-columns: 1fr 1fr;
-    gap: 3px 4px;
-}}
-.city-card .stat-label {{
-    color: #6b7280;
-    font-size: 9px;
-    text-transform: uppercase;
-}}
-.city-card .stat-value {{
-    color: #00d9ff;
-    font-size: 13px;
-    font-weight: 600;
-}}
-.city-card .signal-buy {{ color: #06b6d4; }}
-.city-card .signal-sell {{ color: #f97316; }}
-.city-card .signal-hold {{ color: #6b7280; }}
-.city-card .spread-tight {{ color: #10b981; }}
-.city-card .spread-medium {{ color: #f59e0b; }}
-.city-card .spread-wide {{ color: #ef4444; }}
-.city-card .volume-value {{ color: #a78bfa; }}
-.city-card .pnl-positive {{ color: #10b981; }}
-.city-card .pnl-negative {{ color: #ef4444; }}
-
-/* ============================================
-   BREAKDOWN CARDS
-   ============================================ */
-.breakdown-card {{
-    background: #1a1f2e;
-    padding: 12px 8px;
-    border-radius: 6px;
-    text-align: center;
-    border: 1px solid #2d333b;
-    margin-bottom: 6px;
-}}
-.breakdown-card .city-code {{
-    font-size: 18px;
-    font-weight: 700;
-    color: #fff;
-    margin-bottom: 6px;
-}}
-
-/* ============================================
-   MOBILE RESPONSIVE
-   ============================================ */
-@media (max-width: 768px) {{
-    .block-container {{
-        padding: 6px 10px !important;
-    }}
-    
-    /* Center logo on mobile */
-    [data-testid="column"]:first-child {{
-        display: flex;
-        justify-content: center;
-    }}
-    
-    .milkbot-title {{
-        font-size: 40px;
-    }}
-    .climate-title {{
-        font-size: 28px;
-        letter-spacing: 1px;
-    }}
-    .tagline {{
-        font-size: 15px;
-    }}
-    
-    /* Tabs wrap into rows */
-    .stTabs [data-baseweb="tab-list"] {{
-        gap: 4px;
-    }}
-    .stTabs [data-baseweb="tab"] {{
-        padding: 6px 10px;
-        font-size: 11px !important;
-        flex: 1 1 45%;
-        min-width: 0;
-    }}
-    
-    /* Larger body text on mobile (+2pt equivalent) */
-    .city-card, .breakdown-card, [data-testid="stMarkdown"] p {{
-        font-size: 14px !important;
-    }}
-    .city-name-large {{
-        font-size: 14px;
-    }}
-    .city-temp {{
-        font-size: 24px;
-    }}
-    .city-card .stat-label {{
-        font-size: 10px;
-    }}
-    .city-card .stat-value {{
-        font-size: 14px;
-    }}
-}}
-</style>
-""", unsafe_allow_html=True)
-
-# Import components after styles
-from src.dashboard.components import (
-    render_city_grid,
-    render_city_performance_table,
-    render_equity_chart,
-    render_health_indicator,
-    render_performance_heatmap,
-    render_trade_feed,
-)
-from src.dashboard.data import DashboardDataProvider
+st.markdown(get_global_css(), unsafe_allow_html=True)
+
+# Tab components are imported inside each tab renderer so pandas/plotly load
+# after the header and stats strip have streamed to the browser
+from src.dashboard.data import STARTING_BANKROLL, DashboardDataProvider
 
 
 def get_data_provider() -> DashboardDataProvider:
@@ -300,108 +110,82 @@ def render_header() -> None:
 
 def render_status_row() -> None:
     """Render status row SEPARATE from header."""
-    import pytz
-    
-    nyc_tz = pytz.timezone("America/New_York")
-    nyc_now = datetime.now(pytz.utc).astimezone(nyc_tz)
-    tz_abbrev = "EST" if nyc_now.dst() == timedelta(0) else "EDT"
-    current_time = nyc_now.strftime(f"%-I:%M %p {tz_abbrev}")
+    # Server-side time is the initial value; LIVE_CLOCK_SCRIPT keeps it ticking.
+    # %Z yields EST/EDT from the zone's current offset
+    current_time = datetime.now(NYC_TZ).strftime("%-I:%M %p %Z")
     
     # Status row - clearly separate, single line, one rule below
     st.markdown(f"""
     <div style="text-align: center; padding: 8px 0; font-family: 'JetBrains Mono', monospace; font-size: 15px; margin-top: 4px;">
         <span style="color: #f97316; font-weight: 600;">🛡️ 60-MIN DELAY • ANTI-FRONTRUN</span>
         <span style="color: #4b5563; margin: 0 16px;">|</span>
-        <span style="color: #10b981; font-weight: 600;">● LIVE • {current_time}</span>
+        <span style="color: #10b981; font-weight: 600;">● LIVE • <span id="live-clock">{current_time}</span></span>
     </div>
     <div style="height: 1px; background: #2d333b; margin: 6px 0 12px 0;"></div>
     """, unsafe_allow_html=True)
 
+    # Identical args on every rerun, so the frontend keeps the same iframe
+    # (and its interval) instead of reloading it
+    st.components.v1.html(LIVE_CLOCK_SCRIPT, height=0)
+
 
 def render_stats_strip(data_provider: DashboardDataProvider) -> None:
     """Render compact stats strip under status row."""
     equity_data = data_provider.get_equity_curve()
     city_metrics = data_provider.get_city_metrics()
     
-    starting_bankroll = int(float(os.environ.get("BANKROLL", "992.10")))
     if equity_data:
-        current_equity = equity_data[-1].get("ending_equity", starting_bankroll)
+        current_equity = equity_data[-1].get("ending_equity", STARTING_BANKROLL)
         daily_pnl = equity_data[-1].get("daily_pnl", 0)
         total_pnl = equity_data[-1].get("cumulative_pnl", 0)
     else:
-        current_equity = starting_bankroll
+        current_equity = STARTING_BANKROLL
         daily_pnl = 0
         total_pnl = 0
     
     if city_metrics:
-        total_trades = sum(m.get("trade_count", 0) for m in city_metrics)
-        total_wins = sum(m.get("win_count", 0) for m in city_metrics)
+        # One pass for totals and best/worst city (first city wins ties)
+        total_trades = 0
+        total_wins = 0
+        best_city = worst_city = city_metrics[0]
+        best_pnl = worst_pnl = best_city.get("net_pnl", 0)
+        for metrics in city_metrics:
+            total_trades += metrics.get("trade_count", 0)
+            total_wins += metrics.get("win_count", 0)
+            net_pnl = metrics.get("net_pnl", 0)
+            if net_pnl > best_pnl:
+                best_city, best_pnl = metrics, net_pnl
+            elif net_pnl < worst_pnl:
+                worst_city, worst_pnl = metrics, net_pnl
         overall_win_rate = (total_wins / total_trades * 100) if total_trades > 0 else 0
-        best_city = max(city_metrics, key=lambda x: x.get("net_pnl", 0))
-        worst_city = min(city_metrics, key=lambda x: x.get("net_pnl", 0))
     else:
+        total_trades = 0
         overall_win_rate = 0
         best_city = {"city_code": "N/A", "net_pnl": 0}
         worst_city = {"city_code": "N/A", "net_pnl": 0}
-    
-    # 5 compact stats
-    cols = st.columns(5)
-    
-    # Card styling - darker than main cards
-    card_css = "background:#0d1117;padding:10px 6px;border-radius:6px;text-align:center;border:1px solid #1a1f2e;"
-    label_css = "color:#6b7280;font-size:9px;text-transform:uppercase;letter-spacing:0.5px;margin-bottom:2px;"
-    value_css = "font-size:18px;font-weight:700;line-height:1.1;"
-    sub_css = "font-size:10px;margin-top:2px;"
-    
-    with cols[0]:
-        pnl_color = "#10b981" if daily_pnl >= 0 else "#ef4444"
-        st.markdown(f"""
-        <div style="{card_css}">
-            <div style="{label_css}">Portfolio</div>
-            <div style="{value_css}color:#00d9ff;">${current_equity:,.0f}</div>
-            <div style="{sub_css}color:{pnl_color};">{daily_pnl:+,.0f} today</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with cols[1]:
-        total_color = "#10b981" if total_pnl >= 0 else "#ef4444"
-        st.markdown(f"""
-        <div style="{card_css}">
-            <div style="{label_css}">Total P&L</div>
-            <div style="{value_css}color:{total_color};">${total_pnl:+,.0f}</div>
-            <div style="{sub_css}color:#6b7280;">Since Jan 31</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with cols[2]:
-        st.markdown(f"""
-        <div style="{card_css}">
-            <div style="{label_css}">Win Rate</div>
-            <div style="{value_css}color:#00d9ff;">{overall_win_rate:.1f}%</div>
-            <div style="{sub_css}color:#6b7280;">{total_trades} trades</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with cols[3]:
-        best_pnl = best_city.get("net_pnl", 0)
-        st.markdown(f"""
-        <div style="{card_css}">
-            <div style="{label_css}">Top City</div>
-            <div style="{value_css}color:#00d9ff;">{best_city.get("city_code", "N/A")}</div>
-            <div style="{sub_css}color:#10b981;">${best_pnl:+,.0f}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with cols[4]:
-        worst_pnl = worst_city.get("net_pnl", 0)
-        worst_color = "#ef4444" if worst_pnl < 0 else "#6b7280"
-        st.markdown(f"""
-        <div style="{card_css}">
-            <div style="{label_css}">Worst City</div>
-            <div style="{value_css}color:#00d9ff;">{worst_city.get("city_code", "N/A")}</div>
-            <div style="{sub_css}color:{worst_color};">${worst_pnl:+,.0f}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        best_pnl = worst_pnl = 0
+    
+    pnl_color = "#10b981" if daily_pnl >= 0 else "#ef4444"
+    total_color = "#10b981" if total_pnl >= 0 else "#ef4444"
+    worst_color = "#ef4444" if worst_pnl < 0 else "#6b7280"
+    
+    # (label, value, value color, sub text, sub color)
+    stats = [
+        ("Portfolio", f"${current_equity:,.0f}", "#00d9ff", f"{daily_pnl:+,.0f} today", pnl_color),
+        ("Total P&L", f"${total_pnl:+,.0f}", total_color, "Since Jan 31", "#6b7280"),
+        ("Win Rate", f"{overall_win_rate:.1f}%", "#00d9ff", f"{total_trades} trades", "#6b7280"),
+        ("Top City", best_city.get("city_code", "N/A"), "#00d9ff", f"${best_pnl:+,.0f}", "#10b981"),
+        ("Worst City", worst_city.get("city_code", "N/A"), "#00d9ff", f"${worst_pnl:+,.0f}", worst_color),
+    ]
+    
+    # 5 compact stats in one grid, rendered with a single markdown call
+    cards = "".join(
+        STAT_CARD_HTML.format(
+            label=label, value=value, value_color=value_color, sub=sub, sub_color=sub_color
+        )
+        for label, value, value_color, sub, sub_color in stats
+    )
+    st.markdown(f'<div class="card-grid card-grid-5">{cards}</div>', unsafe_allow_html=True)
 
 
 def render_footer() -> None:
@@ -443,6 +227,8 @@ def render_main_content() -> None:
 
 def render_city_markets_tab(data_provider: DashboardDataProvider) -> None:
     """Render city markets tab."""
+    from src.dashboard.components import render_city_grid
+
     st.markdown('<h2 style="font-size:24px;font-weight:700;color:#fafafa;text-align:center;margin:12px 0 16px 0;">10-City Market Overview</h2>', unsafe_allow_html=True)
     city_data = data_provider.get_city_market_data()
     render_city_grid(city_data)
@@ -450,6 +236,12 @@ def render_city_markets_tab(data_provider: DashboardDataProvider) -> None:
 
 def render_performance_tab(data_provider: DashboardDataProvider) -> None:
     """Render performance tab with LARGE metric cards."""
+    from src.dashboard.components import (
+        render_city_performance_table,
+        render_equity_chart,
+        render_performance_heatmap,
+    )
+
     city_metrics = data_provider.get_city_metrics()
     
     # Get equity data
@@ -457,15 +249,14 @@ def render_performance_tab(data_provider: DashboardDataProvider) -> None:
     start_date = end_date - timedelta(days=30)
     equity_data = data_provider.get_equity_curve(start_date, end_date)
     
-    starting_bankroll = int(float(os.environ.get("BANKROLL", "992.10")))
     if equity_data:
-        start_equity = equity_data[0].get("ending_equity", starting_bankroll) - equity_data[0].get("daily_pnl", 0)
-        end_equity = equity_data[-1].get("ending_equity", starting_bankroll)
+        start_equity = equity_data[0].get("ending_equity", STARTING_BANKROLL) - equity_data[0].get("daily_pnl", 0)
+        end_equity = equity_data[-1].get("ending_equity", STARTING_BANKROLL)
         total_return = equity_data[-1].get("cumulative_pnl", 0)
         max_dd = max(p.get("drawdown_pct", 0) for p in equity_data)
     else:
-        start_equity = starting_bankroll
-        end_equity = starting_bankroll
+        start_equity = STARTING_BANKROLL
+        end_equity = STARTING_BANKROLL
         total_return = 0
         max_dd = 0
     
@@ -474,47 +265,22 @@ def render_performance_tab(data_provider: DashboardDataProvider) -> None:
     # ==========================================================================
     st.markdown('<h3 style="font-size:20px;font-weight:600;color:#fafafa;margin:0 0 12px 0;">Performance Summary</h3>', unsafe_allow_html=True)
     
-    metric_cols = st.columns(4)
+    return_color = "#10b981" if total_return >= 0 else "#ef4444"
+    dd_color = "#ef4444" if max_dd > 5 else "#f59e0b" if max_dd > 2 else "#10b981"
     
-    # Card style with LARGE numbers (32px - doubled from ~16px)
-    card_bg = "#1a1f2e"
-    card_border = "#2d333b"
-    label_size = "12px"
-    value_size = "32px"  # DOUBLED
+    # (label, value, value color)
+    metrics = [
+        ("Starting Equity", f"${start_equity:,.0f}", "#00d9ff"),
+        ("Current Equity", f"${end_equity:,.0f}", "#00d9ff"),
+        ("Total Return", f"${total_return:+,.0f}", return_color),
+        ("Max Drawdown", f"{max_dd:.1f}%", dd_color),
+    ]
     
-    with metric_cols[0]:
-        st.markdown(f"""
-        <div style="background:{card_bg};padding:16px;border-radius:8px;text-align:center;border:1px solid {card_border};">
-            <div style="color:#6b7280;font-size:{label_size};text-transform:uppercase;margin-bottom:6px;">Starting Equity</div>
-            <div style="color:#00d9ff;font-size:{value_size};font-weight:700;">${start_equity:,.0f}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with metric_cols[1]:
-        st.markdown(f"""
-        <div style="background:{card_bg};padding:16px;border-radius:8px;text-align:center;border:1px solid {card_border};">
-            <div style="color:#6b7280;font-size:{label_size};text-transform:uppercase;margin-bottom:6px;">Current Equity</div>
-            <div style="color:#00d9ff;font-size:{value_size};font-weight:700;">${end_equity:,.0f}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with metric_cols[2]:
-        return_color = "#10b981" if total_return >= 0 else "#ef4444"
-        st.markdown(f"""
-        <div style="background:{card_bg};padding:16px;border-radius:8px;text-align:center;border:1px solid {card_border};">
-            <div style="color:#6b7280;font-size:{label_size};text-transform:uppercase;margin-bottom:6px;">Total Return</div>
-            <div style="color:{return_color};font-size:{value_size};font-weight:700;">${total_return:+,.0f}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with metric_cols[3]:
-        dd_color = "#ef4444" if max_dd > 5 else "#f59e0b" if max_dd > 2 else "#10b981"
-        st.markdown(f"""
-        <div style="background:{card_bg};padding:16px;border-radius:8px;text-align:center;border:1px solid {card_border};">
-            <div style="color:#6b7280;font-size:{label_size};text-transform:uppercase;margin-bottom:6px;">Max Drawdown</div>
-            <div style="color:{dd_color};font-size:{value_size};font-weight:700;">{max_dd:.1f}%</div>
-        </div>
-        """, unsafe_allow_html=True)
+    cards = "".join(
+        METRIC_CARD_HTML.format(label=label, value=value, color=color)
+        for label, value, color in metrics
+    )
+    st.markdown(f'<div class="card-grid card-grid-4">{cards}</div>', unsafe_allow_html=True)
     
     st.markdown("<div style='height:20px;'></div>", unsafe_allow_html=True)
     
@@ -544,6 +310,8 @@ def render_performance_tab(data_provider: DashboardDataProvider) -> None:
 
 def render_trade_feed_tab(data_provider: DashboardDataProvider) -> None:
     """Render trade feed tab."""
+    from src.dashboard.components import render_trade_feed
+
     st.markdown('<h3 style="font-size:20px;font-weight:600;color:#fafafa;margin:0 0 8px 0;">Public Trade Feed</h3>', unsafe_allow_html=True)
     st.info("⏱️ Trades are delayed by 60 minutes for transparency")
 
@@ -555,6 +323,121 @@ def render_trade_feed_tab(data_provider: DashboardDataProvider) -> None:
     render_trade_feed(trades)
 
 
+def build_component_card_html(comp: dict[str, Any]) -> str:
+    """Build the HTML card for one health component."""
+    status = comp.get("status", "unknown")
+    icon = "✅" if status == "healthy" else "⚠️" if status == "degraded" else "❌"
+    color = "#10b981" if status == "healthy" else "#f59e0b" if status == "degraded" else "#ef4444"
+
+    latency = comp.get("latency_ms")
+    latency_text = f"{latency:.0f}ms" if latency else "N/A"
+    error_rate = comp.get("error_rate")
+    error_text = f"{error_rate*100:.1f}%" if error_rate else "0%"
+    comp_name = comp.get('name', 'Unknown')
+
+    header = (
+        '<div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:8px;">'
+        f'<span style="font-size:14px;font-weight:600;color:#fff;">{icon} {comp_name}</span>'
+        f'<span style="color:{color};font-weight:600;text-transform:uppercase;font-size:12px;">{status}</span>'
+        "</div>"
+    )
+    card_open = '<div style="background:#1a1f2e;padding:12px;border-radius:6px;margin-bottom:8px;border:1px solid #2d333b;">'
+
+    # Check if this is the Trading Engine component
+    if comp_name == "Trading Engine":
+        orders_today = comp.get("orders_today", 0)
+        last_scan = comp.get("last_scan")
+        markets_scanned = comp.get("markets_scanned", 0)
+        message = comp.get("message", "")
+
+        # Format last scan time
+        if last_scan:
+            try:
+                scan_dt = datetime.fromisoformat(last_scan.replace("Z", "+00:00"))
+                scan_dt_nyc = scan_dt.astimezone(NYC_TZ)
+                last_scan_text = scan_dt_nyc.strftime("%-I:%M %p")
+            except Exception:
+                last_scan_text = "Unknown"
+        else:
+            last_scan_text = "Waiting..."
+
+        # Show message if present (like "Monitoring" or error info)
+        status_note = ""
+        if message and "Monitoring" in message:
+            status_note = f'<div style="color:#6b7280;font-size:10px;margin-top:4px;font-style:italic;">{message}</div>'
+
+        return (
+            f"{card_open}{header}"
+            '<div style="display:flex;gap:16px;color:#9ca3af;font-size:11px;">'
+            f'<span>Last Scan: <b style="color:#00ffc8;">{last_scan_text}</b></span>'
+            f'<span>Markets: <b style="color:#00d9ff;">{markets_scanned}</b></span>'
+            "</div>"
+            '<div style="display:flex;gap:16px;color:#9ca3af;font-size:11px;margin-top:6px;padding-top:6px;border-top:1px solid #2d333b;">'
+            f'<span>Orders Today: <b style="color:#a78bfa;">{orders_today}</b></span>'
+            f'<span>Latency: <b style="color:#00d9ff;">{latency_text}</b></span>'
+            "</div>"
+            f"{status_note}"
+            "</div>"
+        )
+
+    return (
+        f"{card_open}{header}"
+        '<div style="display:flex;gap:16px;color:#9ca3af;font-size:11px;">'
+        f'<span>Latency: <b style="color:#00d9ff;">{latency_text}</b></span>'
+        f'<span>Error Rate: <b style="color:#00d9ff;">{error_text}</b></span>'
+        "</div>"
+        "</div>"
+    )
+
+
+@st.cache_data(ttl=30, max_entries=16, show_spinner=False)
+def build_health_html(health_data: dict[str, Any]) -> str:
+    """Build the health tab body: overall status, summary counts, component cards.
+
+    Cached on the health payload, so reruns with unchanged health data reuse
+    the rendered HTML.
+    """
+    overall = health_data.get("overall_status", "unknown")
+    overall_icon = "✅" if overall == "healthy" else "⚠️" if overall == "degraded" else "❌"
+    overall_color = "#10b981" if overall == "healthy" else "#f59e0b" if overall == "degraded" else "#ef4444"
+
+    overall_html = (
+        '<div style="background:#1a1f2e;padding:16px;border-radius:8px;text-align:center;margin-bottom:16px;border:1px solid #2d333b;">'
+        f'<div style="font-size:36px;margin-bottom:4px;">{overall_icon}</div>'
+        f'<div style="font-size:20px;font-weight:700;color:{overall_color};text-transform:uppercase;">{overall}</div>'
+        '<div style="color:#6b7280;font-size:12px;margin-top:4px;">System Status</div>'
+        "</div>"
+    )
+
+    summary = health_data.get("summary", {})
+    
+    metrics = [
+        ("Healthy", summary.get("total_healthy", 0), "#10b981"),
+        ("Degraded", summary.get("total_degraded", 0), "#f59e0b"),
+        ("Unhealthy", summary.get("total_unhealthy", 0), "#ef4444"),
+    ]
+    
+    summary_cards = "".join(
+        HEALTH_SUMMARY_CARD_HTML.format(label=label, value=value, color=color)
+        for label, value, color in metrics
+    )
+
+    # Two-column grid of component cards
+    components = health_data.get("components", [])
+    component_cards = "".join(build_component_card_html(comp) for comp in components)
+    component_grid = (
+        f'<div class="card-grid card-grid-2">{component_cards}</div>' if components else ""
+    )
+
+    return (
+        f"{overall_html}"
+        f'<div class="card-grid card-grid-3">{summary_cards}</div>'
+        "<div style='height:12px;'></div>"
+        '<h4 style="font-size:16px;font-weight:600;color:#fafafa;margin:0 0 10px 0;">Component Details</h4>'
+        f"{component_grid}"
+    )
+
+
 def render_health_tab(data_provider: DashboardDataProvider) -> None:
     """Render system health tab."""
     st.markdown('<h3 style="font-size:20px;font-weight:600;color:#fafafa;margin:0 0 10px 0;">System Health Status</h3>', unsafe_allow_html=True)
@@ -562,110 +445,8 @@ def render_health_tab(data_provider: DashboardDataProvider) -> None:
     health_data = data_provider.get_health_status()
 
     if health_data:
-        overall = health_data.get("overall_status", "unknown")
-        overall_icon = "✅" if overall == "healthy" else "⚠️" if overall == "degraded" else "❌"
-        overall_color = "#10b981" if overall == "healthy" else "#f59e0b" if overall == "degraded" else "#ef4444"
-        
-        st.markdown(f"""
-        <div style="background:#1a1f2e;padding:16px;border-radius:8px;text-align:center;margin-bottom:16px;border:1px solid #2d333b;">
-            <div style="font-size:36px;margin-bottom:4px;">{overall_icon}</div>
-            <div style="font-size:20px;font-weight:700;color:{overall_color};text-transform:uppercase;">{overall}</div>
-            <div style="color:#6b7280;font-size:12px;margin-top:4px;">System Status</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-        summary = health_data.get("summary", {})
-        cols = st.columns(3)
-        
-        metrics = [
-            ("Healthy", summary.get("total_healthy", 0), "#10b981"),
-            ("Degraded", summary.get("total_degraded", 0), "#f59e0b"),
-            ("Unhealthy", summary.get("total_unhealthy", 0), "#ef4444"),
-        ]
-        
-        for i, (label, value, color) in enumerate(metrics):
-            with cols[i]:
-                st.markdown(f"""
-                <div style="background:#1a1f2e;padding:14px;border-radius:6px;text-align:center;border:1px solid #2d333b;">
-                    <div style="font-size:24px;font-weight:700;color:{color};">{value}</div>
-                    <div style="color:#6b7280;font-size:12px;margin-top:4px;">{label}</div>
-                </div>
-                """, unsafe_allow_html=True)
-
-        st.markdown("<div style='height:12px;'></div>", unsafe_allow_html=True)
-        st.markdown('<h4 style="font-size:16px;font-weight:600;color:#fafafa;margin:0 0 10px 0;">Component Details</h4>', unsafe_allow_html=True)
-
-        components = health_data.get("components", [])
-        if components:
-            comp_cols = st.columns(2)
-            for idx, comp in enumerate(components):
-                status = comp.get("status", "unknown")
-                icon = "✅" if status == "healthy" else "⚠️" if status == "degraded" else "❌"
-                color = "#10b981" if status == "healthy" else "#f59e0b" if status == "degraded" else "#ef4444"
-
-                with comp_cols[idx % 2]:
-                    latency = comp.get("latency_ms")
-                    latency_text = f"{latency:.0f}ms" if latency else "N/A"
-                    error_rate = comp.get("error_rate")
-                    error_text = f"{error_rate*100:.1f}%" if error_rate else "0%"
-                    comp_name = comp.get('name', 'Unknown')
-
-                    # Check if this is the Trading Engine component
-                    if comp_name == "Trading Engine":
-                        orders_today = comp.get("orders_today", 0)
-                        last_scan = comp.get("last_scan")
-                        markets_scanned = comp.get("markets_scanned", 0)
-                        message = comp.get("message", "")
-
-                        # Format last scan time
-                        if last_scan:
-                            try:
-                                scan_dt = datetime.fromisoformat(last_scan.replace("Z", "+00:00"))
-                                import pytz
-                                nyc_tz = pytz.timezone("America/New_York")
-                                scan_dt_nyc = scan_dt.astimezone(nyc_tz)
-                                last_scan_text = scan_dt_nyc.strftime("%-I:%M %p")
-                            except Exception:
-                                last_scan_text = "Unknown"
-                        else:
-                            last_scan_text = "Waiting..."
-
-                        # Show message if present (like "Monitoring" or error info)
-                        status_note = ""
-                        if message and "Monitoring" in message:
-                            status_note = f'<div style="color:#6b7280;font-size:10px;margin-top:4px;font-style:italic;">{message}</div>'
-
-                        st.markdown(f"""
-                        <div style="background:#1a1f2e;padding:12px;border-radius:6px;margin-bottom:8px;border:1px solid #2d333b;">
-                            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:8px;">
-                                <span style="font-size:14px;font-weight:600;color:#fff;">{icon} {comp_name}</span>
-                                <span style="color:{color};font-weight:600;text-transform:uppercase;font-size:12px;">{status}</span>
-                            </div>
-                            <div style="display:flex;gap:16px;color:#9ca3af;font-size:11px;">
-                                <span>Last Scan: <b style="color:#00ffc8;">{last_scan_text}</b></span>
-                                <span>Markets: <b style="color:#00d9ff;">{markets_scanned}</b></span>
-                            </div>
-                            <div style="display:flex;gap:16px;color:#9ca3af;font-size:11px;margin-top:6px;padding-top:6px;border-top:1px solid #2d333b;">
-                                <span>Orders Today: <b style="color:#a78bfa;">{orders_today}</b></span>
-                                <span>Latency: <b style="color:#00d9ff;">{latency_text}</b></span>
-                            </div>
-                            {status_note}
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"""
-                        <div style="background:#1a1f2e;padding:12px;border-radius:6px;margin-bottom:8px;border:1px solid #2d333b;">
-                            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:8px;">
-                                <span style="font-size:14px;font-weight:600;color:#fff;">{icon} {comp_name}</span>
-                                <span style="color:{color};font-weight:600;text-transform:uppercase;font-size:12px;">{status}</span>
-                            </div>
-                            <div style="display:flex;gap:16px;color:#9ca3af;font-size:11px;">
-                                <span>Latency: <b style="color:#00d9ff;">{latency_text}</b></span>
-                                <span>Error Rate: <b style="color:#00d9ff;">{error_text}</b></span>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-        else:
+        st.markdown(build_health_html(health_data), unsafe_allow_html=True)
+        if not health_data.get("components"):
             st.info("No component data available")
     else:
         st.warning("Unable to fetch health status")
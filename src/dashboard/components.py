@@ -11,9 +11,6 @@ Reusable Streamlit components for the dashboard including:
 from datetime import datetime, timezone
 from typing import Any
 
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
 
 from src.dashboard.data import CityMarketData
@@ -144,6 +141,9 @@ def render_equity_chart(equity_data: list[dict[str, Any]]) -> None:
     Args:
         equity_data: List of equity curve points
     """
+    import pandas as pd
+    import plotly.graph_objects as go
+
     if not equity_data:
         st.info("No equity data available")
         return
@@ -217,6 +217,8 @@ def render_trade_feed(trades: list[dict[str, Any]]) -> None:
     """
     import pytz
     import re
+
+    import pandas as pd
     
     if not trades:
         st.info("No trades available")
@@ -311,6 +313,9 @@ def render_performance_heatmap(city_metrics: list[dict[str, Any]]) -> None:
     Args:
         city_metrics: List of city metrics dictionaries
     """
+    import pandas as pd
+    import plotly.graph_objects as go
+
     if not city_metrics:
         st.info("No performance data available")
         return
@@ -482,6 +487,8 @@ def render_city_performance_table(city_metrics: list[dict[str, Any]]) -> None:
     Args:
         city_metrics: List of city metrics dictionaries
     """
+    import pandas as pd
+
     if not city_metrics:
         st.info("No performance data available")
         return
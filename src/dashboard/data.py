@@ -33,6 +33,9 @@ TICKER_TO_CITY = {
     "KXHIGHSFO": "SFO",
 }
 
+# Starting bankroll in whole dollars; process-level config, read once at import
+STARTING_BANKROLL = int(float(os.environ.get("BANKROLL", "992.10")))
+
 # NWS API settings
 NWS_USER_AGENT = "Milkbot/1.0 (contact@milkbot.ai)"
 NWS_TIMEOUT = 10  # seconds
@@ -73,6 +76,9 @@ class DashboardCache:
     public_trades_time: datetime | None = None
     health_status: dict[str, Any] = field(default_factory=dict)
     health_status_time: datetime | None = None
+    # Raw Kalshi fills shared by equity curve, city metrics, and trade feed
+    fills: list[dict[str, Any]] = field(default_factory=list)
+    fills_time: datetime | None = None
 
     # Cache TTL in seconds
     ttl_seconds: int = 5
@@ -301,16 +307,25 @@ class DashboardDataProvider:
         return market_data
 
     def _fetch_kalshi_fills(self) -> list[dict[str, Any]]:
-        """Fetch all fills from Kalshi API."""
+        """Fetch all fills from Kalshi API.
+
+        Successful responses are cached for the provider TTL so the equity
+        curve, city metrics, and trade feed share one request per refresh.
+        """
         if not self._kalshi_client:
             logger.warning("kalshi_client_not_available_for_fills")
             return []
 
+        if self._is_cache_valid(self._cache.fills_time):
+            return self._cache.fills
+
         try:
             # Fetch fills from the last 30 days
             min_ts = int((datetime.now(timezone.utc) - timedelta(days=30)).timestamp() * 1000)
             fills = self._kalshi_client.get_fills(min_ts=min_ts, limit=1000)
             logger.info("kalshi_fills_fetched", count=len(fills))
+            self._cache.fills = fills
+            self._cache.fills_time = datetime.now(timezone.utc)
             return fills
         except Exception as e:
             logger.error("kalshi_fills_fetch_error", error=str(e))
@@ -369,7 +384,7 @@ class DashboardDataProvider:
         fills = self._fetch_kalshi_fills()
 
         # Starting bankroll from env (default $992 = 99200 cents)
-        starting_bankroll_cents = int(float(os.environ.get("BANKROLL", "992.10"))) * 100
+        starting_bankroll_cents = STARTING_BANKROLL * 100
 
         # Current portfolio value from Kalshi (in cents)
         current_balance_cents = balance_data.get("balance", 0)
@@ -5,6 +5,7 @@ Provides type safety and automatic validation for external API data.
 """
 
 from datetime import datetime
+from functools import cached_property
 from typing import Any, cast
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
@@ -148,6 +149,26 @@ class Market(BaseModel):
             return (self.yes_bid + self.yes_ask) / 2.0
         return None
 
+    @cached_property
+    def ticker_search_text(self) -> str:
+        """Lowercased ticker and event ticker for substring search.
+
+        Computed once per market so repeated searches skip re-lowercasing.
+
+        Returns:
+            Newline-joined lowercase ticker and event ticker
+        """
+        return f"{self.ticker}\n{self.event_ticker}".lower()
+
+    @cached_property
+    def search_text(self) -> str:
+        """Lowercased ticker, event ticker and title for substring search.
+
+        Returns:
+            Newline-joined lowercase search fields
+        """
+        return f"{self.ticker_search_text}\n{self.title.lower()}"
+
     model_config = ConfigDict(populate_by_name=True)
 
 
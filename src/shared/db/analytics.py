@@ -194,11 +194,9 @@ def run_migrations(engine: Engine) -> None:
         sql = migration_file.read_text()
 
         with engine.connect() as conn:
-            # Execute each statement separately
-            for statement in sql.split(";"):
-                statement = statement.strip()
-                if statement and not statement.startswith("--"):
-                    conn.execute(text(statement))
+            # Sent as one script: splitting on ";" would cut function bodies
+            # apart and skip statements preceded by a comment line
+            conn.exec_driver_sql(sql)
             conn.commit()
 
         logger.info("migration_completed", file=migration_file.name)
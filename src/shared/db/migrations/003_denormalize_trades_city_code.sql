@@ -0,0 +1,45 @@
+-- Migration 003: Denormalize markets.city_code onto trades
+-- The city rollups read trades alone instead of joining markets for every day.
+-- Triggers keep the copy in sync when a trade's market changes and when a
+-- market's city_code changes.
+
+ALTER TABLE trades ADD COLUMN IF NOT EXISTS city_code VARCHAR(3);
+
+CREATE INDEX IF NOT EXISTS idx_trades_city_executed_at
+ON trades(city_code, executed_at);
+
+-- Copy the market's city onto new or re-pointed trades
+CREATE OR REPLACE FUNCTION set_trade_city_code() RETURNS trigger AS $$
+BEGIN
+    NEW.city_code := (SELECT city_code FROM markets WHERE id = NEW.market_id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trades_set_city_code ON trades;
+CREATE TRIGGER trades_set_city_code
+BEFORE INSERT OR UPDATE OF market_id ON trades
+FOR EACH ROW EXECUTE FUNCTION set_trade_city_code();
+
+-- Push a market's new city onto its existing trades
+CREATE OR REPLACE FUNCTION sync_trades_city_code() RETURNS trigger AS $$
+BEGIN
+    UPDATE trades SET city_code = NEW.city_code WHERE market_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS markets_sync_trades_city_code ON markets;
+CREATE TRIGGER markets_sync_trades_city_code
+AFTER UPDATE OF city_code ON markets
+FOR EACH ROW WHEN (OLD.city_code IS DISTINCT FROM NEW.city_code)
+EXECUTE FUNCTION sync_trades_city_code();
+
+-- Earlier releases created the trades trigger from the rollup table setup
+DROP FUNCTION IF EXISTS analytics.set_trade_city_code();
+
+-- Backfill trades recorded before the column existed
+UPDATE trades t
+SET city_code = m.city_code
+FROM markets m
+WHERE m.id = t.market_id AND t.city_code IS DISTINCT FROM m.city_code;
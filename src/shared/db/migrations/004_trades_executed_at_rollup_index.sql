@@ -0,0 +1,14 @@
+-- Migration 004: Covering executed_at index for the daily rollups
+-- The rollups' day_trades scan reads only these columns, so a day's
+-- aggregation can run as an index-only scan. This replaces the earlier
+-- idx_trades_executed_at_covering, which lacked city_code.
+--
+-- The build locks trades against writes while it runs; apply this during the
+-- low-activity window like other migrations. Both runners send the file as
+-- one transaction, which rules out CREATE INDEX CONCURRENTLY here.
+
+DROP INDEX IF EXISTS idx_trades_executed_at_covering;
+
+CREATE INDEX IF NOT EXISTS idx_trades_executed_at_rollup
+ON trades(executed_at)
+INCLUDE (id, city_code, strategy_name, total_cost, realized_pnl, fees, quantity);
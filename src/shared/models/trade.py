@@ -6,7 +6,7 @@ Represents individual trade executions from filled orders.
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.shared.models.base import Base, TimestampMixin
@@ -48,6 +48,11 @@ class Trade(Base, TimestampMixin):
         String(100), unique=True, nullable=True, index=True, doc="Kalshi trade ID"
     )
     ticker: Mapped[str] = mapped_column(String(50), nullable=False, index=True, doc="Market ticker")
+    city_code: Mapped[Optional[str]] = mapped_column(
+        String(3),
+        nullable=True,
+        doc="Market's city code, kept in sync by database triggers (migration 003)",
+    )
 
     # Trade details
     side: Mapped[str] = mapped_column(String(10), nullable=False, doc="Trade side (yes/no)")
@@ -83,7 +88,19 @@ class Trade(Base, TimestampMixin):
     market: Mapped["Market"] = relationship("Market", backref="trades")
     order: Mapped[Optional["Order"]] = relationship("Order", backref="trades")
 
-    __table_args__ = ({"comment": "Executed trades with P&L tracking"},)
+    __table_args__ = (
+        # Serves the city rollups' per-day scans and the city_code backfill
+        Index("idx_trades_city_executed_at", "city_code", "executed_at"),
+        # Covers the rollups' day scans as index-only scans (migration 004)
+        Index(
+            "idx_trades_executed_at_rollup",
+            "executed_at",
+            postgresql_include=[
+                "id", "city_code", "strategy_name", "total_cost", "realized_pnl", "fees", "quantity",
+            ],
+        ),
+        {"comment": "Executed trades with P&L tracking"},
+    )
 
     def __repr__(self) -> str:
         """String representation of Trade."""
@@ -215,9 +215,30 @@ class TestMigrations:
 
         run_migrations(mock_engine)
 
-        # Should have executed SQL and committed for each migration
-        assert mock_conn.execute.called
-        assert mock_conn.commit.called
+        # Each migration file is sent as one script and committed
+        scripts = [c[0][0] for c in mock_conn.exec_driver_sql.call_args_list]
+        assert scripts == [f.read_text() for f in sorted(MIGRATIONS_DIR.glob("*.sql"))]
+        assert mock_conn.commit.call_count == len(scripts)
+
+    def test_trades_city_code_migration(self) -> None:
+        """Test trades.city_code is added, backfilled, and kept in sync by triggers."""
+        sql = (MIGRATIONS_DIR / "003_denormalize_trades_city_code.sql").read_text()
+
+        assert "ALTER TABLE trades ADD COLUMN IF NOT EXISTS city_code" in sql
+        assert "CREATE TRIGGER trades_set_city_code" in sql
+        # Later changes to a market's city reach its existing trades
+        assert "AFTER UPDATE OF city_code ON markets" in sql
+        # The index serving the backfill exists before it runs
+        assert sql.index("ON trades(city_code, executed_at)") < sql.index("UPDATE trades t")
+
+    def test_trades_rollup_index_migration(self) -> None:
+        """Test the rollup covering index replaces the older one in a migration."""
+        sql = (MIGRATIONS_DIR / "004_trades_executed_at_rollup_index.sql").read_text()
+
+        assert sql.index("DROP INDEX IF EXISTS idx_trades_executed_at_covering") < sql.index(
+            "CREATE INDEX IF NOT EXISTS idx_trades_executed_at_rollup"
+        )
+        assert "INCLUDE (id, city_code, strategy_name" in sql
 
     def test_migration_sql_content(self) -> None:
         """Test that migration SQL files have expected content."""
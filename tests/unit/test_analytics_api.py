@@ -5,6 +5,7 @@ Tests the internal analytics API endpoints.
 
 from datetime import date, datetime, timezone
 from decimal import Decimal
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -13,6 +14,24 @@ from src.analytics.api import AnalyticsAPI, APIResponse, create_analytics_api
 from src.analytics.signal_generator import Signal as AnalyticsSignal, SignalGenerator
 
 
+def _with_totals(rows: list[dict]) -> tuple[list[dict], dict]:
+    """Pair metrics rows with the totals the rollup summary query returns."""
+    totals = {"row_count": len(rows)}
+    for column in ("net_pnl", "trade_count", "win_count", "loss_count", "signal_count"):
+        totals[column] = sum(row.get(column, 0) for row in rows)
+    return rows, totals
+
+
+def cached(api: AnalyticsAPI, key: str) -> Any:
+    """Value cached under ``key``, or None on a miss.
+
+    Reads through _get_or_load with a failing loader, which is never cached.
+    """
+    miss = APIResponse(success=False, error="miss")
+    response = api._get_or_load(key, lambda: miss)
+    return None if response is miss else response
+
+
 class TestAPIResponse:
     """Tests for APIResponse dataclass."""
 
@@ -63,6 +82,13 @@ class TestAPIResponse:
         assert "timestamp" in result
         assert result["data"] == {"metrics": []}
 
+    def test_api_response_to_dict_timestamp_format(self) -> None:
+        """Test serialized timestamp is the ISO form of the response timestamp."""
+        explicit_time = datetime(2026, 1, 28, 12, 0, 0, tzinfo=timezone.utc)
+        response = APIResponse(success=True, timestamp=explicit_time)
+
+        assert response.to_dict()["timestamp"] == "2026-01-28T12:00:00+00:00"
+
 
 class TestAnalyticsAPI:
     """Tests for AnalyticsAPI class."""
@@ -88,36 +114,92 @@ class TestAnalyticsAPI:
         api._set_cache("test_key", "cached_value")
 
         # Should return cached value
-        result = api._get_cached("test_key")
+        result = cached(api, "test_key")
         assert result == "cached_value"
 
     def test_cache_miss(self, api: AnalyticsAPI) -> None:
         """Test cache miss returns None."""
-        result = api._get_cached("nonexistent_key")
+        result = cached(api, "nonexistent_key")
         assert result is None
 
     def test_cache_expiry(self, api: AnalyticsAPI) -> None:
         """Test cache expiry after TTL."""
-        import datetime as dt
+        from cachetools import TLRUCache
+
+        from src.analytics.api import CACHE_TTL
+
+        # Drive the cache from a controllable clock
+        clock = [0.0]
+        api._cache = TLRUCache(maxsize=10, ttu=api._cache_expiry, timer=lambda: clock[0])
+        api._set_cache("expired_key", "old_value")
 
-        # Set cache with old timestamp
-        old_time = datetime.now(timezone.utc) - dt.timedelta(seconds=10)
-        api._cache["expired_key"] = (old_time, "old_value")
+        clock[0] += CACHE_TTL + 1
 
         # Should return None (expired)
-        result = api._get_cached("expired_key")
+        result = cached(api, "expired_key")
         assert result is None
         # Key should be removed
         assert "expired_key" not in api._cache
 
-    @patch("src.analytics.rollups.get_city_metrics")
+    def test_cache_is_bounded(self, api: AnalyticsAPI) -> None:
+        """Test cache evicts old entries once full."""
+        from src.analytics.api import CACHE_MAX_ENTRIES
+
+        for i in range(CACHE_MAX_ENTRIES + 10):
+            api._set_cache(f"key{i}", i)
+
+        assert len(api._cache) == CACHE_MAX_ENTRIES
+        assert cached(api, "key0") is None
+        assert cached(api, f"key{CACHE_MAX_ENTRIES + 9}") == CACHE_MAX_ENTRIES + 9
+
+    def test_cache_ttl_overrides(self, api: AnalyticsAPI) -> None:
+        """Test per-endpoint TTLs are derived from the cache key prefix."""
+        from src.analytics.api import CACHE_TTL, CACHE_TTL_OVERRIDES
+
+        assert api._cache_expiry("city_metrics:NYC", None, 100.0) == 100.0 + CACHE_TTL
+        assert api._cache_expiry("public_trades:None:100", None, 100.0) == (
+            100.0 + CACHE_TTL_OVERRIDES["public_trades"]
+        )
+        assert api._cache_expiry("health_status", None, 100.0) == (
+            100.0 + CACHE_TTL_OVERRIDES["health_status"]
+        )
+
+    @patch("src.analytics.health.get_current_health")
+    @patch("src.analytics.rollups.get_strategy_metrics_with_summary")
+    def test_strategy_and_health_use_cache(
+        self,
+        mock_get_strategy: MagicMock,
+        mock_get_health: MagicMock,
+        api: AnalyticsAPI,
+    ) -> None:
+        """Test strategy metrics and health status are cached."""
+        from src.analytics.health import ComponentStatus, SystemHealth
+
+        mock_get_strategy.return_value = _with_totals([])
+        mock_get_health.return_value = SystemHealth(
+            checked_at=datetime.now(timezone.utc),
+            overall_status=ComponentStatus.HEALTHY,
+            components=[],
+            total_healthy=0,
+            total_degraded=0,
+            total_unhealthy=0,
+        )
+
+        for _ in range(2):
+            assert api.get_strategy_metrics().success is True
+            assert api.get_health_status().success is True
+
+        assert mock_get_strategy.call_count == 1
+        assert mock_get_health.call_count == 1
+
+    @patch("src.analytics.rollups.get_city_metrics_with_summary")
     def test_get_city_metrics_success(
         self,
         mock_get_city: MagicMock,
         api: AnalyticsAPI,
     ) -> None:
         """Test getting city metrics successfully."""
-        mock_get_city.return_value = [
+        mock_get_city.return_value = _with_totals([
             {
                 "city_code": "NYC",
                 "date": date(2026, 1, 28),
@@ -126,7 +208,7 @@ class TestAnalyticsAPI:
                 "win_count": 7,
                 "loss_count": 3,
             },
-        ]
+        ])
 
         response = api.get_city_metrics(city_code="NYC")
 
@@ -135,14 +217,14 @@ class TestAnalyticsAPI:
         assert response.data["summary"]["total_trades"] == 10
         assert response.data["summary"]["win_rate"] == 70.0
 
-    @patch("src.analytics.rollups.get_city_metrics")
+    @patch("src.analytics.rollups.get_city_metrics_with_summary")
     def test_get_city_metrics_empty_results(
         self,
         mock_get_city: MagicMock,
         api: AnalyticsAPI,
     ) -> None:
         """Test city metrics with empty results."""
-        mock_get_city.return_value = []
+        mock_get_city.return_value = _with_totals([])
 
         response = api.get_city_metrics()
 
@@ -152,16 +234,16 @@ class TestAnalyticsAPI:
         assert response.data["summary"]["total_trades"] == 0
         assert response.data["summary"]["win_rate"] == 0
 
-    @patch("src.analytics.rollups.get_city_metrics")
+    @patch("src.analytics.rollups.get_city_metrics_with_summary")
     def test_get_city_metrics_uses_cache(
         self,
         mock_get_city: MagicMock,
         api: AnalyticsAPI,
     ) -> None:
         """Test city metrics uses cache on second call."""
-        mock_get_city.return_value = [
+        mock_get_city.return_value = _with_totals([
             {"city_code": "NYC", "trade_count": 5, "net_pnl": 50, "win_count": 3, "loss_count": 2},
-        ]
+        ])
 
         # First call
         response1 = api.get_city_metrics(city_code="NYC")
@@ -174,7 +256,7 @@ class TestAnalyticsAPI:
         # Should only call the underlying function once
         assert mock_get_city.call_count == 1
 
-    @patch("src.analytics.rollups.get_city_metrics")
+    @patch("src.analytics.rollups.get_city_metrics_with_summary")
     def test_get_city_metrics_error(
         self,
         mock_get_city: MagicMock,
@@ -188,14 +270,30 @@ class TestAnalyticsAPI:
         assert response.success is False
         assert "Database error" in response.error
 
-    @patch("src.analytics.rollups.get_strategy_metrics")
+    @patch("src.analytics.rollups.get_city_metrics_with_summary")
+    def test_error_message_truncated(
+        self,
+        mock_get_city: MagicMock,
+        api: AnalyticsAPI,
+    ) -> None:
+        """Test long error messages are truncated in the response."""
+        from src.analytics.api import MAX_ERROR_LENGTH
+
+        mock_get_city.side_effect = Exception("x" * (MAX_ERROR_LENGTH * 4))
+
+        response = api.get_city_metrics()
+
+        assert response.success is False
+        assert len(response.error) == MAX_ERROR_LENGTH
+
+    @patch("src.analytics.rollups.get_strategy_metrics_with_summary")
     def test_get_strategy_metrics_success(
         self,
         mock_get_strategy: MagicMock,
         api: AnalyticsAPI,
     ) -> None:
         """Test getting strategy metrics successfully."""
-        mock_get_strategy.return_value = [
+        mock_get_strategy.return_value = _with_totals([
             {
                 "strategy_name": "daily_high_temp",
                 "date": date(2026, 1, 28),
@@ -203,21 +301,21 @@ class TestAnalyticsAPI:
                 "signal_count": 20,
                 "net_pnl": Decimal("150.00"),
             },
-        ]
+        ])
 
         response = api.get_strategy_metrics(strategy_name="daily_high_temp")
 
         assert response.success is True
         assert response.data["summary"]["conversion_rate"] == 75.0
 
-    @patch("src.analytics.rollups.get_strategy_metrics")
+    @patch("src.analytics.rollups.get_strategy_metrics_with_summary")
     def test_get_strategy_metrics_empty_results(
         self,
         mock_get_strategy: MagicMock,
         api: AnalyticsAPI,
     ) -> None:
         """Test strategy metrics with empty results."""
-        mock_get_strategy.return_value = []
+        mock_get_strategy.return_value = _with_totals([])
 
         response = api.get_strategy_metrics()
 
@@ -225,7 +323,7 @@ class TestAnalyticsAPI:
         assert response.data["summary"]["total_pnl"] == 0
         assert response.data["summary"]["conversion_rate"] == 0
 
-    @patch("src.analytics.rollups.get_strategy_metrics")
+    @patch("src.analytics.rollups.get_strategy_metrics_with_summary")
     def test_get_strategy_metrics_error(
         self,
         mock_get_strategy: MagicMock,
@@ -273,6 +371,26 @@ class TestAnalyticsAPI:
         assert response.data["summary"]["trading_days"] == 2
         assert response.data["summary"]["total_return"] == 150.0
 
+    @patch("src.analytics.rollups.get_equity_curve")
+    def test_get_equity_curve_max_drawdown(
+        self,
+        mock_get_equity: MagicMock,
+        api: AnalyticsAPI,
+    ) -> None:
+        """Test max drawdown summary picks the worst point in the curve."""
+        mock_get_equity.return_value = [
+            {"drawdown": Decimal("10.00"), "drawdown_pct": Decimal("0.5")},
+            {"drawdown": Decimal("40.00"), "drawdown_pct": Decimal("2.0")},
+            {"drawdown": Decimal("5.00"), "drawdown_pct": Decimal("0.1")},
+        ]
+
+        response = api.get_equity_curve()
+
+        summary = response.data["summary"]
+        assert summary["max_drawdown"] == 40.0
+        assert summary["max_drawdown_pct"] == 2.0
+        assert isinstance(summary["max_drawdown"], float)
+
     @patch("src.analytics.rollups.get_equity_curve")
     def test_get_equity_curve_empty_results(
         self,
@@ -518,14 +636,14 @@ class TestAnalyticsAPIEdgeCases:
         """Create AnalyticsAPI instance."""
         return AnalyticsAPI(mock_engine)
 
-    @patch("src.analytics.rollups.get_city_metrics")
+    @patch("src.analytics.rollups.get_city_metrics_with_summary")
     def test_get_city_metrics_with_zero_wins_and_losses(
         self,
         mock_get_city: MagicMock,
         api: AnalyticsAPI,
     ) -> None:
         """Test city metrics with zero wins and losses."""
-        mock_get_city.return_value = [
+        mock_get_city.return_value = _with_totals([
             {
                 "city_code": "NYC",
                 "trade_count": 0,
@@ -533,28 +651,28 @@ class TestAnalyticsAPIEdgeCases:
                 "win_count": 0,
                 "loss_count": 0,
             },
-        ]
+        ])
 
         response = api.get_city_metrics()
 
         assert response.success is True
         assert response.data["summary"]["win_rate"] == 0
 
-    @patch("src.analytics.rollups.get_strategy_metrics")
+    @patch("src.analytics.rollups.get_strategy_metrics_with_summary")
     def test_get_strategy_metrics_with_zero_signals(
         self,
         mock_get_strategy: MagicMock,
         api: AnalyticsAPI,
     ) -> None:
         """Test strategy metrics with zero signals."""
-        mock_get_strategy.return_value = [
+        mock_get_strategy.return_value = _with_totals([
             {
                 "strategy_name": "test",
                 "trade_count": 0,
                 "signal_count": 0,
                 "net_pnl": Decimal("0"),
             },
-        ]
+        ])
 
         response = api.get_strategy_metrics()
 
@@ -567,9 +685,40 @@ class TestAnalyticsAPIEdgeCases:
         api._set_cache("key1", "value1")
         api._set_cache("key2", "value2")
 
-        assert api._get_cached("key1") == "value1"
-        assert api._get_cached("key2") == "value2"
-        assert api._get_cached("key3") is None
+        assert cached(api, "key1") == "value1"
+        assert cached(api, "key2") == "value2"
+        assert cached(api, "key3") is None
+
+    def test_concurrent_misses_coalesce(self, api: AnalyticsAPI) -> None:
+        """Test concurrent misses for one key run the loader only once."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        release = threading.Event()
+        calls = []
+
+        def loader() -> APIResponse:
+            calls.append(1)
+            release.wait(timeout=5)
+            return APIResponse(success=True, data={"value": 1})
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(api._get_or_load, "shared", loader) for _ in range(4)]
+            while not api._inflight:
+                pass
+            release.set()
+            results = [f.result(timeout=5) for f in futures]
+
+        assert len(calls) == 1
+        assert all(r.data == {"value": 1} for r in results)
+        assert api._inflight == {}
+
+    def test_failed_load_is_not_cached(self, api: AnalyticsAPI) -> None:
+        """Test failed responses are not cached."""
+        api._get_or_load("failing", lambda: APIResponse(success=False, error="boom"))
+
+        assert cached(api, "failing") is None
+        assert api._inflight == {}
 
 
 class TestSignalGenerator:
@@ -716,3 +865,52 @@ class TestCreateAnalyticsAPI:
 
         assert isinstance(api, AnalyticsAPI)
         assert api.engine == mock_engine
+
+    def test_create_analytics_api_shared_per_engine(self) -> None:
+        """Test factory returns one shared instance per engine."""
+        engine_a = MagicMock()
+        engine_b = MagicMock()
+
+        assert create_analytics_api(engine_a) is create_analytics_api(engine_a)
+        assert create_analytics_api(engine_a) is not create_analytics_api(engine_b)
+
+    def test_create_analytics_api_survives_dropped_reference(self) -> None:
+        """Test a handler dropping its instance does not lose the warm cache."""
+        import gc
+
+        engine = MagicMock()
+        api = create_analytics_api(engine)
+        api._set_cache("warm", "value")
+        first_id = id(api)
+
+        del api
+        gc.collect()
+
+        again = create_analytics_api(engine)
+        assert id(again) == first_id
+        assert cached(again, "warm") == "value"
+
+
+class TestPackageExports:
+    """Tests for lazy exports from the analytics package."""
+
+    def test_lazy_export_resolves(self) -> None:
+        """Test public names resolve to their defining module objects."""
+        import src.analytics as analytics
+
+        assert analytics.AnalyticsAPI is AnalyticsAPI
+        assert analytics.SignalGenerator is SignalGenerator
+
+    def test_all_exports_resolve(self) -> None:
+        """Test every name in __all__ can be resolved."""
+        import src.analytics as analytics
+
+        for name in analytics.__all__:
+            assert getattr(analytics, name) is not None
+
+    def test_unknown_attribute_raises(self) -> None:
+        """Test unknown names raise AttributeError."""
+        import src.analytics as analytics
+
+        with pytest.raises(AttributeError):
+            analytics.DoesNotExist  # noqa: B018
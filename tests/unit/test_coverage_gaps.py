@@ -744,47 +744,37 @@ class TestHealthCoverageGaps:
         from src.analytics.health import (
             check_degraded_components,
             ComponentStatus,
-            ComponentHealth,
-            SystemHealth,
         )
 
+        # The query only returns degraded and unhealthy components
+        mock_rows = [
+            ("degraded_component", "degraded", datetime.now(timezone.utc), 300.0, 0.1, None, None),
+            ("unhealthy_component", "unhealthy", datetime.now(timezone.utc), None, 0.5, None, None),
+        ]
+        mock_result = MagicMock()
+        mock_result.__iter__ = MagicMock(return_value=iter(mock_rows))
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value = mock_result
+
         mock_engine = MagicMock()
+        mock_engine.connect.return_value = mock_conn
 
-        # Mock get_current_health to return components with various statuses
         with patch("src.analytics.health.get_current_health") as mock_get_health:
-            mock_get_health.return_value = SystemHealth(
-                checked_at=datetime.now(timezone.utc),
-                overall_status=ComponentStatus.DEGRADED,
-                components=[
-                    ComponentHealth(
-                        name="healthy_component",
-                        status=ComponentStatus.HEALTHY,
-                        last_check=datetime.now(timezone.utc),
-                    ),
-                    ComponentHealth(
-                        name="degraded_component",
-                        status=ComponentStatus.DEGRADED,
-                        last_check=datetime.now(timezone.utc),
-                    ),
-                    ComponentHealth(
-                        name="unhealthy_component",
-                        status=ComponentStatus.UNHEALTHY,
-                        last_check=datetime.now(timezone.utc),
-                    ),
-                ],
-                total_healthy=1,
-                total_degraded=1,
-                total_unhealthy=1,
-            )
-
             degraded = check_degraded_components(mock_engine)
 
-            # Should return only degraded and unhealthy
-            assert len(degraded) == 2
-            assert all(
-                c.status in (ComponentStatus.DEGRADED, ComponentStatus.UNHEALTHY)
-                for c in degraded
-            )
+            # Should not materialize the full system health
+            mock_get_health.assert_not_called()
+
+        # Should return only degraded and unhealthy
+        assert len(degraded) == 2
+        assert all(
+            c.status in (ComponentStatus.DEGRADED, ComponentStatus.UNHEALTHY)
+            for c in degraded
+        )
+        assert degraded[0].details == {}
 
     def test_component_health_properties(self) -> None:
         """Test ComponentHealth is_healthy and is_degraded properties."""
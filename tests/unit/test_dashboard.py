@@ -212,6 +212,28 @@ class TestDashboardDataProvider:
         assert "Weather API (NWS)" in component_names
         assert "Dashboard" in component_names
 
+    def test_fills_fetched_once_per_ttl(self, data_provider: DashboardDataProvider) -> None:
+        """Test equity curve, city metrics, and trades share one fills request."""
+        client = MagicMock()
+        client.get_fills.return_value = []
+        client.get_balance.return_value = {"balance": 99200}
+        data_provider._kalshi_client = client
+
+        data_provider.get_equity_curve()
+        data_provider.get_city_metrics()
+        data_provider.get_public_trades()
+
+        client.get_fills.assert_called_once()
+
+    def test_fills_not_cached_on_error(self, data_provider: DashboardDataProvider) -> None:
+        """Test a failed fills request is retried on the next call."""
+        client = MagicMock()
+        client.get_fills.side_effect = [RuntimeError("timeout"), [{"ticker": "HIGHNYC"}]]
+        data_provider._kalshi_client = client
+
+        assert data_provider._fetch_kalshi_fills() == []
+        assert data_provider._fetch_kalshi_fills() == [{"ticker": "HIGHNYC"}]
+
     def test_cache_validity(self, data_provider: DashboardDataProvider) -> None:
         """Test cache validity checking."""
         # No cache time set
@@ -5,9 +5,13 @@ from datetime import datetime, timezone
 from unittest.mock import Mock, patch
 
 from src.dashboard.app import (
+    LIVE_CLOCK_SCRIPT,
+    build_health_html,
     get_data_provider,
     render_header,
     render_main_content,
+    render_stats_strip,
+    render_status_row,
     render_city_markets_tab,
     render_performance_tab,
     render_trade_feed_tab,
@@ -268,10 +272,68 @@ class TestRenderHeader:
         mock_streamlit.markdown.assert_called()
 
 
+class TestRenderStatusRow:
+    """Tests for render_status_row function."""
+
+    def test_renders_new_york_time_with_zone_abbreviation(self, mock_streamlit):
+        """Test the status row shows New York time tagged EST or EDT."""
+        render_status_row()
+
+        html = mock_streamlit.markdown.call_args[0][0]
+        assert "LIVE" in html
+        assert " EST" in html or " EDT" in html
+
+    def test_clock_ticks_client_side(self, mock_streamlit):
+        """Test the live clock span is driven by the embedded script."""
+        render_status_row()
+
+        html = mock_streamlit.markdown.call_args[0][0]
+        assert 'id="live-clock"' in html
+        mock_streamlit.components.v1.html.assert_called_once_with(LIVE_CLOCK_SCRIPT, height=0)
+
+
+class TestRenderStatsStrip:
+    """Tests for render_stats_strip function."""
+
+    def test_renders_all_stats_in_one_markdown_call(self, mock_streamlit, mock_data_provider):
+        """Test the five stat cards are emitted as a single grid."""
+        render_stats_strip(mock_data_provider)
+
+        mock_streamlit.markdown.assert_called_once()
+        html = mock_streamlit.markdown.call_args[0][0]
+        for label in ("Portfolio", "Total P&L", "Win Rate", "Top City", "Worst City"):
+            assert label in html
+        mock_streamlit.columns.assert_not_called()
+
+    def test_picks_best_and_worst_city(self, mock_streamlit, mock_data_provider):
+        """Test totals and best/worst city come out of the single pass over metrics."""
+        mock_data_provider.get_city_metrics.return_value = [
+            {"city_code": "NYC", "trade_count": 4, "win_count": 3, "net_pnl": 12.0},
+            {"city_code": "CHI", "trade_count": 6, "win_count": 2, "net_pnl": -30.0},
+            {"city_code": "MIA", "trade_count": 10, "win_count": 5, "net_pnl": 45.0},
+        ]
+
+        render_stats_strip(mock_data_provider)
+
+        html = mock_streamlit.markdown.call_args[0][0]
+        assert "20 trades" in html
+        assert "50.0%" in html
+        assert ">MIA<" in html and "$+45" in html
+        assert ">CHI<" in html and "$-30" in html
+
+    def test_renders_without_city_metrics(self, mock_streamlit, mock_data_provider):
+        """Test the strip falls back to zero trades when there are no city metrics."""
+        mock_data_provider.get_city_metrics.return_value = []
+
+        render_stats_strip(mock_data_provider)
+
+        assert "0 trades" in mock_streamlit.markdown.call_args[0][0]
+
+
 class TestRenderCityMarketsTab:
     """Tests for render_city_markets_tab function."""
     
-    @patch("src.dashboard.app.render_city_grid")
+    @patch("src.dashboard.components.render_city_grid")
     def test_renders_city_markets(self, mock_render_grid, mock_streamlit, mock_data_provider):
         """Test that city markets tab renders correctly."""
         render_city_markets_tab(mock_data_provider)
@@ -290,8 +352,8 @@ class TestRenderCityMarketsTab:
 class TestRenderPerformanceTab:
     """Tests for render_performance_tab function."""
     
-    @patch("src.dashboard.app.render_equity_chart")
-    @patch("src.dashboard.app.render_performance_heatmap")
+    @patch("src.dashboard.components.render_equity_chart")
+    @patch("src.dashboard.components.render_performance_heatmap")
     def test_renders_performance_tab(self, mock_render_heatmap, mock_render_chart, mock_streamlit, mock_data_provider):
         """Test that performance tab renders correctly."""
         mock_streamlit.selectbox.return_value = "1 Month"
@@ -314,8 +376,8 @@ class TestRenderPerformanceTab:
         mock_data_provider.get_city_metrics.assert_called_once()
         mock_render_heatmap.assert_called_once()
     
-    @patch("src.dashboard.app.render_equity_chart")
-    @patch("src.dashboard.app.render_performance_heatmap")
+    @patch("src.dashboard.components.render_equity_chart")
+    @patch("src.dashboard.components.render_performance_heatmap")
     def test_handles_different_time_ranges(self, mock_render_heatmap, mock_render_chart, mock_streamlit, mock_data_provider):
         """Test that different time ranges are handled correctly."""
         for time_range in ["1 Day", "7 Days", "All Time"]:
@@ -331,7 +393,7 @@ class TestRenderPerformanceTab:
 class TestRenderTradeFeedTab:
     """Tests for render_trade_feed_tab function."""
     
-    @patch("src.dashboard.app.render_trade_feed")
+    @patch("src.dashboard.components.render_trade_feed")
     def test_renders_trade_feed_all_cities(self, mock_render_feed, mock_streamlit, mock_data_provider):
         """Test that trade feed renders for all cities."""
         mock_streamlit.selectbox.return_value = "All Cities"
@@ -352,7 +414,7 @@ class TestRenderTradeFeedTab:
         # Check feed was rendered
         mock_render_feed.assert_called_once()
     
-    @patch("src.dashboard.app.render_trade_feed")
+    @patch("src.dashboard.components.render_trade_feed")
     def test_renders_trade_feed_filtered_city(self, mock_render_feed, mock_streamlit, mock_data_provider):
         """Test that trade feed renders for specific city."""
         mock_streamlit.selectbox.return_value = "NYC"
@@ -377,13 +439,37 @@ class TestRenderHealthTab:
         # Check health status was fetched
         mock_data_provider.get_health_status.assert_called_once()
 
-        # Check health metrics and component details rendered via markdown
-        # The source renders overall status, summary metrics, and component cards all via st.markdown
-        assert mock_streamlit.markdown.call_count >= 4
+        # Heading plus one cached body holding overall status, summary, and components
+        assert mock_streamlit.markdown.call_count == 2
+        assert any("Healthy" in c and "Unhealthy" in c for c in markdown_calls)
 
         # Check component details heading was rendered
         assert any("Component Details" in c for c in markdown_calls)
     
+    def test_renders_component_cards_in_one_markdown_call(self, mock_streamlit, mock_data_provider):
+        """Test all component cards are emitted together as one grid."""
+        render_health_tab(mock_data_provider)
+
+        grids = [
+            c[0][0] for c in mock_streamlit.markdown.call_args_list if "card-grid-2" in c[0][0]
+        ]
+        assert len(grids) == 1
+        assert "Database" in grids[0]
+        assert "Kalshi API" in grids[0]
+        assert "5.0%" in grids[0]
+
+    def test_health_html_is_cached_for_unchanged_data(self, mock_streamlit, mock_data_provider):
+        """Test identical health payloads reuse the rendered HTML."""
+        health_data = mock_data_provider.get_health_status.return_value
+        build_health_html.clear()
+
+        first = build_health_html(health_data)
+        with patch("src.dashboard.app.build_component_card_html") as mock_card:
+            second = build_health_html(health_data)
+
+        assert second == first
+        mock_card.assert_not_called()
+
     def test_renders_health_tab_without_data(self, mock_streamlit, mock_data_provider):
         """Test that health tab handles missing data."""
         mock_data_provider.get_health_status.return_value = None
@@ -3,23 +3,32 @@
 Tests the health monitoring and component status tracking.
 """
 
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
 
+from src.analytics import health
 from src.analytics.health import (
     ComponentHealth,
     ComponentStatus,
+    HealthCheckResult,
     SystemHealth,
     check_degraded_components,
     cleanup_old_health_records,
     create_health_tables,
+    ensure_partition,
     get_current_health,
     get_health_history,
+    iter_health_history,
     record_health_check,
+    record_health_checks,
 )
 
+# Engine URL the partition caches are keyed by in these tests
+TEST_DB_URL = "postgresql://milkbot@localhost/milkbot_test"
+
 
 class TestComponentHealth:
     """Tests for ComponentHealth dataclass."""
@@ -39,6 +48,22 @@ class TestComponentHealth:
         assert health.is_healthy is True
         assert health.is_degraded is False
 
+    def test_component_health_uses_slots(self) -> None:
+        """Test health dataclasses are slotted (no per-instance __dict__)."""
+        component = ComponentHealth(
+            name="api",
+            status=ComponentStatus.HEALTHY,
+            last_check=datetime.now(timezone.utc),
+        )
+        system = SystemHealth(
+            checked_at=datetime.now(timezone.utc),
+            overall_status=ComponentStatus.HEALTHY,
+            components=[component],
+        )
+
+        assert not hasattr(component, "__dict__")
+        assert not hasattr(system, "__dict__")
+
     def test_component_health_degraded(self) -> None:
         """Test degraded component status."""
         health = ComponentHealth(
@@ -127,31 +152,134 @@ class TestSystemHealth:
 class TestHealthTableCreation:
     """Tests for health table creation."""
 
+    @pytest.fixture(autouse=True)
+    def fresh_partition_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Isolate the per-process partition cache."""
+        monkeypatch.setattr(health, "_partition_days", {})
+
     def test_create_health_tables(self) -> None:
-        """Test creating health tables."""
+        """Test creating health tables in one transaction."""
         mock_conn = MagicMock()
         mock_conn.__enter__ = MagicMock(return_value=mock_conn)
         mock_conn.__exit__ = MagicMock(return_value=False)
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        mock_engine.begin.return_value = mock_conn
+
+        create_health_tables(mock_engine)
+
+        mock_engine.begin.assert_called_once()
+        mock_engine.connect.assert_not_called()
+        assert mock_conn.exec_driver_sql.call_count == 5
+        assert datetime.now(timezone.utc).date() in health._partition_days[str(mock_engine.url)]
+
+    def test_checked_at_uses_brin_index(self) -> None:
+        """Test the checked_at btree is replaced by a BRIN index."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
+
+        create_health_tables(mock_engine)
+
+        script = "".join(c[0][0] for c in mock_conn.exec_driver_sql.call_args_list)
+        assert "USING BRIN (checked_at)" in script
+        assert "DROP INDEX IF EXISTS analytics.idx_health_metrics_checked_at;" in script
+
+    def test_component_history_uses_composite_index(self) -> None:
+        """Test a (component_name, checked_at DESC) index replaces the single-column one."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
+
+        create_health_tables(mock_engine)
+
+        script = "".join(c[0][0] for c in mock_conn.exec_driver_sql.call_args_list)
+        assert "analytics.health_metrics(component_name, checked_at DESC)" in script
+        assert "DROP INDEX IF EXISTS analytics.idx_health_metrics_component;" in script
+
+    def test_plain_table_converted_with_rows(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a pre-partitioning health_metrics is replaced in the same transaction."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value.scalars.return_value.all.return_value = [
+            date(2026, 3, 1),
+            date(2026, 3, 2),
+        ]
+        retire = MagicMock(return_value=True)
+        copy = MagicMock()
+        monkeypatch.setattr(health, "retire_plain_table", retire)
+        monkeypatch.setattr(health, "copy_legacy_rows", copy)
+
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
 
         create_health_tables(mock_engine)
 
-        assert mock_conn.execute.called
-        assert mock_conn.commit.called
+        retire.assert_called_once_with(mock_conn, "health_metrics")
+        copy.assert_called_once_with(mock_conn, "health_metrics")
+        script = "".join(c[0][0] for c in mock_conn.exec_driver_sql.call_args_list)
+        # Partitions for the legacy days exist before the rows are copied
+        assert "analytics.health_metrics_20260301" in script
+        assert "analytics.health_metrics_20260302" in script
+
+    def test_legacy_view_dropped_before_conversion(self) -> None:
+        """Test v_current_health is dropped before the rename and the legacy DROP TABLE."""
+        from src.analytics import partitioning
+
+        results: dict[Any, Any] = {
+            partitioning.TABLE_RELKIND_SQL: "r",
+            health.HEALTH_LEGACY_DAYS_SQL: [date(2026, 3, 1)],
+        }
+
+        def execute(statement: Any, params: Any = None) -> MagicMock:
+            result = MagicMock()
+            value = results.get(statement)
+            result.scalar.return_value = value
+            result.scalars.return_value.all.return_value = value or []
+            result.all.return_value = value or []
+            return result
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.side_effect = execute
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
+
+        create_health_tables(mock_engine)
+
+        statements = [c[0][0] for c in mock_conn.exec_driver_sql.call_args_list]
+        drop_view = statements.index("DROP VIEW IF EXISTS analytics.v_current_health")
+        rename = statements.index(
+            "ALTER TABLE analytics.health_metrics RENAME TO health_metrics_legacy"
+        )
+        drop_legacy = statements.index("DROP TABLE analytics.health_metrics_legacy")
+        assert drop_view < rename < drop_legacy
 
 
 class TestHealthRecording:
     """Tests for recording health checks."""
 
+    @pytest.fixture(autouse=True)
+    def partition_exists(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Mark today's partition as created so inserts are asserted alone."""
+        today = datetime.now(timezone.utc).date()
+        monkeypatch.setattr(health, "_partition_days", {TEST_DB_URL: {today, today + timedelta(days=1)}})
+
     def test_record_health_check(self) -> None:
         """Test recording a health check."""
         mock_conn = MagicMock()
         mock_conn.__enter__ = MagicMock(return_value=mock_conn)
         mock_conn.__exit__ = MagicMock(return_value=False)
 
-        mock_engine = MagicMock()
+        mock_engine = MagicMock(url=TEST_DB_URL)
         mock_engine.connect.return_value = mock_conn
 
         record_health_check(
@@ -164,7 +292,7 @@ class TestHealthRecording:
             message="OK",
         )
 
-        mock_conn.execute.assert_called_once()
+        assert mock_conn.execute.call_count == 2
         mock_conn.commit.assert_called_once()
 
     def test_record_health_check_with_errors(self) -> None:
@@ -173,7 +301,7 @@ class TestHealthRecording:
         mock_conn.__enter__ = MagicMock(return_value=mock_conn)
         mock_conn.__exit__ = MagicMock(return_value=False)
 
-        mock_engine = MagicMock()
+        mock_engine = MagicMock(url=TEST_DB_URL)
         mock_engine.connect.return_value = mock_conn
 
         record_health_check(
@@ -187,7 +315,164 @@ class TestHealthRecording:
             details={"endpoint": "/forecast"},
         )
 
+        assert mock_conn.execute.call_count == 2
+        params = mock_conn.execute.call_args[0][1]
+        assert params[0]["details"] == '{"endpoint":"/forecast"}'
+        assert "CAST(:details AS jsonb)" in str(mock_conn.execute.call_args[0][0])
+
+    def test_record_health_checks_batch(self) -> None:
+        """Test a batch of checks is written with executemany statements and one commit."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        mock_engine = MagicMock(url=TEST_DB_URL)
+        mock_engine.connect.return_value = mock_conn
+
+        record_health_checks(
+            mock_engine,
+            [
+                HealthCheckResult("kalshi_api", ComponentStatus.HEALTHY, latency_ms=40.0),
+                HealthCheckResult(
+                    "nws_api", ComponentStatus.DEGRADED, error_count=2, request_count=10
+                ),
+            ],
+        )
+
+        mock_engine.connect.assert_called_once()
+        assert mock_conn.execute.call_count == 2
+        mock_conn.commit.assert_called_once()
+        params = mock_conn.execute.call_args[0][1]
+        assert [p["component_name"] for p in params] == ["kalshi_api", "nws_api"]
+        assert params[1]["error_rate"] == 0.2
+        assert params[0]["details"] == "{}"
+        assert params[0]["checked_at"] == params[1]["checked_at"]
+
+    def test_record_health_checks_empty(self) -> None:
+        """Test an empty batch does not touch the database."""
+        mock_engine = MagicMock(url=TEST_DB_URL)
+
+        record_health_checks(mock_engine, [])
+
+        mock_engine.connect.assert_not_called()
+
+    def test_record_health_check_explicit_checked_at(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a caller-supplied check time is used for the row and its partition."""
+        checked_at = datetime(2026, 3, 1, 23, 30, tzinfo=timezone(timedelta(hours=-5)))
+        monkeypatch.setattr(health, "_partition_days", {TEST_DB_URL: {date(2026, 3, 2)}})
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        mock_engine = MagicMock(url=TEST_DB_URL)
+        mock_engine.connect.return_value = mock_conn
+
+        record_health_check(
+            mock_engine, "kalshi_api", ComponentStatus.HEALTHY, checked_at=checked_at
+        )
+
+        # 04:30 UTC on March 2 lands in the already-created partition
+        assert mock_conn.execute.call_count == 2
+        assert mock_conn.execute.call_args[0][1][0]["checked_at"] is checked_at
+
+    def test_record_upserts_current_health(self) -> None:
+        """Test each write also upserts the per-component current row."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        mock_engine = MagicMock(url=TEST_DB_URL)
+        mock_engine.connect.return_value = mock_conn
+
+        record_health_check(mock_engine, "kalshi_api", ComponentStatus.HEALTHY)
+
+        insert_call, upsert_call = mock_conn.execute.call_args_list
+        assert "analytics.health_metrics" in str(insert_call[0][0])
+        upsert_sql = str(upsert_call[0][0])
+        assert "analytics.health_current" in upsert_sql
+        assert "ON CONFLICT (component_name) DO UPDATE" in upsert_sql
+        assert upsert_call[0][1] is insert_call[0][1]
+
+
+class TestHealthPartitions:
+    """Tests for daily health_metrics partitions."""
+
+    def test_ensure_partition_creates_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a day's partition is created once and then cached."""
+        monkeypatch.setattr(health, "_partition_days", {})
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        mock_engine = MagicMock(url=TEST_DB_URL)
+        mock_engine.connect.return_value = mock_conn
+
+        ensure_partition(mock_engine, date(2026, 1, 31))
+        ensure_partition(mock_engine, date(2026, 1, 31))
+
         mock_conn.execute.assert_called_once()
+        sql = str(mock_conn.execute.call_args[0][0])
+        assert "analytics.health_metrics_20260131" in sql
+        assert "PARTITION OF analytics.health_metrics" in sql
+        assert "FROM ('2026-01-31 00:00:00+00') TO ('2026-02-01 00:00:00+00')" in sql
+
+    def test_partition_cache_is_per_database(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a partition created in one database is still created in another."""
+        monkeypatch.setattr(health, "_partition_days", {})
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        first = MagicMock(url=TEST_DB_URL)
+        second = MagicMock(url="postgresql://milkbot@localhost/milkbot_other")
+        first.connect.return_value = mock_conn
+        second.connect.return_value = mock_conn
+
+        ensure_partition(first, date(2026, 1, 31))
+        ensure_partition(second, date(2026, 1, 31))
+
+        assert mock_conn.execute.call_count == 2
+
+    def test_create_tables_forgets_dropped_partitions(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test re-creating the tables drops partitions cached before the re-create."""
+        stale_day = date(2026, 1, 31)
+        monkeypatch.setattr(health, "_partition_days", {TEST_DB_URL: {stale_day}})
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        mock_engine = MagicMock(url=TEST_DB_URL)
+        mock_engine.begin.return_value = mock_conn
+        mock_engine.connect.return_value = mock_conn
+
+        create_health_tables(mock_engine)
+        ensure_partition(mock_engine, stale_day)
+
+        assert health._partition_days[TEST_DB_URL] == {
+            datetime.now(timezone.utc).date(),
+            stale_day,
+        }
+        assert "analytics.health_metrics_20260131" in str(mock_conn.execute.call_args[0][0])
+
+    def test_record_creates_missing_partition(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test recording into a new day creates its partition first."""
+        monkeypatch.setattr(health, "_partition_days", {})
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        mock_engine = MagicMock(url=TEST_DB_URL)
+        mock_engine.connect.return_value = mock_conn
+
+        record_health_check(mock_engine, "kalshi_api", ComponentStatus.HEALTHY)
+
+        first_sql = str(mock_conn.execute.call_args_list[0][0][0])
+        assert "PARTITION OF analytics.health_metrics" in first_sql
+        assert len(health._partition_days[TEST_DB_URL]) == 1
 
 
 class TestHealthQueries:
@@ -197,8 +482,11 @@ class TestHealthQueries:
         """Test getting current health status."""
         # Mock row data
         mock_rows = [
-            ("kalshi_api", "healthy", datetime.now(timezone.utc), 50.0, 0.01, "OK", {}),
-            ("weather_api", "degraded", datetime.now(timezone.utc), 200.0, 0.05, "Slow", {}),
+            ("kalshi_api", "healthy", datetime.now(timezone.utc), 50.0, 0.01, "OK", {}, 1, 1, 0),
+            (
+                "weather_api", "degraded", datetime.now(timezone.utc), 200.0, 0.05, "Slow", {},
+                1, 1, 0,
+            ),
         ]
 
         mock_result = MagicMock()
@@ -222,8 +510,8 @@ class TestHealthQueries:
     def test_get_current_health_all_healthy(self) -> None:
         """Test getting health when all components healthy."""
         mock_rows = [
-            ("api", "healthy", datetime.now(timezone.utc), 50.0, 0.0, "OK", {}),
-            ("db", "healthy", datetime.now(timezone.utc), 10.0, 0.0, "OK", {}),
+            ("api", "healthy", datetime.now(timezone.utc), 50.0, 0.0, "OK", {}, 2, 0, 0),
+            ("db", "healthy", datetime.now(timezone.utc), 10.0, 0.0, "OK", {}, 2, 0, 0),
         ]
 
         mock_result = MagicMock()
@@ -242,6 +530,48 @@ class TestHealthQueries:
         assert health.overall_status == ComponentStatus.HEALTHY
         assert health.is_system_healthy is True
 
+    def test_get_current_health_unrecognized_status(self) -> None:
+        """Test missing or unrecognized status strings map to UNKNOWN."""
+        mock_rows = [
+            ("api", None, datetime.now(timezone.utc), 50.0, 0.0, "OK", {}, 0, 0, 0),
+            ("db", "rebooting", datetime.now(timezone.utc), 10.0, 0.0, "OK", {}, 0, 0, 0),
+        ]
+
+        mock_result = MagicMock()
+        mock_result.__iter__ = MagicMock(return_value=iter(mock_rows))
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value = mock_result
+
+        mock_engine = MagicMock()
+        mock_engine.connect.return_value = mock_conn
+
+        health = get_current_health(mock_engine)
+
+        assert [c.status for c in health.components] == [ComponentStatus.UNKNOWN] * 2
+        assert health.overall_status == ComponentStatus.UNKNOWN
+
+    def test_get_current_health_empty(self) -> None:
+        """Test no components reports zero counts and unknown status."""
+        mock_result = MagicMock()
+        mock_result.__iter__ = MagicMock(return_value=iter([]))
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value = mock_result
+
+        mock_engine = MagicMock()
+        mock_engine.connect.return_value = mock_conn
+
+        health = get_current_health(mock_engine)
+
+        assert health.components == []
+        assert health.total_healthy == 0
+        assert health.overall_status == ComponentStatus.UNKNOWN
+
     def test_get_health_history(self) -> None:
         """Test getting health history."""
         mock_rows = [
@@ -264,12 +594,42 @@ class TestHealthQueries:
         assert len(history) == 1
         assert history[0]["component_name"] == "kalshi_api"
 
+    def test_iter_health_history_streams(self) -> None:
+        """Test history is read lazily through a server-side cursor."""
+        mock_rows = [
+            ("kalshi_api", "healthy", datetime.now(timezone.utc), 50.0, None, "OK"),
+            ("kalshi_api", "degraded", datetime.now(timezone.utc), 250.0, 0.2, "Slow"),
+        ]
+
+        mock_result = MagicMock()
+        mock_result.__iter__ = MagicMock(return_value=iter(mock_rows))
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value = mock_result
+
+        mock_engine = MagicMock()
+        mock_engine.connect.return_value = mock_conn
+
+        history = iter_health_history(mock_engine, chunk_size=50)
+        mock_engine.connect.assert_not_called()
+
+        first = next(history)
+        assert first["error_rate"] is None
+        assert mock_conn.execute.call_args[1]["execution_options"] == {
+            "stream_results": True,
+            "yield_per": 50,
+        }
+        assert [r["status"] for r in history] == ["degraded"]
+        mock_conn.__exit__.assert_called_once()
+
     def test_check_degraded_components(self) -> None:
         """Test checking for degraded components."""
+        # Healthy rows are filtered out by the query itself
         mock_rows = [
-            ("api", "healthy", datetime.now(timezone.utc), 50.0, 0.0, "OK", {}),
-            ("db", "degraded", datetime.now(timezone.utc), 500.0, 0.1, "Slow", {}),
             ("cache", "unhealthy", datetime.now(timezone.utc), None, 0.5, "Down", {}),
+            ("db", "degraded", datetime.now(timezone.utc), 500.0, 0.1, "Slow", {}),
         ]
 
         mock_result = MagicMock()
@@ -289,6 +649,9 @@ class TestHealthQueries:
         names = [c.name for c in degraded]
         assert "db" in names
         assert "cache" in names
+        assert degraded[0].status == ComponentStatus.UNHEALTHY
+        sql = str(mock_conn.execute.call_args[0][0])
+        assert "WHERE status IN ('degraded', 'unhealthy')" in sql
 
 
 class TestHealthCleanup:
@@ -311,3 +674,39 @@ class TestHealthCleanup:
 
         assert deleted == 100
         mock_conn.commit.assert_called_once()
+
+    def test_cleanup_drops_expired_partitions(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test wholly expired partitions are dropped instead of deleted from."""
+        today = datetime.now(timezone.utc).date()
+        old_day = today - timedelta(days=30)
+        boundary_day = today - timedelta(days=7)
+        monkeypatch.setattr(health, "_partition_days", {TEST_DB_URL: {old_day, boundary_day}})
+
+        partitions = MagicMock()
+        partitions.__iter__ = MagicMock(
+            return_value=iter(
+                [
+                    (f"health_metrics_{old_day:%Y%m%d}", 5000),
+                    (f"health_metrics_{boundary_day:%Y%m%d}", 800),
+                    ("health_metrics_default", 0),
+                ]
+            )
+        )
+        delete_result = MagicMock()
+        delete_result.rowcount = 40
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.side_effect = [partitions, MagicMock(), delete_result]
+
+        mock_engine = MagicMock(url=TEST_DB_URL)
+        mock_engine.connect.return_value = mock_conn
+
+        deleted = cleanup_old_health_records(mock_engine, days=7)
+
+        assert deleted == 5040
+        drop_sql = str(mock_conn.execute.call_args_list[1][0][0])
+        assert drop_sql == f"DROP TABLE IF EXISTS analytics.health_metrics_{old_day:%Y%m%d}"
+        assert health._partition_days == {TEST_DB_URL: {boundary_day}}
+        mock_conn.commit.assert_called_once()
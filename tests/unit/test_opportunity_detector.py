@@ -4,6 +4,7 @@ from datetime import date, datetime, timezone
 
 import pytest
 
+from src.analytics import opportunity_detector
 from src.analytics.opportunity_detector import OpportunityDetector
 from src.shared.api.response_models import Market
 
@@ -127,6 +128,62 @@ class TestOpportunityDetector:
 
         assert len(result) == 2
 
+    def test_indexed_lookups_match_scans(
+        self, detector: OpportunityDetector, sample_markets: list[Market]
+    ) -> None:
+        """Test indexed city and keyword lookups return the same markets as scans."""
+        expected_city = detector.match_city_to_markets("nyc", sample_markets)
+        expected_query = detector.find_weather_markets("above 2", sample_markets)
+
+        detector.index(sample_markets)
+
+        assert detector.match_city_to_markets("nyc", sample_markets) == expected_city
+        assert detector.find_weather_markets("above 2", sample_markets) == expected_query
+        assert detector._city_index["chi"] == [1]
+        assert detector._keyword_index["above 2"] == [1]
+
+        # A different list bypasses the index
+        other = sample_markets[1:]
+        assert detector.match_city_to_markets("NYC", other) == []
+
+    def test_indexed_list_mutated_in_place(
+        self, detector: OpportunityDetector, sample_markets: list[Market]
+    ) -> None:
+        """Test in-place changes to the indexed list fall back to a scan."""
+        markets = list(sample_markets)
+        detector.index(markets)
+        chicago = detector.match_city_to_markets("chi", markets)
+
+        # Replacing an element must not serve the old market at that position
+        markets[1] = sample_markets[0]
+        assert detector.match_city_to_markets("chi", markets) == []
+
+        # Shrinking must not raise IndexError on stale positions
+        del markets[1:]
+        assert detector.match_city_to_markets("chi", markets) == []
+
+        # Appending must not hide the new market
+        markets.append(sample_markets[1])
+        assert detector.match_city_to_markets("chi", markets) == chicago
+
+    def test_keyword_index_is_bounded(
+        self,
+        detector: OpportunityDetector,
+        sample_markets: list[Market],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test free-text queries are not memoized without bound between refreshes."""
+        monkeypatch.setattr(opportunity_detector, "_INDEX_MAX_QUERIES", 3)
+        detector.index(sample_markets)
+
+        for i in range(10):
+            detector.find_weather_markets(f"query {i}", sample_markets)
+        assert len(detector._keyword_index) <= 3
+
+        # Lookups after a clear still match a scan
+        expected = [m for m in sample_markets if "above 2" in m.title.lower()]
+        assert detector.find_weather_markets("above 2", sample_markets) == expected
+
     def test_filter_by_date_range(
         self, detector: OpportunityDetector, sample_markets: list[Market]
     ) -> None:
@@ -170,6 +227,34 @@ class TestOpportunityDetector:
 
         assert len(result) == 0
 
+    def test_filter_by_date_range_inclusive_and_cached(
+        self, detector: OpportunityDetector
+    ) -> None:
+        """Test bounds are inclusive, order is kept, and dates are reused."""
+        markets = [
+            Market(
+                ticker=f"TEST-{day:02d}",
+                event_ticker="TEST",
+                title="Test",
+                status="open",
+                expiration_time=datetime(2026, 1, day, 23, 59, tzinfo=timezone.utc),
+            )
+            for day in (24, 25, 26, 27, 28)
+        ]
+        markets.insert(
+            2, Market(ticker="TEST-NONE", event_ticker="TEST", title="Test", status="open")
+        )
+
+        result = detector.filter_by_date_range(markets, date(2026, 1, 25), date(2026, 1, 27))
+        cached = detector._expiration_cache
+
+        assert [m.ticker for m in result] == ["TEST-25", "TEST-26", "TEST-27"]
+
+        detector.filter_by_date_range(markets, date(2026, 1, 24), date(2026, 1, 24))
+        assert detector._expiration_cache is cached
+
+        assert detector.filter_by_date_range([], date(2026, 1, 1), date(2026, 12, 31)) == []
+
     def test_calculate_market_relevance_score_high_liquidity(
         self, detector: OpportunityDetector, sample_markets: list[Market]
     ) -> None:
@@ -292,3 +377,87 @@ class TestOpportunityDetector:
         opportunities = detector.detect_opportunities(weather, [])
 
         assert len(opportunities) == 0
+
+    def test_detect_opportunities_matches_scalar_scores(
+        self, detector: OpportunityDetector
+    ) -> None:
+        """Test batch scores equal the per-market relevance score."""
+        markets = [
+            Market(ticker="A", event_ticker="E", title="A", status="open",
+                   volume=500, open_interest=100, yes_bid=40, yes_ask=42),
+            Market(ticker="B", event_ticker="E", title="B", status="open",
+                   volume=2000, open_interest=0),
+            Market(ticker="C", event_ticker="E", title="C", status="closed",
+                   volume=900, open_interest=50, yes_bid=10, yes_ask=18),
+            Market(ticker="D", event_ticker="E", title="D", status="open",
+                   volume=0, open_interest=0, yes_bid=50, yes_ask=49),
+        ]
+
+        opportunities = detector.detect_opportunities({}, markets)
+
+        # Fresh detector so the scalar path does not read the batch's cache
+        scalar = OpportunityDetector()
+        expected = sorted(
+            (
+                (m, scalar.calculate_market_relevance_score(m, {}))
+                for m in markets
+            ),
+            key=lambda x: x[1],
+            reverse=True,
+        )
+        expected = [(m, score) for m, score in expected if score >= 0.3]
+        assert [(m.ticker, score) for m, score in opportunities] == [
+            (m.ticker, score) for m, score in expected
+        ]
+
+    def test_detect_opportunities_top_k(self, detector: OpportunityDetector) -> None:
+        """Test top_k returns the head of the full ranking, ties in input order."""
+        markets = [
+            Market(ticker=f"M{i}", event_ticker="E", title="M", status="open",
+                   volume=volume, open_interest=0)
+            for i, volume in enumerate([100, 900, 400, 900, 0, 1500])
+        ]
+
+        ranked = detector.detect_opportunities({}, markets)
+        top = detector.detect_opportunities({}, markets, top_k=3)
+
+        assert [m.ticker for m, _ in top] == ["M5", "M1", "M3"]
+        assert top == ranked[:3]
+        assert detector.detect_opportunities({}, markets, top_k=0) == []
+        assert detector.detect_opportunities({}, markets, top_k=50) == ranked
+
+    def test_scores_follow_market_changes(self, detector: OpportunityDetector) -> None:
+        """Test a changed market snapshot is rescored rather than served a stale score."""
+        market = Market(ticker="M1", event_ticker="E", title="M", status="open",
+                        volume=1000, open_interest=0)
+
+        assert detector.detect_opportunities({}, [market])[0][1] == pytest.approx(0.7)
+
+        # Same ticker, now closed: no refresh_markets needed for a fresh score
+        closed = market.model_copy(update={"status": "closed"})
+        assert detector.calculate_market_relevance_score(closed, {}) == pytest.approx(0.4)
+        assert detector.detect_opportunities({}, [closed])[0][1] == pytest.approx(0.4)
+
+        # Markets with identical inputs share one cache entry
+        twin = market.model_copy(update={"ticker": "M2"})
+        detector.detect_opportunities({}, [market, twin])
+        assert len(detector._score_cache) == 2
+
+    def test_score_cache_is_bounded(
+        self, detector: OpportunityDetector, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the score cache is cleared instead of growing without bound."""
+        monkeypatch.setattr(opportunity_detector, "_SCORE_CACHE_MAX_ENTRIES", 3)
+        markets = [
+            Market(ticker=f"M{i}", event_ticker="E", title="M", status="open",
+                   volume=i, open_interest=0)
+            for i in range(5)
+        ]
+
+        for market in markets:
+            detector.calculate_market_relevance_score(market, {})
+        assert len(detector._score_cache) <= 3
+
+        detector.detect_opportunities({}, markets[:2])
+        detector.detect_opportunities({}, markets[2:])
+        assert len(detector._score_cache) <= 3
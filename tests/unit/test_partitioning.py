@@ -0,0 +1,100 @@
+"""Unit tests for converting plain analytics tables to partitioned ones."""
+
+from typing import Any
+from unittest.mock import MagicMock
+
+from src.analytics import partitioning
+from src.analytics.partitioning import copy_legacy_rows, retire_plain_table
+
+
+def make_conn(results: dict[Any, Any]) -> MagicMock:
+    """Connection whose execute() answers each catalog query from ``results``."""
+    conn = MagicMock()
+
+    def execute(statement: Any, params: Any = None) -> MagicMock:
+        result = MagicMock()
+        value = results.get(statement)
+        result.scalar.return_value = value
+        result.scalars.return_value.all.return_value = value or []
+        result.all.return_value = value or []
+        return result
+
+    conn.execute.side_effect = execute
+    return conn
+
+
+def script(conn: MagicMock) -> list[str]:
+    """Statements sent through exec_driver_sql, in order."""
+    return [c[0][0] for c in conn.exec_driver_sql.call_args_list]
+
+
+class TestRetirePlainTable:
+    """Tests for retire_plain_table."""
+
+    def test_partitioned_table_left_alone(self) -> None:
+        """Test an already partitioned table is not touched."""
+        conn = make_conn({partitioning.TABLE_RELKIND_SQL: "p"})
+
+        assert retire_plain_table(conn, "health_metrics") is False
+        conn.exec_driver_sql.assert_not_called()
+
+    def test_missing_table_left_alone(self) -> None:
+        """Test a fresh database needs no conversion."""
+        conn = make_conn({})
+
+        assert retire_plain_table(conn, "health_metrics") is False
+        conn.exec_driver_sql.assert_not_called()
+
+    def test_plain_table_renamed_and_names_freed(self) -> None:
+        """Test a plain table is renamed and its sequence, keys, and indexes released."""
+        conn = make_conn({
+            partitioning.TABLE_RELKIND_SQL: "r",
+            partitioning.SERIAL_SEQUENCE_SQL: "analytics.health_metrics_id_seq",
+            partitioning.TABLE_KEY_CONSTRAINTS_SQL: ["health_metrics_pkey"],
+            partitioning.TABLE_PLAIN_INDEXES_SQL: ["analytics.idx_health_metrics_status"],
+        })
+
+        assert retire_plain_table(conn, "health_metrics") is True
+        assert script(conn) == [
+            "ALTER TABLE analytics.health_metrics RENAME TO health_metrics_legacy",
+            "ALTER SEQUENCE analytics.health_metrics_id_seq "
+            "RENAME TO health_metrics_legacy_id_seq",
+            'ALTER TABLE analytics.health_metrics_legacy DROP CONSTRAINT "health_metrics_pkey"',
+            "DROP INDEX analytics.idx_health_metrics_status",
+        ]
+
+    def test_dependent_views_dropped_before_rename(self) -> None:
+        """Test views on the plain table are dropped so they cannot pin the legacy table."""
+        conn = make_conn({
+            partitioning.TABLE_RELKIND_SQL: "r",
+            partitioning.DEPENDENT_VIEWS_SQL: [
+                ("analytics.v_current_health", "v"),
+                ("analytics.mv_health_daily", "m"),
+            ],
+        })
+
+        assert retire_plain_table(conn, "health_metrics") is True
+        assert script(conn)[:3] == [
+            "DROP VIEW IF EXISTS analytics.v_current_health CASCADE",
+            "DROP MATERIALIZED VIEW IF EXISTS analytics.mv_health_daily CASCADE",
+            "ALTER TABLE analytics.health_metrics RENAME TO health_metrics_legacy",
+        ]
+
+
+class TestCopyLegacyRows:
+    """Tests for copy_legacy_rows."""
+
+    def test_copies_shared_columns_then_drops_legacy(self) -> None:
+        """Test rows move over on shared columns and the legacy table is dropped."""
+        conn = make_conn({partitioning.SHARED_COLUMNS_SQL: ["status", "id", "checked_at"]})
+        conn.exec_driver_sql.return_value.rowcount = 12
+
+        assert copy_legacy_rows(conn, "health_metrics") == 12
+
+        insert, setval, drop = script(conn)
+        assert insert == (
+            'INSERT INTO analytics.health_metrics ("checked_at", "id", "status") '
+            'SELECT "checked_at", "id", "status" FROM analytics.health_metrics_legacy'
+        )
+        assert "setval(pg_get_serial_sequence('analytics.health_metrics', 'id')" in setval
+        assert drop == "DROP TABLE analytics.health_metrics_legacy"
@@ -199,6 +199,20 @@ class TestMarket:
 
         assert market.mid_price is None
 
+    def test_market_search_text(self) -> None:
+        """Test lowercase search projections of market identifiers."""
+        market = Market(
+            ticker="HIGHNYC-26JAN28",
+            event_ticker="HIGHNYC",
+            title="NYC High Temperature",
+            status="open",
+        )
+
+        assert market.ticker_search_text == "highnyc-26jan28\nhighnyc"
+        assert "temperature" in market.search_text
+        assert "temperature" not in market.ticker_search_text
+        assert "search_text" not in market.model_dump()
+
 
 class TestOrderbookLevel:
     """Test suite for OrderbookLevel model."""
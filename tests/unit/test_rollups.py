@@ -5,24 +5,37 @@ Tests the rollup table creation and metric aggregation functions.
 
 from datetime import date, datetime, timezone
 from decimal import Decimal
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.analytics import rollups
 from src.analytics.rollups import (
     CityMetrics,
     EquityCurvePoint,
     StrategyMetrics,
+    backfill_rollups_from_scratch,
     create_rollup_tables,
+    ensure_monthly_partition,
     get_city_metrics,
+    get_city_metrics_with_summary,
     get_equity_curve,
     get_strategy_metrics,
+    get_strategy_metrics_with_summary,
+    iter_equity_curve,
     run_daily_rollups,
     update_city_metrics,
+    update_city_metrics_many,
+    update_city_metrics_range,
     update_equity_curve,
+    update_equity_curve_range,
     update_strategy_metrics,
 )
 
+# Engine URL the partition caches are keyed by in these tests
+TEST_DB_URL = "postgresql://milkbot@localhost/milkbot_test"
+
 
 class TestCityMetrics:
     """Tests for CityMetrics dataclass."""
@@ -182,23 +195,31 @@ class TestEquityCurvePoint:
         assert point.ending_equity == Decimal("5150.00")
 
 
+    def test_rollup_dataclasses_use_slots(self) -> None:
+        """Test rollup dataclasses are slotted (no per-instance __dict__)."""
+        for cls in (CityMetrics, StrategyMetrics, EquityCurvePoint):
+            assert "__slots__" in vars(cls)
+            assert "__dict__" not in vars(cls)
+
+
 class TestRollupTableCreation:
     """Tests for rollup table creation."""
 
     def test_create_rollup_tables(self) -> None:
-        """Test creating all rollup tables."""
+        """Test creating all rollup tables in one transaction."""
         mock_conn = MagicMock()
         mock_conn.__enter__ = MagicMock(return_value=mock_conn)
         mock_conn.__exit__ = MagicMock(return_value=False)
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        mock_engine.begin.return_value = mock_conn
 
         create_rollup_tables(mock_engine)
 
-        # Should have executed SQL statements
-        assert mock_conn.execute.called
-        assert mock_conn.commit.called
+        # One multi-statement script, committed by engine.begin()
+        mock_engine.begin.assert_called_once()
+        mock_engine.connect.assert_not_called()
+        mock_conn.exec_driver_sql.assert_called_once()
 
     def test_create_rollup_tables_creates_schema(self) -> None:
         """Test that rollup table creation creates analytics schema."""
@@ -207,15 +228,153 @@ class TestRollupTableCreation:
         mock_conn.__exit__ = MagicMock(return_value=False)
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        mock_engine.begin.return_value = mock_conn
 
         create_rollup_tables(mock_engine)
 
-        # First call should create schema
-        calls = mock_conn.execute.call_args_list
-        assert len(calls) > 0
+        # Script should create the schema before the tables
+        script = mock_conn.exec_driver_sql.call_args[0][0]
+        assert script.startswith("CREATE SCHEMA IF NOT EXISTS analytics;")
+        assert "analytics.city_metrics_daily" in script
+        assert "analytics.strategy_metrics_daily" in script
+        assert "analytics.equity_curve_daily" in script
+
+    def test_create_rollup_tables_leaves_trades_schema_alone(self) -> None:
+        """Test trades columns, triggers, and indexes are left to the migrations."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
+
+        create_rollup_tables(mock_engine)
+
+        script = mock_conn.exec_driver_sql.call_args[0][0]
+        assert "ALTER TABLE trades" not in script
+        assert "TRIGGER" not in script
+        assert "UPDATE trades" not in script
+        assert "ON trades" not in script
 
 
+class TestRollupPartitions:
+    """Tests for monthly partitioning of the rollup tables."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_partition_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Isolate the per-process partition cache."""
+        monkeypatch.setattr(rollups, "_partition_months", {})
+
+    @staticmethod
+    def _mock_engine() -> tuple[MagicMock, MagicMock]:
+        """Build an engine whose transactions all use one mock connection."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value.rowcount = 1
+
+        mock_engine = MagicMock(url=TEST_DB_URL)
+        mock_engine.begin.return_value = mock_conn
+        return mock_engine, mock_conn
+
+    def test_create_rollup_tables_partitions_by_month(self) -> None:
+        """Test tables are range-partitioned and this month's partitions exist."""
+        mock_engine, mock_conn = self._mock_engine()
+        month = datetime.now(timezone.utc).date().replace(day=1)
+
+        create_rollup_tables(mock_engine)
+
+        script = mock_conn.exec_driver_sql.call_args[0][0]
+        assert script.count("PARTITION BY RANGE (date)") == 3
+        assert f"city_metrics_daily_y{month:%Y}m{month:%m}" in script
+        assert rollups._partition_months == {TEST_DB_URL: {month}}
+
+    def test_create_rollup_tables_converts_plain_tables(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test pre-partitioning tables are replaced with their rows in one transaction."""
+        mock_engine, mock_conn = self._mock_engine()
+        mock_conn.execute.return_value.scalars.return_value.all.return_value = [
+            date(2025, 11, 1)
+        ]
+        copy = MagicMock()
+        monkeypatch.setattr(
+            rollups, "retire_plain_table", lambda conn, table: table == "city_metrics_daily"
+        )
+        monkeypatch.setattr(rollups, "copy_legacy_rows", copy)
+
+        create_rollup_tables(mock_engine)
+
+        months_sql = str(mock_conn.execute.call_args[0][0])
+        assert "FROM analytics.city_metrics_daily_legacy" in months_sql
+        assert "strategy_metrics_daily_legacy" not in months_sql
+        # Partitions for the legacy months exist before the rows are copied
+        ddl = mock_conn.exec_driver_sql.call_args[0][0]
+        assert "analytics.city_metrics_daily_y2025m11 PARTITION OF" in ddl
+        copy.assert_called_once_with(mock_conn, "city_metrics_daily")
+        mock_engine.begin.assert_called_once()
+
+    def test_update_creates_partitions_for_range(self) -> None:
+        """Test every month in the range is created once, in the same transaction."""
+        mock_engine, mock_conn = self._mock_engine()
+
+        update_city_metrics_range(mock_engine, date(2025, 12, 31), date(2026, 2, 1))
+        update_city_metrics_range(mock_engine, date(2026, 1, 5), date(2026, 1, 6))
+
+        mock_conn.exec_driver_sql.assert_called_once()
+        ddl = mock_conn.exec_driver_sql.call_args[0][0]
+        assert (
+            "analytics.equity_curve_daily_y2025m12 PARTITION OF analytics.equity_curve_daily "
+            "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')"
+        ) in ddl
+        assert "strategy_metrics_daily_y2026m01" in ddl
+        assert "city_metrics_daily_y2026m02" in ddl
+        assert rollups._partition_months == {
+            TEST_DB_URL: {date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1)}
+        }
+
+    def test_caller_connection_partitions_are_not_cached(self) -> None:
+        """Test DDL on a caller's uncommitted transaction is not remembered."""
+        mock_engine, _ = self._mock_engine()
+        mock_conn = MagicMock()
+
+        update_city_metrics(mock_engine, date(2026, 3, 4), conn=mock_conn)
+
+        mock_conn.exec_driver_sql.assert_called_once()
+        assert rollups._partition_months == {TEST_DB_URL: set()}
+
+    def test_ensure_monthly_partition(self) -> None:
+        """Test partitions are created in their own transaction and cached."""
+        mock_engine, mock_conn = self._mock_engine()
+
+        ensure_monthly_partition(mock_engine, date(2026, 4, 17))
+        ensure_monthly_partition(mock_engine, date(2026, 4, 30))
+
+        mock_conn.exec_driver_sql.assert_called_once()
+        assert "FROM ('2026-04-01') TO ('2026-05-01')" in mock_conn.exec_driver_sql.call_args[0][0]
+        assert rollups._partition_months == {TEST_DB_URL: {date(2026, 4, 1)}}
+
+    def test_partition_cache_is_per_database(self) -> None:
+        """Test months created in one database are still created in another."""
+        mock_engine, mock_conn = self._mock_engine()
+        other_engine = MagicMock(url="postgresql://milkbot@localhost/milkbot_other")
+        other_engine.begin.return_value = mock_conn
+
+        ensure_monthly_partition(mock_engine, date(2026, 4, 17))
+        ensure_monthly_partition(other_engine, date(2026, 4, 17))
+
+        assert mock_conn.exec_driver_sql.call_count == 2
+
+    def test_create_rollup_tables_forgets_dropped_partitions(self) -> None:
+        """Test re-creating the tables drops months cached before the re-create."""
+        mock_engine, mock_conn = self._mock_engine()
+        ensure_monthly_partition(mock_engine, date(2020, 4, 17))
+
+        create_rollup_tables(mock_engine)
+        ensure_monthly_partition(mock_engine, date(2020, 4, 17))
+
+        assert "FROM ('2020-04-01') TO ('2020-05-01')" in mock_conn.exec_driver_sql.call_args[0][0]
+
 class TestCityMetricsRollup:
     """Tests for city metrics rollup functions."""
 
@@ -230,14 +389,115 @@ class TestCityMetricsRollup:
         mock_conn.execute.return_value = mock_result
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        mock_engine.begin.return_value = mock_conn
 
         target_date = date(2026, 1, 28)
         affected = update_city_metrics(mock_engine, target_date)
 
         assert affected == 3
         mock_conn.execute.assert_called_once()
-        mock_conn.commit.assert_called_once()
+        mock_engine.begin.assert_called_once()
+
+    def test_update_city_metrics_recomputes_day(self) -> None:
+        """Test every trade on the day is re-aggregated and replaces the stored totals."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value.rowcount = 1
+
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
+
+        update_city_metrics(mock_engine, date(2026, 1, 28))
+
+        sql = str(mock_conn.execute.call_args[0][0])
+        assert "last_seen_trade_id" not in sql
+        assert "LEFT JOIN analytics.city_metrics_daily" not in sql
+        assert "trade_count = EXCLUDED.trade_count" in sql
+        assert "net_pnl = EXCLUDED.net_pnl" in sql
+
+    def test_update_city_metrics_range(self) -> None:
+        """Test a date range is aggregated by city and date in one statement."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value.rowcount = 30
+
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
+
+        affected = update_city_metrics_range(mock_engine, date(2026, 1, 1), date(2026, 1, 3))
+
+        assert affected == 30
+        mock_conn.execute.assert_called_once()
+        sql = str(mock_conn.execute.call_args[0][0])
+        assert "CAST(executed_at AS date) AS trade_date" in sql
+        assert "GROUP BY t.city_code, t.trade_date" in sql
+        assert "JOIN markets" not in sql
+        assert mock_conn.execute.call_args[0][1] == {
+            "start_date": date(2026, 1, 1),
+            "end_date": date(2026, 1, 3),
+        }
+
+    def test_update_city_metrics_many(self) -> None:
+        """Test scattered dates are sent as one executemany of the day upsert."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value.rowcount = 6
+
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
+
+        dates = [date(2026, 1, 28), date(2026, 1, 3), date(2026, 1, 28)]
+        affected = update_city_metrics_many(mock_engine, dates, rebuild=True)
+
+        assert affected == 6
+        expected = [
+            {"start_date": date(2026, 1, 3), "end_date": date(2026, 1, 3)},
+            {"start_date": date(2026, 1, 28), "end_date": date(2026, 1, 28)},
+        ]
+        delete_call, upsert_call = mock_conn.execute.call_args_list
+        assert delete_call[0][1] == expected
+        assert upsert_call[0][1] == expected
+        mock_engine.begin.assert_called_once()
+
+    def test_update_city_metrics_many_empty(self) -> None:
+        """Test no dates means no database work."""
+        mock_engine = MagicMock()
+
+        assert update_city_metrics_many(mock_engine, []) == 0
+        mock_engine.begin.assert_not_called()
+
+    def test_update_city_metrics_reuses_statement(self) -> None:
+        """Test repeated calls execute the same prebuilt statement object."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.rowcount = 1
+        mock_engine = MagicMock()
+
+        update_city_metrics(mock_engine, date(2026, 1, 28), conn=mock_conn)
+        update_city_metrics(mock_engine, date(2026, 1, 29), conn=mock_conn)
+
+        first, second = mock_conn.execute.call_args_list
+        assert first[0][0] is second[0][0]
+
+    def test_update_city_metrics_rebuild(self) -> None:
+        """Test rebuild clears the day's rows before re-aggregating."""
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value.rowcount = 2
+
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
+
+        affected = update_city_metrics(mock_engine, date(2026, 1, 28), rebuild=True)
+
+        assert affected == 2
+        delete_call, upsert_call = mock_conn.execute.call_args_list
+        assert str(delete_call[0][0]).startswith("DELETE FROM analytics.city_metrics_daily")
+        assert "INSERT INTO analytics.city_metrics_daily" in str(upsert_call[0][0])
+        mock_engine.begin.assert_called_once()
 
     def test_update_city_metrics_defaults_to_today(self) -> None:
         """Test update_city_metrics defaults to today's date."""
@@ -250,7 +510,7 @@ class TestCityMetricsRollup:
         mock_conn.execute.return_value = mock_result
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        mock_engine.begin.return_value = mock_conn
 
         # Call without target_date
         affected = update_city_metrics(mock_engine)
@@ -258,6 +518,20 @@ class TestCityMetricsRollup:
         assert affected == 0
         mock_conn.execute.assert_called_once()
 
+    def test_update_city_metrics_uses_given_connection(self) -> None:
+        """Test a caller-supplied connection is used without opening or committing."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.rowcount = 1
+        mock_engine = MagicMock()
+
+        affected = update_city_metrics(mock_engine, date(2026, 1, 28), conn=mock_conn)
+
+        assert affected == 1
+        mock_conn.execute.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        mock_engine.begin.assert_not_called()
+        mock_engine.connect.assert_not_called()
+
     def test_get_city_metrics_all(self) -> None:
         """Test querying all city metrics."""
         mock_row = MagicMock()
@@ -308,6 +582,71 @@ class TestCityMetricsRollup:
 
         assert len(metrics) == 1
 
+    def test_get_city_metrics_projects_columns(self) -> None:
+        """Test readers select named columns instead of SELECT *."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.__iter__ = MagicMock(return_value=iter([]))
+        mock_engine = MagicMock()
+
+        get_city_metrics(mock_engine, conn=mock_conn)
+        default_sql = str(mock_conn.execute.call_args[0][0])
+        get_city_metrics(mock_engine, conn=mock_conn, columns=["date", "net_pnl"])
+        projected_sql = str(mock_conn.execute.call_args[0][0])
+
+        assert "SELECT *" not in default_sql
+        assert "last_seen_trade_id" not in default_sql
+        assert "city_code, date, trade_count" in default_sql
+        assert projected_sql.startswith("SELECT date, net_pnl FROM")
+
+    def test_get_city_metrics_rejects_unknown_columns(self) -> None:
+        """Test caller-specified columns are checked before reaching SQL."""
+        mock_engine = MagicMock()
+
+        with pytest.raises(ValueError, match="Invalid columns"):
+            get_city_metrics(mock_engine, columns=["date", "1; DROP TABLE trades"])
+        with pytest.raises(ValueError, match="Invalid columns"):
+            get_city_metrics(mock_engine, columns=[])
+        mock_engine.connect.assert_not_called()
+
+    def test_get_city_metrics_with_summary(self) -> None:
+        """Test querying limited city metrics with SQL-side totals."""
+        mock_row = MagicMock()
+        mock_row._mapping = {"city_code": "NYC", "trade_count": 5}
+
+        mock_rows_result = MagicMock()
+        mock_rows_result.__iter__ = MagicMock(return_value=iter([mock_row]))
+
+        mock_totals_row = MagicMock()
+        mock_totals_row._mapping = {
+            "row_count": 3,
+            "net_pnl": Decimal("25.00"),
+            "trade_count": 12,
+            "win_count": 7,
+            "loss_count": 5,
+        }
+        mock_totals_result = MagicMock()
+        mock_totals_result.one.return_value = mock_totals_row
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.side_effect = [mock_rows_result, mock_totals_result]
+
+        mock_engine = MagicMock()
+        mock_engine.connect.return_value = mock_conn
+
+        rows, totals = get_city_metrics_with_summary(mock_engine, city_code="NYC", limit=1)
+
+        assert rows == [{"city_code": "NYC", "trade_count": 5}]
+        assert totals["row_count"] == 3
+        assert totals["trade_count"] == 12
+
+        rows_sql = str(mock_conn.execute.call_args_list[0][0][0])
+        totals_sql = str(mock_conn.execute.call_args_list[1][0][0])
+        assert "LIMIT :limit" in rows_sql
+        assert "SUM(net_pnl)" in totals_sql
+        assert "city_code = :city_code" in totals_sql
+
 
 class TestStrategyMetricsRollup:
     """Tests for strategy metrics rollup functions."""
@@ -323,13 +662,16 @@ class TestStrategyMetricsRollup:
         mock_conn.execute.return_value = mock_result
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        mock_engine.begin.return_value = mock_conn
 
         target_date = date(2026, 1, 28)
         affected = update_strategy_metrics(mock_engine, target_date)
 
         assert affected == 2
         mock_conn.execute.assert_called_once()
+        sql = str(mock_conn.execute.call_args[0][0])
+        assert "last_seen_trade_id" not in sql
+        assert "gross_pnl = EXCLUDED.gross_pnl" in sql
 
     def test_update_strategy_metrics_defaults_to_today(self) -> None:
         """Test update_strategy_metrics defaults to today's date."""
@@ -342,7 +684,7 @@ class TestStrategyMetricsRollup:
         mock_conn.execute.return_value = mock_result
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        mock_engine.begin.return_value = mock_conn
 
         # Call without target_date
         affected = update_strategy_metrics(mock_engine)
@@ -395,128 +737,130 @@ class TestStrategyMetricsRollup:
         assert len(metrics) == 0
         mock_conn.execute.assert_called_once()
 
-
-class TestEquityCurveRollup:
-    """Tests for equity curve rollup functions."""
-
-    def test_update_equity_curve_first_day(self) -> None:
-        """Test updating equity curve for first day (no previous)."""
-        # Mock for previous day query (no results)
-        mock_prev_result = MagicMock()
-        mock_prev_result.fetchone.return_value = None
-
-        # Mock for daily P&L query
-        mock_pnl_result = MagicMock()
-        mock_pnl_result.fetchone.return_value = (Decimal("100.00"),)
+    def test_get_strategy_metrics_with_summary(self) -> None:
+        """Test querying strategy metrics with SQL-side totals."""
+        mock_rows_result = MagicMock()
+        mock_rows_result.__iter__ = MagicMock(return_value=iter([]))
+
+        mock_totals_row = MagicMock()
+        mock_totals_row._mapping = {
+            "row_count": 0,
+            "net_pnl": 0,
+            "trade_count": 0,
+            "signal_count": 0,
+        }
+        mock_totals_result = MagicMock()
+        mock_totals_result.one.return_value = mock_totals_row
 
         mock_conn = MagicMock()
         mock_conn.__enter__ = MagicMock(return_value=mock_conn)
         mock_conn.__exit__ = MagicMock(return_value=False)
-
-        # Return different results for different queries
-        mock_conn.execute.side_effect = [mock_prev_result, mock_pnl_result, MagicMock()]
+        mock_conn.execute.side_effect = [mock_rows_result, mock_totals_result]
 
         mock_engine = MagicMock()
         mock_engine.connect.return_value = mock_conn
 
-        result = update_equity_curve(mock_engine, date(2026, 1, 28))
-
-        assert result is True
-        assert mock_conn.commit.called
-
-    def test_update_equity_curve_defaults_to_today(self) -> None:
-        """Test update_equity_curve defaults to today's date."""
-        mock_prev_result = MagicMock()
-        mock_prev_result.fetchone.return_value = None
-
-        mock_pnl_result = MagicMock()
-        mock_pnl_result.fetchone.return_value = (Decimal("0"),)
-
-        mock_conn = MagicMock()
-        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
-        mock_conn.__exit__ = MagicMock(return_value=False)
-        mock_conn.execute.side_effect = [mock_prev_result, mock_pnl_result, MagicMock()]
-
-        mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        rows, totals = get_strategy_metrics_with_summary(mock_engine)
 
-        # Call without target_date
-        result = update_equity_curve(mock_engine)
+        assert rows == []
+        assert totals["signal_count"] == 0
+        assert "LIMIT" not in str(mock_conn.execute.call_args_list[0][0][0])
 
-        assert result is True
 
-    def test_update_equity_curve_no_pnl_row(self) -> None:
-        """Test update_equity_curve handles no P&L row."""
-        mock_prev_result = MagicMock()
-        mock_prev_result.fetchone.return_value = None
+class TestEquityCurveRollup:
+    """Tests for equity curve rollup functions."""
 
-        mock_pnl_result = MagicMock()
-        mock_pnl_result.fetchone.return_value = None  # No trades
+    @staticmethod
+    def _mock_engine(rows: list[tuple[Any, ...]]) -> tuple[MagicMock, MagicMock]:
+        """Build an engine whose equity upsert returns ``rows``."""
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = rows
 
         mock_conn = MagicMock()
         mock_conn.__enter__ = MagicMock(return_value=mock_conn)
         mock_conn.__exit__ = MagicMock(return_value=False)
-        mock_conn.execute.side_effect = [mock_prev_result, mock_pnl_result, MagicMock()]
+        mock_conn.execute.return_value = mock_result
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        mock_engine.begin.return_value = mock_conn
+        return mock_engine, mock_conn
+
+    def test_update_equity_curve_first_day(self) -> None:
+        """Test updating equity curve runs a single statement for the day."""
+        mock_engine, mock_conn = self._mock_engine(
+            [
+                (
+                    date(2026, 1, 28),
+                    Decimal("100.00"),
+                    Decimal("1092.10"),
+                    Decimal("0"),
+                    Decimal("1092.10"),
+                )
+            ]
+        )
 
         result = update_equity_curve(mock_engine, date(2026, 1, 28))
 
         assert result is True
+        lock_call, upsert_call = mock_conn.execute.call_args_list
+        assert "pg_advisory_xact_lock" in str(lock_call[0][0])
+        assert "INSERT INTO analytics.equity_curve_daily" in str(upsert_call[0][0])
+        mock_engine.begin.assert_called_once()
+        params = mock_conn.execute.call_args[0][1]
+        assert params["start_date"] == date(2026, 1, 28)
+        assert params["end_date"] == date(2026, 1, 28)
+        assert params["initial_equity"] == Decimal("992.10")
 
-    def test_update_equity_curve_with_drawdown(self) -> None:
-        """Test update_equity_curve calculates drawdown correctly."""
-        # Previous day had higher equity (creates drawdown)
-        mock_prev_result = MagicMock()
-        mock_prev_result.fetchone.return_value = (
-            Decimal("5200.00"),  # ending_equity
-            Decimal("200.00"),   # cumulative_pnl
-            Decimal("5200.00"),  # high_water_mark
+    def test_update_equity_curve_defaults_to_today(self) -> None:
+        """Test update_equity_curve defaults to today's date."""
+        today = datetime.now(timezone.utc).date()
+        mock_engine, mock_conn = self._mock_engine(
+            [(today, Decimal("0"), Decimal("992.10"), Decimal("0"), Decimal("992.10"))]
         )
 
-        # Today has a loss
-        mock_pnl_result = MagicMock()
-        mock_pnl_result.fetchone.return_value = (Decimal("-100.00"),)
-
-        mock_conn = MagicMock()
-        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
-        mock_conn.__exit__ = MagicMock(return_value=False)
-        mock_conn.execute.side_effect = [mock_prev_result, mock_pnl_result, MagicMock()]
-
-        mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
-
-        result = update_equity_curve(mock_engine, date(2026, 1, 29))
+        # Call without target_date
+        result = update_equity_curve(mock_engine)
 
         assert result is True
+        assert mock_conn.execute.call_args[0][1]["start_date"] == today
 
-    def test_update_equity_curve_with_previous(self) -> None:
-        """Test updating equity curve with previous day data."""
-        # Mock for previous day query (has data)
-        mock_prev_result = MagicMock()
-        mock_prev_result.fetchone.return_value = (
-            Decimal("5100.00"),  # ending_equity
-            Decimal("100.00"),   # cumulative_pnl
-            Decimal("5100.00"),  # high_water_mark
-        )
-
-        # Mock for daily P&L query
-        mock_pnl_result = MagicMock()
-        mock_pnl_result.fetchone.return_value = (Decimal("50.00"),)
-
-        mock_conn = MagicMock()
-        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
-        mock_conn.__exit__ = MagicMock(return_value=False)
+    def test_update_equity_curve_no_rows(self) -> None:
+        """Test update_equity_curve reports False when nothing was written."""
+        mock_engine, _ = self._mock_engine([])
 
-        mock_conn.execute.side_effect = [mock_prev_result, mock_pnl_result, MagicMock()]
+        result = update_equity_curve(mock_engine, date(2026, 1, 28))
 
-        mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        assert result is False
+
+    def test_update_equity_curve_range(self) -> None:
+        """Test a multi-day range is computed in one windowed statement."""
+        hwm = Decimal("5100.00")
+        mock_engine, mock_conn = self._mock_engine(
+            [
+                (date(2026, 1, 28), Decimal("100.00"), Decimal("5100.00"), Decimal("0"), hwm),
+                (date(2026, 1, 29), Decimal("-100.00"), Decimal("5000.00"), Decimal("1.96"), hwm),
+                (date(2026, 1, 30), Decimal("0"), Decimal("5000.00"), Decimal("1.96"), hwm),
+            ]
+        )
 
-        result = update_equity_curve(mock_engine, date(2026, 1, 29))
+        count = update_equity_curve_range(
+            mock_engine, date(2026, 1, 28), date(2026, 1, 30), Decimal("5000.00")
+        )
 
-        assert result is True
+        assert count == 3
+        # Advisory lock, then the single windowed upsert
+        assert mock_conn.execute.call_count == 2
+        mock_engine.begin.assert_called_once()
+        sql = str(mock_conn.execute.call_args[0][0])
+        assert "generate_series" in sql
+        assert "LAG(ending_equity, 1, base_equity)" in sql
+        assert "MAX(ending_equity) OVER" in sql
+        assert "WHERE date < CAST(:start_date AS date)" in sql
+        assert mock_conn.execute.call_args[0][1] == {
+            "start_date": date(2026, 1, 28),
+            "end_date": date(2026, 1, 30),
+            "initial_equity": Decimal("5000.00"),
+        }
 
     def test_get_equity_curve(self) -> None:
         """Test querying equity curve."""
@@ -543,6 +887,48 @@ class TestEquityCurveRollup:
         assert len(curve) == 1
         assert curve[0]["daily_pnl"] == Decimal("150.00")
 
+    def test_iter_equity_curve_streams(self) -> None:
+        """Test the equity curve is streamed through a server-side cursor."""
+        rows = []
+        for day in (28, 29):
+            mock_row = MagicMock()
+            mock_row._mapping = {"date": date(2026, 1, day)}
+            rows.append(mock_row)
+
+        mock_result = MagicMock()
+        mock_result.__iter__ = MagicMock(return_value=iter(rows))
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.return_value = mock_result
+
+        mock_engine = MagicMock()
+        mock_engine.connect.return_value = mock_conn
+
+        curve = iter_equity_curve(mock_engine, chunk_size=100)
+        mock_engine.connect.assert_not_called()
+
+        assert next(curve) == {"date": date(2026, 1, 28)}
+        assert mock_conn.execute.call_args[1]["execution_options"] == {
+            "stream_results": True,
+            "yield_per": 100,
+        }
+        assert [point["date"] for point in curve] == [date(2026, 1, 29)]
+        mock_conn.__exit__.assert_called_once()
+
+    def test_get_equity_curve_uses_given_connection(self) -> None:
+        """Test reads can share the caller's connection."""
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.__iter__ = MagicMock(return_value=iter([]))
+        mock_engine = MagicMock()
+
+        curve = get_equity_curve(mock_engine, conn=mock_conn)
+
+        assert curve == []
+        mock_conn.execute.assert_called_once()
+        mock_engine.connect.assert_not_called()
+
     def test_get_equity_curve_with_date_filters(self) -> None:
         """Test querying equity curve with date filters."""
         mock_result = MagicMock()
@@ -591,71 +977,114 @@ class TestEquityCurveEdgeCases:
 
         assert len(curve) == 0
 
-    def test_update_equity_curve_with_zero_pnl(self) -> None:
-        """Test update_equity_curve when daily P&L is exactly zero."""
-        mock_prev_result = MagicMock()
-        mock_prev_result.fetchone.return_value = (
-            Decimal("5000.00"),
-            Decimal("0"),
-            Decimal("5000.00"),
-        )
 
-        mock_pnl_result = MagicMock()
-        mock_pnl_result.fetchone.return_value = (Decimal("0"),)  # Zero P&L
+class TestDailyRollups:
+    """Tests for combined daily rollup function."""
+
+    @staticmethod
+    def _mock_engine(counts: dict[str, int]) -> tuple[MagicMock, MagicMock]:
+        """Build an engine whose fused rollup statement returns ``counts``."""
+        mock_row = MagicMock()
+        mock_row._mapping = counts
 
         mock_conn = MagicMock()
         mock_conn.__enter__ = MagicMock(return_value=mock_conn)
         mock_conn.__exit__ = MagicMock(return_value=False)
-        mock_conn.execute.side_effect = [mock_prev_result, mock_pnl_result, MagicMock()]
+        mock_conn.execute.return_value.one.return_value = mock_row
 
         mock_engine = MagicMock()
-        mock_engine.connect.return_value = mock_conn
+        mock_engine.begin.return_value = mock_conn
+        return mock_engine, mock_conn
 
-        result = update_equity_curve(mock_engine, date(2026, 1, 28))
+    def test_run_daily_rollups(self) -> None:
+        """Test running all daily rollups in one statement."""
+        mock_engine, mock_conn = self._mock_engine(
+            {"city_metrics": 5, "strategy_metrics": 2, "equity_curve": 1}
+        )
 
-        assert result is True
+        results = run_daily_rollups(mock_engine, date(2026, 1, 28))
 
+        assert results == {"city_metrics": 5, "strategy_metrics": 2, "equity_curve": 1}
+        # Equity advisory lock, then the fused rollup statement
+        assert mock_conn.execute.call_count == 2
+        assert "pg_advisory_xact_lock" in str(mock_conn.execute.call_args_list[0][0][0])
+        mock_engine.begin.assert_called_once()
 
-class TestDailyRollups:
-    """Tests for combined daily rollup function."""
+        sql = str(mock_conn.execute.call_args[0][0])
+        # One shared, index-friendly scan of the day's trades feeds all upserts
+        assert sql.count("FROM trades") == 1
+        assert "DATE(" not in sql
+        assert "INSERT INTO analytics.city_metrics_daily" in sql
+        assert "INSERT INTO analytics.strategy_metrics_daily" in sql
+        assert "INSERT INTO analytics.equity_curve_daily" in sql
 
-    def test_run_daily_rollups(self) -> None:
-        """Test running all daily rollups."""
-        with patch("src.analytics.rollups.update_city_metrics") as mock_city, \
-             patch("src.analytics.rollups.update_strategy_metrics") as mock_strategy, \
-             patch("src.analytics.rollups.update_equity_curve") as mock_equity:
+    def test_run_daily_rollups_defaults_to_today(self) -> None:
+        """Test that run_daily_rollups defaults to today's date."""
+        mock_engine, mock_conn = self._mock_engine(
+            {"city_metrics": 0, "strategy_metrics": 0, "equity_curve": 1}
+        )
 
-            mock_city.return_value = 5
-            mock_strategy.return_value = 2
-            mock_equity.return_value = True
+        # Call without target_date
+        run_daily_rollups(mock_engine)
 
-            mock_engine = MagicMock()
+        # Should use today's date
+        today = datetime.now(timezone.utc).date()
+        params = mock_conn.execute.call_args[0][1]
+        assert params["target_date"] == today
+        assert params["initial_equity"] == Decimal("992.10")
 
-            results = run_daily_rollups(mock_engine, date(2026, 1, 28))
 
-            assert results["city_metrics"] == 5
-            assert results["strategy_metrics"] == 2
-            assert results["equity_curve"] == 1
+class TestBackfillRollups:
+    """Tests for seeding rollups from the full trade history."""
 
-            mock_city.assert_called_once()
-            mock_strategy.assert_called_once()
-            mock_equity.assert_called_once()
+    @staticmethod
+    def _mock_engine(bounds: tuple[Any, Any]) -> tuple[MagicMock, MagicMock]:
+        """Build an engine whose trades span ``bounds``."""
+        bounds_result = MagicMock()
+        bounds_result.one.return_value = bounds
+        city_result = MagicMock(rowcount=20)
+        strategy_result = MagicMock(rowcount=4)
+        equity_result = MagicMock()
+        equity_result.fetchall.return_value = [MagicMock()] * 10
 
-    def test_run_daily_rollups_defaults_to_today(self) -> None:
-        """Test that run_daily_rollups defaults to today's date."""
-        with patch("src.analytics.rollups.update_city_metrics") as mock_city, \
-             patch("src.analytics.rollups.update_strategy_metrics") as mock_strategy, \
-             patch("src.analytics.rollups.update_equity_curve") as mock_equity:
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = MagicMock(return_value=mock_conn)
+        mock_conn.__exit__ = MagicMock(return_value=False)
+        mock_conn.execute.side_effect = [
+            bounds_result,
+            MagicMock(),
+            city_result,
+            strategy_result,
+            equity_result,
+        ]
+
+        mock_engine = MagicMock()
+        mock_engine.begin.return_value = mock_conn
+        return mock_engine, mock_conn
+
+    def test_backfill_rollups_from_scratch(self) -> None:
+        """Test tables are truncated and refilled over the whole trade span."""
+        mock_engine, mock_conn = self._mock_engine((date(2026, 1, 1), date(2026, 1, 10)))
 
-            mock_city.return_value = 0
-            mock_strategy.return_value = 0
-            mock_equity.return_value = True
+        results = backfill_rollups_from_scratch(mock_engine)
+
+        assert results == {"city_metrics": 20, "strategy_metrics": 4, "equity_curve": 10}
+        mock_engine.begin.assert_called_once()
+        calls = mock_conn.execute.call_args_list
+        assert str(calls[1][0][0]).strip().startswith("TRUNCATE")
+        for call in calls[2:]:
+            assert call[0][1]["start_date"] == date(2026, 1, 1)
+            assert call[0][1]["end_date"] == date(2026, 1, 10)
+        assert "GROUP BY COALESCE(t.strategy_name, 'unknown'), t.trade_date" in str(
+            calls[3][0][0]
+        )
+        assert calls[4][0][1]["initial_equity"] == Decimal("992.10")
 
-            mock_engine = MagicMock()
+    def test_backfill_rollups_without_trades(self) -> None:
+        """Test an empty trades table only clears the rollups."""
+        mock_engine, mock_conn = self._mock_engine((None, None))
 
-            # Call without target_date
-            run_daily_rollups(mock_engine)
+        results = backfill_rollups_from_scratch(mock_engine)
 
-            # Should use today's date
-            today = datetime.now(timezone.utc).date()
-            mock_city.assert_called_with(mock_engine, today)
+        assert results == {"city_metrics": 0, "strategy_metrics": 0, "equity_curve": 0}
+        assert mock_conn.execute.call_count == 2
@@ -1,5 +1,8 @@
 """Unit tests for signal generator."""
 
+import logging
+from unittest.mock import patch
+
 import pytest
 
 from src.analytics.signal_generator import Signal, SignalGenerator
@@ -46,6 +49,11 @@ class TestSignal:
                 reason="Test",
             )
 
+    def test_signal_rejects_nan_confidence(self) -> None:
+        """Test NaN confidence fails validation."""
+        with pytest.raises(ValueError, match="Confidence must be between 0 and 1"):
+            Signal(ticker="TEST-01", side="yes", confidence=float("nan"), reason="Test")
+
     def test_signal_validates_side(self) -> None:
         """Test Signal validates side is yes or no."""
         with pytest.raises(ValueError, match="Side must be 'yes' or 'no'"):
@@ -57,6 +65,25 @@ class TestSignal:
             )
 
 
+    def test_signal_uses_slots(self) -> None:
+        """Test Signal instances have no per-instance __dict__."""
+        signal = Signal(ticker="TEST-01", side="yes", confidence=0.75, reason="Test")
+
+        assert not hasattr(signal, "__dict__")
+
+    def test_signal_unchecked_matches_validated(self) -> None:
+        """Test the unchecked constructor builds an equal signal."""
+        kwargs = {
+            "ticker": "TEST-01",
+            "side": "no",
+            "confidence": 0.65,
+            "reason": "Test",
+            "features": {"temp_diff": -5.0},
+        }
+
+        assert Signal.unchecked(**kwargs) == Signal(**kwargs)
+        assert Signal.unchecked("TEST-01", "yes", 0.7, "Test").features is None
+
 class TestSignalGenerator:
     """Test suite for SignalGenerator."""
 
@@ -182,6 +209,73 @@ class TestSignalGenerator:
 
         assert signal is None
 
+    def test_per_signal_logging_is_sampled(
+        self,
+        generator: SignalGenerator,
+        sample_market: Market,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test per-signal info events are logged once per sample window."""
+        caplog.set_level(logging.INFO, logger="src.analytics.signal_generator")
+        weather = {"temperature": 42.0}
+
+        with patch("src.analytics.signal_generator.logger") as mock_logger:
+            for _ in range(250):
+                generator.generate_temperature_signal(weather, sample_market)
+
+        assert mock_logger.info.call_count == 3
+        assert mock_logger.info.call_args[1]["sample_rate"] == 100
+
+    def test_per_signal_logging_skipped_when_info_disabled(
+        self,
+        generator: SignalGenerator,
+        sample_market: Market,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test no per-signal events are built when INFO is disabled."""
+        caplog.set_level(logging.WARNING, logger="src.analytics.signal_generator")
+
+        with patch("src.analytics.signal_generator.logger") as mock_logger:
+            generator.generate_temperature_signal({"temperature": 42.0}, sample_market)
+
+        mock_logger.info.assert_not_called()
+
+    def test_generate_temperature_signals_batch_matches_scalar(
+        self, generator: SignalGenerator, sample_market: Market
+    ) -> None:
+        """Test the batch path returns exactly what per-market calls return."""
+        markets = [
+            sample_market.model_copy(update={"ticker": f"T-{i}", "strike_price": strike})
+            for i, strike in enumerate([20.0, 32.0, 38.5, 45.0, None, 60.0])
+        ]
+        weather = {"temperature": 42.0}
+
+        batch = generator.generate_temperature_signals_batch(weather, markets)
+
+        assert batch == [generator.generate_temperature_signal(weather, m) for m in markets]
+        assert [s is not None for s in batch] == [True, True, False, False, False, True]
+
+    def test_generate_temperature_signals_batch_missing_data(
+        self, generator: SignalGenerator, sample_market: Market
+    ) -> None:
+        """Test the batch path without a temperature forecast."""
+        assert generator.generate_temperature_signals_batch({}, [sample_market]) == [None]
+        assert generator.generate_temperature_signals_batch({"temperature": 42.0}, []) == []
+
+    def test_generate_precipitation_signals_batch_matches_scalar(
+        self, generator: SignalGenerator, sample_market: Market
+    ) -> None:
+        """Test the precipitation batch path matches per-market calls."""
+        markets = [
+            sample_market.model_copy(update={"ticker": f"T-{i}"}) for i in range(3)
+        ]
+
+        for weather in ({"precipitation_probability": 0.7}, {"precipitation_probability": 0.2}, {}):
+            batch = generator.generate_precipitation_signals_batch(weather, markets)
+            assert batch == [
+                generator.generate_precipitation_signal(weather, m) for m in markets
+            ]
+
     def test_calculate_confidence_score_high_quality(
         self, generator: SignalGenerator, sample_market: Market
     ) -> None:
@@ -239,6 +333,26 @@ class TestSignalGenerator:
         # Should have low score due to poor market + missing weather data
         assert score < 0.5
 
+    def test_calculate_confidence_scores_matches_scalar(
+        self, generator: SignalGenerator, sample_market: Market
+    ) -> None:
+        """Test the vectorized scores equal per-market scores exactly."""
+        markets = [
+            sample_market,
+            sample_market.model_copy(update={"yes_bid": None, "status": "closed"}),
+            sample_market.model_copy(update={"yes_ask": 60, "volume": 0, "open_interest": 0}),
+        ]
+
+        for weather in ({"temperature": 40.0, "precipitation_probability": 0.2}, {}):
+            scores = generator.calculate_confidence_scores(weather, markets)
+            assert scores.tolist() == [
+                generator.calculate_confidence_score(weather, m) for m in markets
+            ]
+
+    def test_calculate_confidence_scores_empty(self, generator: SignalGenerator) -> None:
+        """Test scoring no markets returns an empty array."""
+        assert generator.calculate_confidence_scores({}, []).shape == (0,)
+
     def test_combine_signals_consensus_yes(self, generator: SignalGenerator) -> None:
         """Test combining signals with yes consensus."""
         signals = [
@@ -269,6 +383,20 @@ class TestSignalGenerator:
         assert combined.side == "no"
         assert combined.confidence == 0.75
 
+    def test_combine_signals_ignores_minority_side(self, generator: SignalGenerator) -> None:
+        """Test only the winning side's reasons and features are combined."""
+        signals = [
+            Signal(ticker="TEST-01", side="no", confidence=0.7, reason="R1", features={"a": 1}),
+            Signal(ticker="TEST-01", side="yes", confidence=0.6, reason="R2", features={"b": 2}),
+            Signal(ticker="TEST-01", side="no", confidence=0.9, reason="R3", features={"a": 3}),
+        ]
+
+        combined = generator.combine_signals(signals)
+
+        assert combined is not None
+        assert combined.reason == "R1; R3"
+        assert combined.features == {"a": 3}
+
     def test_combine_signals_no_consensus(self, generator: SignalGenerator) -> None:
         """Test combining signals with no majority."""
         signals = [
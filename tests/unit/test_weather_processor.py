@@ -1,9 +1,13 @@
 """Unit tests for weather data processor."""
 
+import logging
 from datetime import datetime, timezone
+from unittest.mock import patch
 
+import numpy as np
 import pytest
 
+from src.analytics import weather_processor
 from src.analytics.weather_processor import WeatherProcessor
 from src.shared.api.response_models import Forecast, ForecastPeriod, Observation
 
@@ -78,6 +82,28 @@ class TestWeatherProcessor:
         assert period["temperature"] == 32
         assert period["is_daytime"] is False
 
+    def test_parse_forecast_period_keys(
+        self, processor: WeatherProcessor, sample_forecast: Forecast
+    ) -> None:
+        """Test each parsed period carries exactly the expected keys in order."""
+        period = processor.parse_forecast(sample_forecast)["periods"][0]
+
+        assert list(period) == [
+            "number",
+            "name",
+            "start_time",
+            "end_time",
+            "is_daytime",
+            "temperature",
+            "temperature_unit",
+            "wind_speed",
+            "wind_direction",
+            "short_forecast",
+            "detailed_forecast",
+            "precipitation_probability",
+        ]
+        assert period["detailed_forecast"] == sample_forecast.periods[0].detailed_forecast
+
     def test_parse_forecast_extracts_precipitation(
         self, processor: WeatherProcessor, sample_forecast: Forecast
     ) -> None:
@@ -88,6 +114,35 @@ class TestWeatherProcessor:
         assert "precipitation_probability" in period
         assert period["precipitation_probability"] == 0.20
 
+    def test_parse_forecast_columns(
+        self, processor: WeatherProcessor, sample_forecast_period: ForecastPeriod
+    ) -> None:
+        """Test column parsing lines up with the per-period dictionaries."""
+        second = sample_forecast_period.model_copy(
+            update={"number": 2, "name": "Monday", "temperature": 45, "is_daytime": True}
+        )
+        forecast = Forecast(
+            updated=datetime.now(timezone.utc),
+            units="us",
+            forecast_generator="BaselineForecast",
+            generated_at=datetime.now(timezone.utc),
+            update_time=datetime.now(timezone.utc),
+            periods=[sample_forecast_period, second],
+        )
+
+        columns = processor.parse_forecast_columns(forecast)
+        periods = processor.parse_forecast(forecast)["periods"]
+
+        assert len(columns) == 2
+        assert columns.names == ("Tonight", "Monday")
+        assert columns.numbers.tolist() == [p["number"] for p in periods]
+        assert columns.temperatures.tolist() == [32.0, 45.0]
+        assert columns.is_daytime.tolist() == [False, True]
+        assert columns.precipitation_probabilities.tolist() == [
+            p["precipitation_probability"] for p in periods
+        ]
+        assert columns.start_times[0] == sample_forecast_period.start_time
+
     def test_parse_observation(
         self, processor: WeatherProcessor, sample_observation: Observation
     ) -> None:
@@ -123,6 +178,35 @@ class TestWeatherProcessor:
         assert result["temperature_f"] is None
         assert result["dewpoint_f"] is None
 
+    def test_debug_events_skipped_when_debug_disabled(
+        self,
+        processor: WeatherProcessor,
+        sample_observation: Observation,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test no debug events are built when DEBUG is disabled."""
+        caplog.set_level(logging.INFO, logger="src.analytics.weather_processor")
+
+        with patch("src.analytics.weather_processor.logger") as mock_logger:
+            processor.parse_observation(sample_observation)
+            processor.calculate_temp_anomaly(current=70.0, historical_avg=65.0)
+
+        mock_logger.debug.assert_not_called()
+
+    def test_debug_events_emitted_when_debug_enabled(
+        self,
+        processor: WeatherProcessor,
+        sample_observation: Observation,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test debug events are still emitted when DEBUG is enabled."""
+        caplog.set_level(logging.DEBUG, logger="src.analytics.weather_processor")
+
+        with patch("src.analytics.weather_processor.logger") as mock_logger:
+            processor.parse_observation(sample_observation)
+
+        mock_logger.debug.assert_called_once()
+
     def test_normalize_temperature(self, processor: WeatherProcessor) -> None:
         """Test temperature normalization."""
         result = processor.normalize_temperature(temp=72.0, city="NYC")
@@ -142,6 +226,27 @@ class TestWeatherProcessor:
 
         assert anomaly == -10.0
 
+    def test_normalize_temperature_batch(self, processor: WeatherProcessor) -> None:
+        """Test batch normalization matches the scalar method."""
+        temps = [72.5, 30.0, 101.0]
+
+        result = processor.normalize_temperature_batch(np.array(temps), city="NYC")
+
+        assert result.dtype == np.float64
+        assert result.tolist() == [processor.normalize_temperature(t, "NYC") for t in temps]
+
+    def test_calculate_temp_anomaly_batch(self, processor: WeatherProcessor) -> None:
+        """Test batch anomalies match the scalar method and broadcast a scalar average."""
+        current = np.array([75.0, 55.0, 65.0])
+
+        result = processor.calculate_temp_anomaly_batch(current, np.array([65.0, 65.0, 60.0]))
+        broadcast = processor.calculate_temp_anomaly_batch(current, 65.0)
+
+        assert result.tolist() == [10.0, -10.0, 5.0]
+        assert broadcast.tolist() == [
+            processor.calculate_temp_anomaly(c, 65.0) for c in current.tolist()
+        ]
+
     def test_extract_precipitation_probability_percentage(
         self, processor: WeatherProcessor
     ) -> None:
@@ -165,6 +270,21 @@ class TestWeatherProcessor:
 
         assert result == 0.40
 
+    def test_extract_precipitation_probability_clamped_to_one(
+        self, processor: WeatherProcessor
+    ) -> None:
+        """Test percentages above 100 are clamped to a probability of 1.0."""
+        assert processor.extract_precipitation_probability("Rain 150%") == 1.0
+        assert processor.extract_precipitation_probability("Rain 100%") == 1.0
+
+    def test_extract_precipitation_probability_spaced_percent_sign(
+        self, processor: WeatherProcessor
+    ) -> None:
+        """Test a space between the number and the percent sign is accepted."""
+        result = processor.extract_precipitation_probability("Showers 60 % likely")
+
+        assert result == 0.60
+
     def test_extract_precipitation_probability_qualitative(
         self, processor: WeatherProcessor
     ) -> None:
@@ -173,12 +293,56 @@ class TestWeatherProcessor:
             ("Rain likely", 0.70),
             ("Possible showers", 0.40),
             ("Slight chance of rain", 0.20),
+            ("Chance of showers, then rain likely", 0.70),
+            ("Probable snow", 0.70),
         ]
 
         for text, expected in test_cases:
             result = processor.extract_precipitation_probability(text)
             assert result == expected, f"Failed for: {text}"
 
+    def test_extract_precipitation_probability_chance_stays_in_sentence(
+        self, processor: WeatherProcessor
+    ) -> None:
+        """Test a number in a later sentence is not read as the chance value."""
+        text = "Chance of showers. Mostly cloudy, with a high near 75."
+        result = processor.extract_precipitation_probability(text)
+
+        assert result == 0.40
+
+    def test_extract_precipitation_probability_percent_beats_earlier_clock_time(
+        self, processor: WeatherProcessor
+    ) -> None:
+        """Test real NWS text reads the stated percentage, not a time after "chance"."""
+        cases = [
+            (
+                "A chance of rain before 1pm. Mostly cloudy, with a high near 58. "
+                "Chance of precipitation is 50%.",
+                0.50,
+            ),
+            (
+                "A slight chance of showers after 2am. Mostly cloudy, with a low around 41. "
+                "Chance of precipitation is 20%.",
+                0.20,
+            ),
+            (
+                "A chance of showers and thunderstorms before 8pm. Partly cloudy, with a "
+                "low around 62. Chance of precipitation is 40%.",
+                0.40,
+            ),
+        ]
+
+        for text, expected in cases:
+            assert processor.extract_precipitation_probability(text) == expected, text
+
+    def test_extract_precipitation_probability_percent_sign_before_percent_word(
+        self, processor: WeatherProcessor
+    ) -> None:
+        """Test "N%" anywhere in the text takes precedence over "N percent"."""
+        text = "Clouds cover 30 percent of the sky. Chance of rain 60%."
+
+        assert processor.extract_precipitation_probability(text) == 0.60
+
     def test_extract_precipitation_probability_none(self, processor: WeatherProcessor) -> None:
         """Test extracting precipitation probability when none mentioned."""
         text = "Clear skies with sunshine"
@@ -194,6 +358,29 @@ class TestWeatherProcessor:
 
         assert result == 0.0
 
+    def test_extract_precipitation_probability_cached_by_text(
+        self, processor: WeatherProcessor
+    ) -> None:
+        """Test repeated forecast text is answered from the cache."""
+        text = "Showers likely after 2pm. Chance of precipitation is 65%."
+        hits_before = weather_processor._extract_precip.cache_info().hits
+
+        first = processor.extract_precipitation_probability(text)
+        second = processor.extract_precipitation_probability(text)
+
+        assert first == second == 0.65
+        assert weather_processor._extract_precip.cache_info().hits >= hits_before + 1
+
+    def test_extract_precipitation_probability_short_text(
+        self, processor: WeatherProcessor
+    ) -> None:
+        """Test short texts return without a lookup unless they carry a percent."""
+        misses_before = weather_processor._extract_precip.cache_info().misses
+
+        assert processor.extract_precipitation_probability("Sunny") == 0.0
+        assert weather_processor._extract_precip.cache_info().misses == misses_before
+        assert processor.extract_precipitation_probability("5%") == 0.05
+
     def test_celsius_to_fahrenheit_conversion(self) -> None:
         """Test Celsius to Fahrenheit conversion."""
         test_cases = [
@@ -206,3 +393,13 @@ class TestWeatherProcessor:
         for celsius, expected_f in test_cases:
             result = WeatherProcessor._celsius_to_fahrenheit(celsius)
             assert abs(result - expected_f) < 0.1, f"Failed for {celsius}°C"
+
+    def test_celsius_to_fahrenheit_batch(self) -> None:
+        """Test batch conversion matches the scalar conversion element-wise."""
+        celsius = np.array([0.0, 100.0, 20.5, -40.0, np.nan])
+
+        result = WeatherProcessor.celsius_to_fahrenheit_batch(celsius)
+
+        expected = [WeatherProcessor._celsius_to_fahrenheit(c) for c in celsius[:-1]]
+        assert result[:-1].tolist() == expected
+        assert np.isnan(result[-1])